@@ -1,10 +1,55 @@
+import io
 import os
+import atexit
+import base64
+import bisect
+import datetime
+import re
+import mmap
 import json
+import time
+import uuid
+import zlib
+import gzip
+import hashlib
+import shutil
+import zipfile
+import warnings
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.utils
+from plotly.subplots import make_subplots
 from flask import Flask, request, jsonify, render_template, send_from_directory
 from werkzeug.utils import secure_filename
+from column_stats import ALL_STATISTICS, summarize_columns
+from text_format import DATE_PART_PATTERN, sniff_text_format
+from csv_reader import read_csv, iter_csv
+from render_mode import apply_render_mode
+from grid_aggregation import BucketStats, grid_aggregates
+from zip_reader import ZIP_SOURCE_COLUMN, zip_csv_members, read_zip_member
+
+# pyarrow is needed for the columnar copies of uploads, without it every
+# request falls back to parsing the original file
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+except ImportError:
+    feather = None
+
+# brotli is optional, responses fall back to gzip without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # =============================================================================
 # FILE SIZE CONFIGURATION
@@ -24,12 +69,272 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
 # Additional configurations for large file handling
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # Disable caching for large files
+# Unversioned files are always revalidated, static URLs built with url_for
+# carry a content hash and are cached for STATIC_MAX_AGE instead
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# =============================================================================
+# DATASET CACHE CONFIGURATION
+# =============================================================================
+# Parsed uploads are kept in memory so repeat renders do not re-read the file.
+# Entries are evicted least-recently-used once the total in-memory size of the
+# cached DataFrames exceeds DATASET_CACHE_MAX_MB.
+# =============================================================================
+DATASET_CACHE_MAX_MB = 2048
+
+# =============================================================================
+# FIGURE CACHE CONFIGURATION
+# =============================================================================
+# Rendered figures are kept (serialized) per dataset version, graph type and
+# config. Config keys in COSMETIC_CONFIG_KEYS only change the layout, so for
+# the column graph types a cached figure is reused with a new layout instead
+# of rebuilding the traces. Figures pushed out of the FIGURE_CACHE_MAX_MB
+# memory budget spill to FIGURE_CACHE_FOLDER until FIGURE_CACHE_DISK_MAX_MB;
+# both budgets apply per process.
+# =============================================================================
+FIGURE_CACHE_MAX_MB = 256
+FIGURE_CACHE_DISK_MAX_MB = 1024
+FIGURE_CACHE_FOLDER = os.path.join(app.config['UPLOAD_FOLDER'], '.figures')
+COSMETIC_CONFIG_KEYS = {'title', 'x_title', 'y_title', 'y1_title', 'y2_title', 'light_mode',
+                        'x_min', 'x_max', 'y_min', 'y_max', 'y1_min', 'y1_max', 'y2_min', 'y2_max'}
+
+# =============================================================================
+# DATASET DTYPE CONFIGURATION
+# =============================================================================
+# Parsed uploads are shrunk before they are cached and written to the columnar
+# copy: integers to the smallest int type, floats to float32 when no value
+# changes at the number of decimals the column uses (at most
+# FLOAT32_MAX_DECIMALS), text columns of full dates (text_format's
+# DATE_PART_PATTERN) to datetime64 and text columns
+# with at most CATEGORY_MAX_RATIO distinct values per row to categoricals.
+# Numeric columns are then memory-mapped from the columnar copy instead of
+# being held in the process.
+# =============================================================================
+FLOAT32_MAX_DECIMALS = 6
+CATEGORY_MAX_RATIO = 0.5
+DATE_SAMPLE_ROWS = 1000
+
+# =============================================================================
+# OUT-OF-CORE AGGREGATION CONFIGURATION
+# =============================================================================
+# Files larger than OUT_OF_CORE_FILE_MB are never loaded whole for graphing.
+# Instead they are streamed OUT_OF_CORE_CHUNK_ROWS rows at a time and reduced
+# to min/max/mean/count per x bucket (per lat/lon cell for maps); only those
+# aggregates are plotted. config['aggregate'] is 'auto' (by file size), 'on'
+# or 'off'. The bucket count follows config['max_points'].
+# A parsed file takes several times its size while loading, so the threshold
+# is 1/OUT_OF_CORE_RAM_DIVISOR of the machine's RAM, and never more than a
+# quarter of MAX_FILE_SIZE_MB so that 'auto' applies to the largest uploads.
+# =============================================================================
+OUT_OF_CORE_RAM_DIVISOR = 8
+
+
+def physical_memory_mb():
+    """Installed RAM in MB, None where the platform does not report it"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+OUT_OF_CORE_FILE_MB = min(MAX_FILE_SIZE_MB // 4,
+                          (physical_memory_mb() or MAX_FILE_SIZE_MB) // OUT_OF_CORE_RAM_DIVISOR)
+OUT_OF_CORE_CHUNK_ROWS = 500_000
+
+# =============================================================================
+# MAP CONFIGURATION
+# =============================================================================
+# Scatter maps are returned to the page like any other graph and drawn there
+# with scattermapbox. Datasets with more than MAP_MAX_POINTS rows are thinned
+# onto a lat/lon grid of about that many cells: one marker per occupied cell
+# at the mean position of its points, carrying the mean of the color/size
+# columns and the number of points in the cell.
+# Mapbox styles that need an access token are drawn from the raster tile
+# servers in MAP_RASTER_LAYERS, or replaced by the tokenless style in
+# MAP_STYLE_ALIASES.
+# =============================================================================
+MAP_MAX_POINTS = 50000
+MAP_STYLE_ALIASES = {'basic': 'open-street-map', 'streets': 'open-street-map',
+                     'light': 'carto-positron', 'dark': 'carto-darkmatter'}
+ESRI_TILES = 'https://server.arcgisonline.com/ArcGIS/rest/services/{}/MapServer/tile/{{z}}/{{y}}/{{x}}'
+CARTO_TILES = 'https://basemaps.cartocdn.com/rastertiles/{}/{{z}}/{{x}}/{{y}}.png'
+MAP_RASTER_LAYERS = {
+    'satellite': [ESRI_TILES.format('World_Imagery')],
+    'satellite-streets': [ESRI_TILES.format('World_Imagery'),
+                          ESRI_TILES.format('Reference/World_Transportation'),
+                          ESRI_TILES.format('Reference/World_Boundaries_and_Places')],
+    'outdoors': ['https://tile.opentopomap.org/{z}/{x}/{y}.png'],
+    'carto-voyager': [CARTO_TILES.format('voyager')],
+    'carto-voyager-nolabels': [CARTO_TILES.format('voyager_nolabels')],
+    'carto-positron-nolabels': [CARTO_TILES.format('light_nolabels')],
+    'carto-darkmatter-nolabels': [CARTO_TILES.format('dark_nolabels')]
+}
+
+# =============================================================================
+# MAP TILE CONFIGURATION
+# =============================================================================
+# After the first render, panning and zooming a map fetches the points in view
+# from /map_tiles. Each dataset's points are indexed once by their quadkey at
+# MAP_INDEX_ZOOM (sorted Morton codes, so a map tile is one contiguous range)
+# and the last MAP_INDEX_CACHE_SIZE indexes are kept.
+# A viewport with up to MAP_MAX_POINTS points (or config['max_points'], the
+# same limit as the first render) gets every point; denser views get
+# clusters, one per tile cell MAP_CLUSTER_LEVELS zoom levels below the view
+# (8 px cells on 256 px tiles). config['tile_mode'] 'density' draws a
+# heatmap of the same clusters instead.
+# =============================================================================
+MAP_INDEX_ZOOM = 24
+MAP_INDEX_CACHE_SIZE = 4
+MAP_CLUSTER_LEVELS = 5
+MAP_MAX_VIEWPORT_TILES = 256
+MAP_DENSITY_RADIUS = 12
+MERCATOR_MAX_LAT = 85.05112878
+
+# =============================================================================
+# LIVE TAIL CONFIGURATION
+# =============================================================================
+# Logs that are still being written can be followed with /tail/<filename>, a
+# server-sent event stream. Renders with config 'live' set are drawn from the
+# file's tail, which remembers the byte offset of the last complete line it
+# has parsed and only parses the lines appended after it. Tails are kept in
+# the dataset cache and count against DATASET_CACHE_MAX_MB. The file is
+# checked every TAIL_POLL_SECONDS; the new points are sent for
+# Plotly.extendTraces, which keeps the last TAIL_MAX_POINTS per trace.
+# TAIL_FILE_TYPES: uploads that can be followed
+# =============================================================================
+TAIL_POLL_SECONDS = 0.1
+TAIL_KEEPALIVE_SECONDS = 15
+TAIL_MAX_POINTS = 20000
+TAIL_FILE_TYPES = ('csv', 'txt', 'log')
+
+# =============================================================================
+# DOWNSAMPLING CONFIGURATION
+# =============================================================================
+# Traces longer than the target point count are reduced before they are sent
+# to the browser. Both can be overridden per graph through the config dict:
+# - config['max_points']: target number of points per trace
+# - config['decimation']: 'auto', 'lttb', 'minmax', 'stratified', 'uniform'
+#   or 'none' ('auto' uses LTTB for line charts and stratified sampling for
+#   scatter plots)
+# =============================================================================
+DEFAULT_MAX_POINTS = 5000
+
+# =============================================================================
+# BINARY FIGURE ENCODING
+# =============================================================================
+# Numeric trace arrays are sent as base64 typed arrays ({'dtype', 'bdata'})
+# that app.js turns into Float32Array/Int32Array/... before plotting, instead
+# of one JSON number per point. Arrays shorter than BINARY_MIN_LENGTH stay
+# plain lists. Float arrays are sent as float32 only when every value survives
+# the round trip exactly (e.g. columns already shrunk to float32 on load),
+# otherwise as float64.
+# =============================================================================
+BINARY_MIN_LENGTH = 64
+
+# =============================================================================
+# UPLOAD STREAMING CONFIGURATION
+# =============================================================================
+# Uploads are copied to disk in UPLOAD_CHUNK_SIZE pieces. The upload response
+# only parses the first SCHEMA_SAMPLE_BYTES to report columns; the full row
+# count is computed in the background and served from
+# /dataset_info/<filename>. That background pass also writes the columnar
+# copy, except for files above OUT_OF_CORE_FILE_MB, which are only counted
+# ROW_COUNT_CHUNK_ROWS rows at a time.
+# =============================================================================
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SCHEMA_SAMPLE_BYTES = 256 * 1024
+ROW_COUNT_CHUNK_ROWS = 200_000
+
+# =============================================================================
+# CSV PARSER CONFIGURATION
+# =============================================================================
+# CSV and delimited text uploads are parsed by pyarrow's multi-threaded CSV
+# reader when CSV_ENGINE is 'pyarrow', with column types pinned from a sample
+# so results match pandas. Options it cannot match (decimal commas, comment
+# lines, whitespace delimiters) and files without pyarrow fall back to pandas.
+# Set CSV_ENGINE = 'pandas' to always use pandas. Block size and threading
+# are set in csv_reader.py.
+# =============================================================================
+CSV_ENGINE = 'pyarrow'
+
+# =============================================================================
+# RESUMABLE UPLOAD CONFIGURATION
+# =============================================================================
+# Large files are sent by the browser in UPLOAD_PART_SIZE pieces through
+# /upload/init, /upload/<id>/chunk/<n> and /upload/<id>/finalize. Pieces are
+# kept under uploads/.partial until finalize; unfinished uploads older than
+# PARTIAL_UPLOAD_MAX_AGE_HOURS are removed.
+# =============================================================================
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+PARTIAL_UPLOAD_MAX_AGE_HOURS = 24
+PARTIAL_UPLOAD_FOLDER = os.path.join(app.config['UPLOAD_FOLDER'], '.partial')
+
+# =============================================================================
+# BACKGROUND JOB CONFIGURATION
+# =============================================================================
+# Graph generation runs on a local thread pool so a slow render does not hold
+# a request thread. Threads (not processes) share the dataset cache, and
+# pandas/NumPy release the GIL for most of the heavy lifting.
+# Finished jobs are kept for JOB_RESULT_TTL_SECONDS for the browser to collect.
+# =============================================================================
+JOB_WORKERS = 2
+JOB_RESULT_TTL_SECONDS = 600
+
+# =============================================================================
+# ZIP ARCHIVE CONFIGURATION
+# =============================================================================
+# Every CSV member of an uploaded zip is parsed on a pool of
+# ZIP_PARSE_WORKERS processes, straight from the archive, and the results are
+# concatenated with a ZIP_SOURCE_COLUMN naming the member each row came from.
+# The workers run zip_reader.read_zip_member, so they never import this app.
+# =============================================================================
+ZIP_PARSE_WORKERS = os.cpu_count() or 1
+
+# =============================================================================
+# CSV JOINER CONFIGURATION
+# =============================================================================
+# csv_joiner aligns the CSVs of a zip on a shared key column (e.g. 'Date'),
+# reading JOIN_CHUNK_ROWS rows of each file at a time. The result is written
+# to uploads/<archive name>_joined.feather and can be graphed like an upload.
+# =============================================================================
+JOIN_CHUNK_ROWS = 200_000
+
+# =============================================================================
+# PING LOG CONFIGURATION
+# =============================================================================
+# Loss rate and jitter in ping plots are computed over a rolling window of
+# PING_STATS_WINDOW probes, override with config['stats_window'].
+# =============================================================================
+PING_STATS_WINDOW = 100
+
+# =============================================================================
+# IPERF CONFIGURATION
+# =============================================================================
+# iperf3 --json output is read IPERF_READ_SIZE bytes at a time and decoded one
+# interval object at a time, so soak tests hundreds of MB long never exist as
+# a full JSON tree in memory.
+# =============================================================================
+IPERF_READ_SIZE = 1024 * 1024
+
+# =============================================================================
+# RESPONSE COMPRESSION AND CACHING CONFIGURATION
+# =============================================================================
+# JSON/JS/CSS responses larger than COMPRESS_MIN_BYTES are brotli (when
+# installed) or gzip compressed for clients that accept it. Static files are
+# compressed once per version and kept in memory.
+# url_for('static', ...) adds a ?v=<content hash> to every static URL and
+# versioned requests are cached by the browser for STATIC_MAX_AGE seconds.
+# =============================================================================
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 5
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/javascript', 'application/javascript',
+                          'text/css', 'text/html', 'image/svg+xml'}
+STATIC_MAX_AGE = 365 * 24 * 3600
+
 # Configuration for hosting
 HOST = '0.0.0.0'  # Change to '127.0.0.1' for localhost only
 PORT = 5001
@@ -39,9 +344,785 @@ ALLOWED_EXTENSIONS = {'csv', 'txt', 'log', 'json', 'zip'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+
+def dataframe_footprint(df):
+    """Bytes of a DataFrame held in process memory vs. memory-mapped from disk.
+
+    Columns read zero-copy from the columnar copy are read-only views of the
+    mapped file; the OS pages them in and out as needed.
+    """
+    heap_bytes = int(df.index.memory_usage())
+    mapped_bytes = 0
+    for _, col in df.items():
+        nbytes = int(col.memory_usage(index=False, deep=True))
+        values = col.array._ndarray if hasattr(col.array, '_ndarray') else None
+        if isinstance(values, np.ndarray) and not values.flags.writeable:
+            mapped_bytes += nbytes
+        else:
+            heap_bytes += nbytes
+    return {'heap_bytes': heap_bytes, 'mapped_bytes': mapped_bytes}
+
+
+class DatasetCache:
+    """Process-wide LRU cache of parsed DataFrames with a byte budget.
+
+    Entries are keyed by (filename, mtime, size) so a re-uploaded file with
+    the same name is never served stale data. Parsers that produce a
+    different table from the same file (e.g. the ping log parser) append
+    their own tag to that key. Live tails of growing files are keyed by
+    (filename, LIVE_TAIL_TAG, kind) and follow the file themselves.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df, nbytes=None):
+        if nbytes is None:
+            # Memory-mapped columns cost page cache rather than process memory
+            nbytes = dataframe_footprint(df)['heap_bytes']
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            # Drop older versions of the same file, they can never be hit again.
+            # A tail is not a version of its file, it resets when the file shrinks
+            for stale_key in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]
+                              and LIVE_TAIL_TAG not in (k[1], key[1])]:
+                self.current_bytes -= self._entries.pop(stale_key)[1]
+            if nbytes > self.max_bytes:
+                # Too large to ever fit, don't flush the whole cache for it
+                return
+            self._entries[key] = (df, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+dataset_cache = DatasetCache(DATASET_CACHE_MAX_MB * 1024 * 1024)
+# Second key field of live tails in the dataset cache, see log_tail
+LIVE_TAIL_TAG = 'tail'
+
+
+class FigureCache:
+    """LRU cache of serialized graph results with a memory and a disk budget.
+
+    Keys start with the dataset fingerprint, so entries for older versions of
+    a file are dropped when a new version is stored. Entries evicted from
+    memory are written to FIGURE_CACHE_FOLDER and read back on the next hit.
+
+    Spilled files are only indexed in this process, so each process spills
+    to its own subfolder. It is created on the first spill, not at import,
+    so spawned pool workers and other server workers never touch another
+    process's files, and it is removed when the process exits.
+    """
+
+    def __init__(self, max_bytes, max_disk_bytes, folder):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.folder = os.path.join(folder, str(os.getpid()))
+        self._folder_ready = False
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, digest + '.json')
+
+    def get(self, key):
+        with self._lock:
+            body = self._memory.get(key)
+            if body is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return body
+            if key not in self._disk:
+                self.misses += 1
+                return None
+            self.disk_bytes -= self._disk.pop(key)
+            self.disk_hits += 1
+        try:
+            with open(self._path(key), 'rb') as f:
+                body = f.read()
+            os.remove(self._path(key))
+        except OSError:
+            return None
+        self.put(key, body)
+        return body
+
+    def put(self, key, body):
+        spill = []
+        with self._lock:
+            if key in self._memory:
+                self.current_bytes -= len(self._memory.pop(key))
+            for stale_key in [k for k in self._memory if k[0][0] == key[0][0] and k[0] != key[0]]:
+                self.current_bytes -= len(self._memory.pop(stale_key))
+            stale_disk = [k for k in self._disk if k[0][0] == key[0][0] and k[0] != key[0]]
+            for stale_key in stale_disk:
+                self.disk_bytes -= self._disk.pop(stale_key)
+            if len(body) <= self.max_bytes:
+                self._memory[key] = body
+                self.current_bytes += len(body)
+            else:
+                # Too large for the memory budget, straight to disk
+                spill.append((key, body))
+            while self.current_bytes > self.max_bytes:
+                evicted_key, evicted = self._memory.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                spill.append((evicted_key, evicted))
+        for stale_key in stale_disk:
+            self._remove_file(stale_key)
+        for evicted_key, evicted in spill:
+            self._spill(evicted_key, evicted)
+
+    def _prepare_folder(self):
+        with self._lock:
+            if self._folder_ready:
+                return
+            # Leftovers of an earlier process with the same pid are unreachable
+            shutil.rmtree(self.folder, ignore_errors=True)
+            os.makedirs(self.folder, exist_ok=True)
+            atexit.register(shutil.rmtree, self.folder, ignore_errors=True)
+            self._folder_ready = True
+
+    def _spill(self, key, body):
+        if len(body) > self.max_disk_bytes:
+            return
+        try:
+            self._prepare_folder()
+            with open(self._path(key), 'wb') as f:
+                f.write(body)
+        except OSError as e:
+            app.logger.warning("Could not spill cached figure to disk: %s", e)
+            return
+        dropped = []
+        with self._lock:
+            self._disk[key] = len(body)
+            self.disk_bytes += len(body)
+            while self.disk_bytes > self.max_disk_bytes:
+                dropped_key, size = self._disk.popitem(last=False)
+                self.disk_bytes -= size
+                dropped.append(dropped_key)
+        for dropped_key in dropped:
+            self._remove_file(dropped_key)
+
+    def _remove_file(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._memory),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self.disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses
+            }
+
+
+figure_cache = FigureCache(FIGURE_CACHE_MAX_MB * 1024 * 1024,
+                           FIGURE_CACHE_DISK_MAX_MB * 1024 * 1024, FIGURE_CACHE_FOLDER)
+
+
+def dataset_fingerprint(filepath):
+    stat = os.stat(filepath)
+    return (os.path.basename(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def read_dataset_file(filepath):
+    """Parse an uploaded file into a DataFrame based on its extension"""
+    file_extension = filepath.rsplit('.', 1)[1].lower()
+
+    if file_extension == 'csv':
+        return read_csv(filepath, csv_engine=CSV_ENGINE)
+    elif file_extension in ('txt', 'log'):
+        # Delimiter, header and preamble were sniffed once, see text_format
+        return read_csv(filepath, csv_engine=CSV_ENGINE, **text_format(filepath)['options'])
+    elif file_extension == 'json':
+        return pd.read_json(filepath)
+    elif file_extension == 'zip':
+        return read_zip_archive(filepath)
+    elif file_extension == 'feather':
+        return feather.read_feather(filepath)
+    raise ValueError(f'Unsupported file type: {file_extension}')
+
+
+def columnar_path(filepath):
+    """Location of the Arrow IPC (Feather) copy of an upload"""
+    if filepath.endswith('.feather'):
+        # Server-generated datasets (e.g. csv_joiner output) are already columnar
+        return filepath
+    return filepath + '.feather'
+
+
+def has_columnar_copy(filepath):
+    """True if a columnar copy exists and is newer than the upload it came from"""
+    if feather is None:
+        return False
+    path = columnar_path(filepath)
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(filepath)
+
+
+def write_columnar_copy(filepath, df):
+    """Convert a parsed upload to Feather once so later loads can project columns.
+
+    Uncompressed and in a single record batch so numeric columns can be
+    memory-mapped back without a copy; float NaNs are stored as values rather
+    than nulls for the same reason. Conversion failures (e.g. object columns
+    holding mixed types) only cost the fast path, the original file is still
+    read in that case.
+    """
+    if feather is None:
+        return
+    path = columnar_path(filepath)
+    tmp_path = path + '.tmp'
+    try:
+        table = pa.Table.from_pandas(df)
+        for i, name in enumerate(df.columns):
+            if df[name].dtype.kind == 'f':
+                table = table.set_column(i, name, pa.array(df[name].to_numpy(), from_pandas=False))
+        feather.write_feather(table, tmp_path, compression='uncompressed', chunksize=max(len(df), 1))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        app.logger.warning("Columnar conversion skipped for %s: %s", filepath, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_columnar_copy(filepath, columns):
+    """Columns of the columnar copy as a DataFrame.
+
+    Numeric and naive datetime columns without nulls are read-only views of
+    the memory-mapped file, everything else is converted by pyarrow.
+    """
+    table = feather.read_table(columnar_path(filepath), columns=columns, memory_map=True)
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        plain = (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                 or (pa.types.is_timestamp(column.type) and column.type.tz is None))
+        if plain and column.num_chunks == 1 and column.null_count == 0:
+            values = column.chunk(0).to_numpy(zero_copy_only=True)
+            data[name] = pd.Series(values, name=name, copy=False)
+        else:
+            data[name] = column.to_pandas()
+    return pd.DataFrame(data, copy=False)
+
+
+def describe_columnar(filepath):
+    """Columns, numeric columns and row count of a columnar dataset, without loading it"""
+    with pa.memory_map(columnar_path(filepath)) as source:
+        reader = pyarrow.ipc.open_file(source)
+        schema = reader.schema
+        row_count = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    numeric_columns = [field.name for field in schema
+                       if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+    return schema.names, numeric_columns, row_count
+
+
+def columnar_columns(filepath):
+    """Column names of the columnar copy, read from the file footer only"""
+    with pyarrow.ipc.open_file(columnar_path(filepath)) as reader:
+        return reader.schema.names
+
+
+def float32_as_decimal(values):
+    """float64 copy of a float32 array holding each value's shortest decimal.
+
+    float32 15.2 is 15.199999809265137 as a double, which is what JSON and
+    Float64Array output would show; the shortest decimal is what the upload
+    had. Arrays of any other dtype are returned as they are.
+    """
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        return values
+    return values.astype(str).astype(np.float64)
+
+
+def float32_if_exact(col):
+    """float32 copy of a float64 column if no value changes at its decimals, else the column"""
+    values = col.to_numpy()
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return col.astype(np.float32)
+    if np.abs(finite).max() > np.finfo(np.float32).max:
+        return col
+    for decimals in range(FLOAT32_MAX_DECIMALS + 1):
+        scaled = finite * 10.0 ** decimals
+        if np.allclose(scaled, np.round(scaled), rtol=1e-9, atol=1e-6):
+            break
+    else:
+        # More decimals than float32 can promise, e.g. computed values
+        return col
+    error = np.abs(finite.astype(np.float32).astype(np.float64) - finite).max()
+    if error < 0.5 * 10.0 ** -decimals:
+        return col.astype(np.float32)
+    return col
+
+
+def shrink_text_column(col):
+    """datetime64 for columns of dates, categorical for repetitive text, else the column"""
+    non_null = col.dropna()
+    if len(non_null) == 0:
+        return col
+    sample = non_null.iloc[:DATE_SAMPLE_ROWS].astype(str)
+    # Times of day alone ("10:30") would be parsed as today's date
+    if sample.str.contains(DATE_PART_PATTERN).all():
+        with warnings.catch_warnings():
+            # pandas warns when it falls back to per-value format inference
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(col, errors='coerce')
+        if parsed.notna().sum() == len(non_null):
+            return parsed
+    if col.nunique(dropna=True) <= len(col) * CATEGORY_MAX_RATIO:
+        return col.astype('category')
+    return col
+
+
+def shrink_dtypes(df):
+    """Copy of a parsed upload with the smallest dtypes that keep its values"""
+    shrunk = {}
+    for name, col in df.items():
+        if col.dtype.kind == 'i':
+            shrunk[name] = pd.to_numeric(col, downcast='integer')
+        elif col.dtype.kind == 'u':
+            shrunk[name] = pd.to_numeric(col, downcast='unsigned')
+        elif col.dtype == np.float64:
+            shrunk[name] = float32_if_exact(col)
+        elif col.dtype == object:
+            shrunk[name] = shrink_text_column(col)
+        else:
+            shrunk[name] = col
+    return pd.DataFrame(shrunk, index=df.index, copy=False)
+
+
+def config_columns(config):
+    """Columns a graph config refers to, used for column projection.
+
+    Returns None when the config names no columns so callers load everything.
+    """
+    names = [config.get('x_column')]
+    for key in ('y_columns', 'y1_columns', 'y2_columns', 'hover_columns'):
+        names.extend(config.get(key) or [])
+    for key in ('latitude_column', 'longitude_column', 'color_column', 'size_column'):
+        names.append(config.get(key))
+    columns = list(dict.fromkeys(name for name in names if name))
+    return columns or None
+
+
+_zip_pool = None
+_zip_pool_lock = threading.Lock()
+
+
+def read_zip_archive(filepath):
+    """Parse all CSV members of a zip in parallel and stack them"""
+    global _zip_pool
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        members = zip_csv_members(zip_ref)
+    if not members:
+        raise ValueError('No CSV file found in zip archive')
+
+    if len(members) == 1:
+        frames = [read_zip_member(filepath, members[0])]
+    else:
+        with _zip_pool_lock:
+            if _zip_pool is None:
+                # spawn: forking a process that runs job threads can deadlock,
+                # and it is the only start method on Windows anyway
+                _zip_pool = ProcessPoolExecutor(max_workers=ZIP_PARSE_WORKERS,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        frames = list(_zip_pool.map(read_zip_member, [filepath] * len(members), members))
+
+    df = pd.concat(frames, ignore_index=True)
+    df[ZIP_SOURCE_COLUMN] = df[ZIP_SOURCE_COLUMN].astype('category')
+    return df
+
+
+def cached_parse(filepath, kind, parser):
+    """Run a specialised parser (ping, iperf, ...) through the dataset cache"""
+    key = dataset_fingerprint(filepath) + (kind,)
+    df = dataset_cache.get(key)
+    if df is None:
+        df = parser(filepath)
+        dataset_cache.put(key, df)
+    return df
+
+
+@contextmanager
+def dataset_loading(filename):
+    """Hold the per-file load lock of an upload, created on first use and
+    dropped once nobody holds or waits for it"""
+    with dataset_load_locks_lock:
+        lock, users = dataset_load_locks.get(filename, (None, 0))
+        if lock is None:
+            lock = threading.Lock()
+        dataset_load_locks[filename] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with dataset_load_locks_lock:
+            lock, users = dataset_load_locks[filename]
+            if users == 1:
+                del dataset_load_locks[filename]
+            else:
+                dataset_load_locks[filename] = (lock, users - 1)
+
+
+def load_dataset(filename, columns=None):
+    """Return the parsed DataFrame for an upload, going through the dataset cache.
+
+    With ``columns`` only those columns are guaranteed to be present; they are
+    read from the columnar copy of the upload when one exists, so a graph over
+    three columns of a wide file never parses the rest. Concurrent calls for
+    one file (e.g. the background upload scan and the first render) parse it
+    once, later callers wait for the first and find its result cached.
+    """
+    with dataset_loading(filename):
+        return _load_dataset(filename, columns)
+
+
+def _load_dataset(filename, columns):
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    key = dataset_fingerprint(filepath)
+    columnar = has_columnar_copy(filepath)
+    if columns is None and columnar:
+        # Cached entries may be projections, so "everything" must be explicit
+        columns = columnar_columns(filepath)
+    df = dataset_cache.get(key)
+
+    if df is not None:
+        missing = [col for col in (columns or []) if col not in df.columns]
+        if not missing:
+            return df
+        if columnar:
+            # Widen the cached projection with just the missing columns
+            df = pd.concat([df, read_columnar_copy(filepath, missing)], axis=1, copy=False)
+            dataset_cache.put(key, df)
+            return df
+
+    if columnar:
+        df = read_columnar_copy(filepath, columns)
+    else:
+        parsed = read_dataset_file(filepath)
+        parsed_bytes = int(parsed.memory_usage(index=True, deep=True).sum())
+        df = shrink_dtypes(parsed)
+        del parsed
+        write_columnar_copy(filepath, df)
+        if has_columnar_copy(filepath):
+            # Swap the in-memory numeric columns for views of the mapped copy
+            df = read_columnar_copy(filepath, None)
+        report_footprint(filename, key, parsed_bytes, df)
+    dataset_cache.put(key, df)
+    return df
+
+
+def report_footprint(filename, fingerprint, parsed_bytes, df):
+    """Log and publish parsed vs. stored memory use of a freshly loaded dataset"""
+    footprint = dataframe_footprint(df)
+    footprint['parsed_bytes'] = parsed_bytes
+    footprint['dtypes'] = {str(name): str(dtype) for name, dtype in df.dtypes.items()}
+    mb = 1024 * 1024
+    app.logger.info("Loaded %s: %.1f MB as parsed, %.1f MB in memory + %.1f MB memory-mapped "
+                    "after shrinking dtypes", filename, parsed_bytes / mb,
+                    footprint['heap_bytes'] / mb, footprint['mapped_bytes'] / mb)
+    publish_upload_info(filename, fingerprint, {'memory': footprint})
+
+# Per-file locks of load_dataset with their number of users, keyed by filename
+dataset_load_locks = {}
+dataset_load_locks_lock = threading.Lock()
+
+# Background row counts / dtypes of uploads, keyed by filename
+upload_info = {}
+upload_info_lock = threading.Lock()
+
+# Quadkey indexes of map datasets for /map_tiles, see map_index
+map_indexes = OrderedDict()
+map_index_lock = threading.Lock()
+
+# Serializes creating live tails, which are kept in dataset_cache
+log_tails_lock = threading.Lock()
+
+
+def sniff_csv_schema(source):
+    """Columns and numeric columns inferred from the first SCHEMA_SAMPLE_BYTES.
+
+    ``source`` is a path or an open binary file (e.g. a zip member).
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            sample = f.read(SCHEMA_SAMPLE_BYTES)
+            truncated = f.read(1) != b''
+    else:
+        sample = source.read(SCHEMA_SAMPLE_BYTES)
+        truncated = source.read(1) != b''
+    if truncated and b'\n' in sample:
+        # Drop the partial last line so it is not mis-parsed
+        sample = sample[:sample.rindex(b'\n') + 1]
+    df = pd.read_csv(io.BytesIO(sample))
+    return df.columns.tolist(), df.select_dtypes(include=['number']).columns.tolist()
+
+
+def text_format_path(filepath):
+    """Location of the sniffed format of a txt/log upload"""
+    return filepath + '.format.json'
+
+
+def text_format(filepath):
+    """Sniffed read_csv options of a txt/log upload, see text_format.py.
+
+    The decision is stored next to the upload with the upload's mtime and
+    size, so later reads (renders, chunked scans, restarts) reuse it instead
+    of sniffing again until the file is replaced.
+    """
+    path = text_format_path(filepath)
+    stamp = list(dataset_fingerprint(filepath)[1:])
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        if saved.get('fingerprint') == stamp:
+            return saved
+    except (OSError, ValueError):
+        pass
+    detected = sniff_text_format(filepath)
+    detected['fingerprint'] = stamp
+    try:
+        with open(path, 'w') as f:
+            json.dump(detected, f)
+    except OSError as e:
+        app.logger.warning("Could not save text format of %s: %s", os.path.basename(filepath), e)
+    return detected
+
+
+def scan_csv_upload(filename, fingerprint, options=None):
+    """Count rows and settle column dtypes in the background.
+
+    Files that graphs load whole are parsed once here through load_dataset,
+    which also writes the columnar copy, so the first graph does not pay for
+    the conversion. Files that are streamed instead are only counted with a
+    chunked reader.
+    """
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if not streams_file(filepath):
+        scan_loaded_upload(filename, fingerprint)
+        return
+    row_count = 0
+    numeric = None
+    columns = []
+    try:
+        for chunk in iter_csv(filepath, ROW_COUNT_CHUNK_ROWS, csv_engine=CSV_ENGINE, **(options or {})):
+            row_count += len(chunk)
+            chunk_numeric = set(chunk.select_dtypes(include=['number']).columns)
+            # A column is numeric only if every chunk parsed it as numeric
+            numeric = chunk_numeric if numeric is None else numeric & chunk_numeric
+            columns = chunk.columns.tolist()
+        info = {
+            'status': 'ready',
+            'row_count': row_count,
+            'columns': columns,
+            'numeric_columns': [col for col in columns if col in (numeric or ())]
+        }
+    except Exception as e:
+        info = {'status': 'error', 'error': str(e)}
+    publish_upload_info(filename, fingerprint, info)
+
+
+def scan_loaded_upload(filename, fingerprint):
+    """Parse an upload (every member of a zip) through load_dataset, warming the dataset cache"""
+    try:
+        df = load_dataset(filename)
+        info = {
+            'status': 'ready',
+            'row_count': len(df),
+            'columns': df.columns.tolist(),
+            'numeric_columns': df.select_dtypes(include=['number']).columns.tolist()
+        }
+    except Exception as e:
+        info = {'status': 'error', 'error': str(e)}
+    publish_upload_info(filename, fingerprint, info)
+
+
+def publish_upload_info(filename, fingerprint, info):
+    with upload_info_lock:
+        # A newer upload with the same name may have replaced this one meanwhile
+        if upload_info.get(filename, {}).get('fingerprint') == fingerprint:
+            upload_info[filename].update(info)
+
+
+def forget_upload_info(filename):
+    """Drop the background info of an upload that was replaced or deleted"""
+    with upload_info_lock:
+        upload_info.pop(filename, None)
+
+
+def save_upload_stream(stream, filepath):
+    """Copy an incoming upload to disk without holding it in memory"""
+    with open(filepath, 'wb') as out:
+        shutil.copyfileobj(stream, out, UPLOAD_CHUNK_SIZE)
+
+
+# =============================================================================
+# RESPONSE COMPRESSION AND CACHING
+# =============================================================================
+
+static_hashes = {}
+static_compressed = {}
+static_cache_lock = threading.Lock()
+
+
+def static_file_state(filename):
+    """(path, mtime_ns) of a static file, None if it does not exist"""
+    path = os.path.join(app.static_folder, filename)
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@app.url_defaults
+def versioned_static_url(endpoint, values):
+    """Add a content hash to static URLs so they can be cached long term"""
+    if endpoint != 'static' or 'filename' not in values:
+        return
+    state = static_file_state(values['filename'])
+    if state is None:
+        return
+    with static_cache_lock:
+        digest = static_hashes.get(state)
+    if digest is None:
+        with open(state[0], 'rb') as f:
+            digest = hashlib.md5(f.read()).hexdigest()[:12]
+        with static_cache_lock:
+            # Drop the hashes of older versions of the same file
+            for old in [k for k in static_hashes if k[0] == state[0]]:
+                del static_hashes[old]
+            static_hashes[state] = digest
+    values['v'] = digest
+
+
+def accepted_encoding():
+    """Best Content-Encoding the client accepts, None for identity"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_body(body, encoding, level=COMPRESS_LEVEL):
+    if encoding == 'br':
+        # Brotli quality runs 0-11 rather than 1-9
+        return brotli.compress(body, quality=min(11, level + 2))
+    return gzip.compress(body, compresslevel=level)
+
+
+def compressed_static(filename, encoding):
+    """Compressed bytes of a static file, built once per file version"""
+    state = static_file_state(filename)
+    if state is None:
+        return None
+    key = state + (encoding,)
+    with static_cache_lock:
+        body = static_compressed.get(key)
+    if body is None:
+        with open(state[0], 'rb') as f:
+            body = compress_body(f.read(), encoding, level=9)
+        with static_cache_lock:
+            # Drop older versions of the same file
+            for old in [k for k in static_compressed if k[0] == state[0]]:
+                del static_compressed[old]
+            static_compressed[key] = body
+    return body
+
+
+@app.after_request
+def compress_and_cache(response):
+    """Long-lived caching for versioned static files, compression for large bodies"""
+    is_static = request.endpoint == 'static'
+    if is_static and request.args.get('v'):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    encoding = accepted_encoding()
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    if is_static:
+        if (response.content_length or 0) < COMPRESS_MIN_BYTES:
+            return response
+        body = compressed_static(request.view_args['filename'], encoding)
+        if body is None:
+            return response
+        # Swap the file stream for the cached compressed copy
+        if hasattr(response.response, 'close'):
+            response.response.close()
+        response.direct_passthrough = False
+        # The same content in another encoding, so the validator becomes weak
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+    else:
+        if response.direct_passthrough:
+            return response
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+        body = compress_body(body, encoding)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', out_of_core_mb=OUT_OF_CORE_FILE_MB)
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -55,124 +1136,1051 @@ def upload_file():
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        save_upload_stream(file.stream, filepath)
+        return ingest_upload(filename)
+    else:
+        return jsonify({'error': 'Invalid file type'}), 400
+
+
+def ingest_upload(filename):
+    """Build the upload response for a file that is fully written to disk"""
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    # Info about an earlier file with this name no longer applies
+    forget_upload_info(filename)
+    try:
+        # Determine file type and read accordingly
+        file_extension = filename.rsplit('.', 1)[1].lower()
         
-        try:
-            # Determine file type and read accordingly
-            file_extension = filename.rsplit('.', 1)[1].lower()
-            
-            if file_extension == 'csv':
-                df = pd.read_csv(filepath)
-                # Get column information
-                columns = df.columns.tolist()
-                numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+        if file_extension == 'csv':
+            # Get column information from a sample, the full pass runs in the background
+            columns, numeric_columns = sniff_csv_schema(filepath)
+            fingerprint = dataset_fingerprint(filepath)
+            with upload_info_lock:
+                upload_info[filename] = {'status': 'pending', 'fingerprint': fingerprint}
+            threading.Thread(target=scan_csv_upload, args=(filename, fingerprint), daemon=True).start()
+        
+            return jsonify({
+                'success': True,
+                'filename': filename,
+                'columns': columns,
+                'numeric_columns': numeric_columns,
+                'row_count': None,
+                'row_count_pending': True,
+                'file_type': file_extension
+            })
+
+        elif file_extension in ['txt', 'log'] and text_format(filepath)['tabular']:
+            # Delimited text is handled like CSV with its sniffed options,
+            # free-form logs (e.g. ping output) fall through to the plain response
+            detected = text_format(filepath)
+            fingerprint = dataset_fingerprint(filepath)
+            with upload_info_lock:
+                upload_info[filename] = {'status': 'pending', 'fingerprint': fingerprint}
+            threading.Thread(target=scan_csv_upload, args=(filename, fingerprint, detected['options']),
+                             daemon=True).start()
+
+            return jsonify({
+                'success': True,
+                'filename': filename,
+                'columns': detected['columns'],
+                'numeric_columns': detected['numeric_columns'],
+                'row_count': None,
+                'row_count_pending': True,
+                'file_type': file_extension
+            })
+
+        elif file_extension in ['json', 'txt', "log"]:
+            return jsonify({
+                'success': True,
+                'filename': filename,
+                'filepath': filepath,
+                'file_type': file_extension
+            })
             
-                return jsonify({
-                    'success': True,
-                    'filename': filename,
+        elif file_extension == 'zip':
+            # Columns come from the first member, all members are parsed in the background
+            with zipfile.ZipFile(filepath, 'r') as zip_ref:
+                csv_files = zip_csv_members(zip_ref)
+                if not csv_files:
+                    return jsonify({'error': 'No CSV file found in zip archive'}), 400
+                with zip_ref.open(csv_files[0]) as csv_file:
+                    columns, numeric_columns = sniff_csv_schema(csv_file)
+            columns.append(ZIP_SOURCE_COLUMN)
+            fingerprint = dataset_fingerprint(filepath)
+            with upload_info_lock:
+                upload_info[filename] = {'status': 'pending', 'fingerprint': fingerprint}
+            threading.Thread(target=scan_loaded_upload, args=(filename, fingerprint), daemon=True).start()
+
+            return jsonify({
+                'success': True,
+                'filename': filename,
+                'columns': columns,
+                'numeric_columns': numeric_columns,
+                'row_count': None,
+                'row_count_pending': True,
+                'member_count': len(csv_files),
+                'file_type': file_extension
+            })
+        else:
+            return jsonify({'error': f'Unsupported file type: {file_extension}'}), 400
+        
+    except Exception as e:
+        return jsonify({'error': f'Error reading file: {str(e)}'}), 400
+
+
+# =============================================================================
+# RESUMABLE CHUNKED UPLOADS
+# =============================================================================
+
+def partial_upload_dir(upload_id):
+    # Upload ids are uuid4 hex strings, anything else could escape the folder
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id):
+        return None
+    path = os.path.join(PARTIAL_UPLOAD_FOLDER, upload_id)
+    return path if os.path.isdir(path) else None
+
+
+def read_partial_meta(upload_dir):
+    with open(os.path.join(upload_dir, 'meta.json')) as f:
+        return json.load(f)
+
+
+def expected_part_size(meta, index):
+    if index == meta['total_chunks'] - 1:
+        return meta['size'] - index * meta['chunk_size']
+    return meta['chunk_size']
+
+
+def received_parts(upload_dir, meta):
+    """Indices of chunks that are completely written"""
+    received = []
+    for index in range(meta['total_chunks']):
+        part = os.path.join(upload_dir, f'{index}.part')
+        if os.path.exists(part) and os.path.getsize(part) == expected_part_size(meta, index):
+            received.append(index)
+    return received
+
+
+def purge_stale_partial_uploads():
+    cutoff = time.time() - PARTIAL_UPLOAD_MAX_AGE_HOURS * 3600
+    for upload_id in os.listdir(PARTIAL_UPLOAD_FOLDER):
+        path = os.path.join(PARTIAL_UPLOAD_FOLDER, upload_id)
+        if os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@app.route('/upload/init', methods=['POST'])
+def upload_init():
+    data = request.json
+    filename = secure_filename(data.get('filename') or '')
+    size = int(data.get('size') or 0)
+
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type'}), 400
+    if size <= 0:
+        return jsonify({'error': 'Empty file'}), 400
+    if size > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': f'File exceeds the {MAX_FILE_SIZE_MB} MB limit'}), 413
+
+    os.makedirs(PARTIAL_UPLOAD_FOLDER, exist_ok=True)
+    purge_stale_partial_uploads()
+
+    upload_id = uuid.uuid4().hex
+    meta = {
+        'filename': filename,
+        'size': size,
+        'chunk_size': UPLOAD_PART_SIZE,
+        'total_chunks': -(-size // UPLOAD_PART_SIZE)
+    }
+    upload_dir = os.path.join(PARTIAL_UPLOAD_FOLDER, upload_id)
+    os.makedirs(upload_dir)
+    with open(os.path.join(upload_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    return jsonify({'success': True, 'upload_id': upload_id, 'received': [], **meta})
+
+
+@app.route('/upload/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Chunks already stored, so an interrupted upload can resume"""
+    upload_dir = partial_upload_dir(upload_id)
+    if upload_dir is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    meta = read_partial_meta(upload_dir)
+    return jsonify({'success': True, 'upload_id': upload_id, 'received': received_parts(upload_dir, meta), **meta})
+
+
+@app.route('/upload/<upload_id>/chunk/<int:index>', methods=['PUT'])
+def upload_chunk(upload_id, index):
+    upload_dir = partial_upload_dir(upload_id)
+    if upload_dir is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    meta = read_partial_meta(upload_dir)
+    if not 0 <= index < meta['total_chunks']:
+        return jsonify({'error': 'Chunk index out of range'}), 400
+
+    # Stream the body to a temp file, checksumming as it goes
+    part = os.path.join(upload_dir, f'{index}.part')
+    tmp_part = part + f'.{uuid.uuid4().hex}.tmp'
+    crc = 0
+    written = 0
+    with open(tmp_part, 'wb') as out:
+        while True:
+            block = request.stream.read(UPLOAD_CHUNK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            written += len(block)
+            out.write(block)
+
+    expected_crc = request.headers.get('X-Chunk-CRC32', '')
+    if written != expected_part_size(meta, index) or f'{crc:08x}' != expected_crc.lower():
+        os.remove(tmp_part)
+        return jsonify({'error': f'Chunk {index} failed verification, resend it'}), 422
+
+    os.replace(tmp_part, part)
+    return jsonify({'success': True, 'index': index})
+
+
+@app.route('/upload/<upload_id>/finalize', methods=['POST'])
+def upload_finalize(upload_id):
+    upload_dir = partial_upload_dir(upload_id)
+    if upload_dir is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    meta = read_partial_meta(upload_dir)
+
+    received = received_parts(upload_dir, meta)
+    if len(received) != meta['total_chunks']:
+        missing = sorted(set(range(meta['total_chunks'])) - set(received))
+        return jsonify({'error': 'Upload incomplete', 'missing': missing}), 409
+
+    filename = meta['filename']
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    tmp_path = filepath + f'.{upload_id}.tmp'
+    with open(tmp_path, 'wb') as out:
+        for index in range(meta['total_chunks']):
+            with open(os.path.join(upload_dir, f'{index}.part'), 'rb') as part:
+                shutil.copyfileobj(part, out, UPLOAD_CHUNK_SIZE)
+    os.replace(tmp_path, filepath)
+    shutil.rmtree(upload_dir, ignore_errors=True)
+
+    return ingest_upload(filename)
+
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='graph-job')
+jobs = {}
+jobs_lock = threading.Lock()
+
+
+def update_job(job_id, **fields):
+    with jobs_lock:
+        if job_id in jobs:
+            jobs[job_id].update(fields)
+
+
+def run_job(job_id, func, args):
+    def progress(phase, percent):
+        update_job(job_id, status='running', phase=phase, percent=percent)
+
+    progress('starting', 0)
+    try:
+        result = func(*args, progress)
+        update_job(job_id, status='done', phase='done', percent=100, result=result, finished=time.time())
+    except Exception as e:
+        update_job(job_id, status='error', error=str(e), finished=time.time())
+
+
+def submit_job(func, *args):
+    """Run func(*args, progress) on the job pool and return the job id"""
+    cutoff = time.time() - JOB_RESULT_TTL_SECONDS
+    job_id = uuid.uuid4().hex
+    with jobs_lock:
+        for old_id in [k for k, job in jobs.items() if job.get('finished', time.time()) < cutoff]:
+            del jobs[old_id]
+        jobs[job_id] = {'status': 'queued', 'phase': 'queued', 'percent': 0}
+    job_executor.submit(run_job, job_id, func, args)
+    return job_id
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Phase and percent of a job; includes the result once it is done"""
+    with jobs_lock:
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Unknown job'}), 404
+        job = dict(job)
+    job.pop('finished', None)
+    # Figures can still hold numpy/pandas values outside the encoded arrays
+    return app.response_class(json.dumps(job, cls=plotly.utils.PlotlyJSONEncoder),
+                              mimetype='application/json')
+
+
+#TODO refactor this to properly sort out the file types and generate the appropriate graph / post process
+GRAPH_TYPES = {'scatter', 'single_line', 'dual_line', 'scatter_on_map', 'csv_joiner',
+               'ping', 'iperf_tcp', 'iperf_udp'}
+
+@app.route('/generate_graph', methods=['POST'])
+def generate_graph():
+    """Queue a graph render; poll /jobs/<job_id> for progress and the figure"""
+    try:
+        data = request.json
+        filename = data.get('filename')
+        graph_type = data.get('graph_type')
+        config = data.get('config', {})
+        
+        if graph_type not in GRAPH_TYPES:
+            return jsonify({'error': 'Invalid graph type'}), 400
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if not os.path.exists(filepath):
+            return jsonify({'error': f'Unknown file: {filename}'}), 404
+        
+        # The client keeps figures it has already rendered and sends their tag
+        etag = graph_etag(filepath, graph_type, config)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        job_id = submit_job(render_graph, filename, graph_type, config)
+        response = jsonify({'success': True, 'job_id': job_id, 'etag': etag})
+        response.set_etag(etag)
+        return response, 202
+        
+    except Exception as e:
+        return jsonify({'error': f'Error generating graph: {str(e)}'}), 400
+
+
+def graph_etag(filepath, graph_type, config):
+    """Tag of a render: dataset version, graph type and normalized config"""
+    key = json.dumps([dataset_fingerprint(filepath), graph_type, config], sort_keys=True, default=str)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def figure_cache_key(filepath, graph_type, config):
+    """Figure cache key: dataset version, graph type and normalized config.
+
+    Empty values are dropped and keys sorted so equivalent configs match.
+    Cosmetic keys are left out for column graphs, see cosmetic_layout.
+    """
+    normalized = {key: value for key, value in config.items()
+                  if value is not None and value != '' and value != []}
+    if graph_type in COLUMN_BUILDERS:
+        normalized = {key: value for key, value in normalized.items() if key not in COSMETIC_CONFIG_KEYS}
+    return (dataset_fingerprint(filepath), graph_type, json.dumps(normalized, sort_keys=True, default=str))
+
+
+def cosmetic_layout(graph_type, config, layout):
+    """Layout of a cached column graph for the current cosmetic config.
+
+    Runs the chart builder on an empty frame, which yields the layout the
+    full render would have without touching the data. Axis types set while
+    encoding datetimes come from the data, so they carry over.
+    """
+    empty = pd.DataFrame({column: pd.Series(dtype=float) for column in config_columns(config) or []})
+    new_layout = COLUMN_BUILDERS[graph_type](empty, config).to_plotly_json()['layout']
+    for name, axis in layout.items():
+        if name.startswith(('xaxis', 'yaxis')) and isinstance(axis, dict) and 'type' in axis:
+            new_layout.setdefault(name, {}).setdefault('type', axis['type'])
+    return new_layout
+
+
+def cache_figure_result(cache_key, result):
+    if cache_key is not None:
+        body = json.dumps(result, cls=plotly.utils.PlotlyJSONEncoder).encode('utf-8')
+        figure_cache.put(cache_key, body)
+    return result
+
+
+def render_graph(filename, graph_type, config, progress):
+    """Build the /generate_graph response body, reporting progress per phase"""
+    try:
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if graph_type == 'csv_joiner':
+            # Produces a new dataset rather than a figure
+            progress('join', 5)
+            joined_name = csv_joiner(filepath, config, progress)
+            columns, numeric_columns, row_count = describe_columnar(
+                os.path.join(app.config['UPLOAD_FOLDER'], joined_name))
+            return {
+                'success': True,
+                'message': f'Joined {row_count} rows into {joined_name}',
+                'dataset': {
+                    'filename': joined_name,
                     'columns': columns,
                     'numeric_columns': numeric_columns,
-                    'row_count': len(df),
-                    'file_type': file_extension
-                })
-
-            elif file_extension in ['json', 'txt', "log"]:
-                return jsonify({
-                    'success': True,
-                    'filename': filename,
-                    'filepath': filepath,
-                    'file_type': file_extension
-                })
-                
-            elif file_extension == 'zip':
-                # Handle zip files - extract and read the first CSV file
-                import zipfile
-                with zipfile.ZipFile(filepath, 'r') as zip_ref:
-                    csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
-                    if csv_files:
-                        pass
-                        #TODO store list of csv files and then process
-                    else:
-                        return jsonify({'error': 'No CSV file found in zip archive'}), 400
-            else:
-                return jsonify({'error': f'Unsupported file type: {file_extension}'}), 400
-            
-        except Exception as e:
-            return jsonify({'error': f'Error reading file: {str(e)}'}), 400
+                    'row_count': row_count,
+                    'file_type': 'feather'
+                }
+            }
+
+        if follows_file(filepath, graph_type, config):
+            # Drawn from the rows /tail goes on to extend
+            return live_render(filename, graph_type, config, progress)
+
+        cache_key = None
+        if graph_type in LOG_PLOTTERS or graph_type in COLUMN_BUILDERS or graph_type == 'scatter_on_map':
+            cache_key = figure_cache_key(filepath, graph_type, config)
+            cached = figure_cache.get(cache_key)
+            if cached is not None:
+                progress('serialize', 80)
+                result = json.loads(cached)
+                if graph_type in COLUMN_BUILDERS:
+                    # Titles, theme and axis ranges may differ from the cached render
+                    graph = result['graph']
+                    graph['layout'] = cosmetic_layout(graph_type, config, graph['layout'])
+                return result
+
+        if graph_type in LOG_PLOTTERS:
+            kind, parser, plotter = LOG_PLOTTERS[graph_type]
+            progress('parse', 5)
+            cached_parse(filepath, kind, parser)
+            progress('decimate', 40)
+            fig = render_figure(plotter(filepath, config), config)
+            progress('serialize', 80)
+            original = fig.layout.meta['source_points']
+            result = {'success': True, 'graph': encode_figure(fig), 'point_counts': point_counts(original, fig)}
+            return cache_figure_result(cache_key, result)
+
+        if use_out_of_core(filepath, graph_type, config):
+            # Too large to load, plot per-bucket aggregates streamed from disk
+            progress('aggregate', 5)
+            if graph_type == 'scatter_on_map':
+                agg, map_config, rows = aggregated_map(filepath, config)
+                fig = map_figure(agg, map_config)
+                progress('serialize', 80)
+                # Cells colored by a text column keep this render, see map_tiles_apply
+                result = {'success': True, 'graph': encode_figure(fig), 'aggregated': True,
+                          'point_counts': point_counts(rows, fig), 'map_tiles': map_tiles_apply(agg, config)}
+                return cache_figure_result(cache_key, result)
+            fig, original = aggregated_figure(filepath, graph_type, config)
+            fig = render_figure(fig, config)
+            progress('serialize', 80)
+            result = {'success': True, 'graph': encode_figure(fig), 'aggregated': True,
+                      'point_counts': point_counts(original, fig)}
+            return cache_figure_result(cache_key, result)
+
+        progress('parse', 5)
+        # Parsed data is shared with /upload through the dataset cache
+        df = load_dataset(filename, config_columns(config))
+        
+        progress('decimate', 40)
+        # Create graph based on type
+        if graph_type in COLUMN_BUILDERS:
+            fig = render_figure(COLUMN_BUILDERS[graph_type](df, config), config)
+        elif graph_type == 'scatter_on_map':
+            # Already WebGL, the render mode does not apply
+            fig = scatter_on_map(df, config)
+        
+        progress('serialize', 80)
+        # Numeric arrays go out as typed arrays, app.js decodes them
+        graph = encode_figure(fig)
+        original = len(df) if graph_type == 'scatter_on_map' else len(df) * len(fig.data)
+        result = {'success': True, 'graph': graph, 'point_counts': point_counts(original, fig)}
+        if graph_type == 'scatter_on_map':
+            result['map_tiles'] = map_tiles_apply(df, config)
+        return cache_figure_result(cache_key, result)
+        
+    except Exception as e:
+        raise RuntimeError(f'Error generating graph: {str(e)}') from e
+
+@app.route('/dataset_info/<filename>', methods=['GET'])
+def dataset_info(filename):
+    filename = secure_filename(filename)
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    with upload_info_lock:
+        info = upload_info.get(filename)
+        if info is not None and (not os.path.exists(filepath)
+                                 or dataset_fingerprint(filepath) != info['fingerprint']):
+            # The file was deleted or replaced outside the upload routes
+            del upload_info[filename]
+            info = None
+        if info is None:
+            return jsonify({'error': 'Unknown dataset'}), 404
+        info = {key: value for key, value in info.items() if key != 'fingerprint'}
+    return jsonify(info)
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    stats = dataset_cache.stats()
+    stats['figures'] = figure_cache.stats()
+    return jsonify(stats)
+
+@app.route('/column_stats', methods=['POST'])
+def column_stats():
+    """Single-pass statistics for the columns of an upload.
+
+    Files that would be aggregated out of core are streamed in chunks, others
+    go through the dataset cache. Distinct counts and quantiles are sketched
+    for large columns (see column_stats.py).
+    """
+    try:
+        data = request.json
+        filename = secure_filename(data.get('filename') or '')
+        columns = data.get('columns') or None
+        statistics = data.get('statistics') or ALL_STATISTICS
+        if set(statistics) - ALL_STATISTICS:
+            return jsonify({'error': 'Unknown statistics requested'}), 400
+
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if not filename or not os.path.exists(filepath):
+            return jsonify({'error': 'File not found'}), 404
+        streamed = streams_file(filepath, data.get('aggregate') or 'auto')
+        if streamed:
+            chunks = iter_file_chunks(filepath, columns)
+        else:
+            df = load_dataset(filename, columns)
+            chunks = df[columns] if columns else df
+
+        summaries = summarize_columns(chunks, statistics)
+        body = json.dumps({
+            'success': True,
+            'streamed': streamed,
+            'rows': summaries[0].rows if summaries else 0,
+            'columns': [summary.to_dict() for summary in summaries]
+        }, cls=plotly.utils.PlotlyJSONEncoder)
+        return app.response_class(body, mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': f'Error calculating statistics: {str(e)}'}), 400
+
+@app.route('/map_tiles', methods=['POST'])
+def map_tiles():
+    """Points or clusters of a map inside the current viewport, for pan and zoom"""
+    try:
+        data = request.json
+        filename = secure_filename(data.get('filename') or '')
+        config = data.get('config', {})
+        bounds = [float(value) for value in data.get('bounds', [])]
+        zoom = float(data.get('zoom', 0))
+        if len(bounds) != 4:
+            return jsonify({'error': 'bounds must be [west, south, east, north]'}), 400
+
+        lat_col = config.get('latitude_column')
+        lon_col = config.get('longitude_column')
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if not filename or not os.path.exists(filepath):
+            return jsonify({'error': 'File not found'}), 404
+        if not lat_col or not lon_col:
+            return jsonify({'error': 'Please select latitude and longitude columns'}), 400
+
+        value_cols = [col for col in dict.fromkeys([config.get('color_column'), config.get('size_column')]
+                                                   + list(config.get('hover_columns') or []))
+                      if col and col not in (lat_col, lon_col)]
+        index = map_index(filename, lat_col, lon_col, value_cols)
+        trace, clustered, points = viewport_trace(index, config, bounds, zoom, config.get('tile_mode'))
+        encode_trace(trace, {})
+        body = json.dumps({
+            'success': True,
+            'trace': trace,
+            'clustered': clustered,
+            'points': points
+        }, cls=plotly.utils.PlotlyJSONEncoder)
+        return app.response_class(body, mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': f'Error loading map tiles: {str(e)}'}), 400
+
+@app.route('/graph_window', methods=['POST'])
+def graph_window():
+    """Re-decimate the traces of a graph for the visible x-range after a zoom"""
+    try:
+        data = request.json
+        filename = data.get('filename')
+        graph_type = data.get('graph_type')
+        config = data.get('config', {})
+        x_range = data.get('x_range')
+
+        if graph_type not in TRACE_METHODS:
+            return jsonify({'error': 'Invalid graph type'}), 400
+
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if use_out_of_core(filepath, graph_type, config):
+            return jsonify({'error': 'Aggregated graphs of large files are not re-fetched on zoom'}), 400
+        df = load_dataset(filename, config_columns(config))
+        x_col = config.get('x_column')
+        window = window_rows(dataset_fingerprint(filepath), df, x_col, x_range)
+
+        traces = []
+        layout = {}
+        rendered = 0
+        for y_col in trace_columns(graph_type, config):
+            x, y = decimated_xy(window, x_col, y_col, config, TRACE_METHODS[graph_type])
+            trace = {'x': x.to_numpy(), 'y': y.to_numpy()}
+            encode_trace(trace, layout)
+            traces.append(trace)
+            rendered += len(x)
+
+        original = len(window) * len(traces)
+        body = json.dumps({
+            'success': True,
+            'traces': traces,
+            'point_counts': {'original': original, 'rendered': rendered, 'decimated': rendered < original}
+        }, cls=plotly.utils.PlotlyJSONEncoder)
+        return app.response_class(body, mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': f'Error generating graph window: {str(e)}'}), 400
+
+
+# =============================================================================
+# DOWNSAMPLING
+# =============================================================================
+
+def numeric_axis(values):
+    """Float representation of a column for decimation math.
+
+    Datetimes become nanoseconds since epoch and non-numeric columns fall back
+    to the row position so categorical/string x axes can still be decimated.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets selection, returns sorted row indices"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[b]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[b] - ay))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Min and max of each bucket, preserves the envelope of noisy signals"""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    # Two rows per bucket plus the first and last row
+    n_buckets = max((n_out - 2) // 2, 1)
+    bucket_size = -(-n // n_buckets)
+    pad = n_buckets * bucket_size - n
+    offsets = np.arange(n_buckets) * bucket_size
+    lows = np.pad(y, (0, pad), constant_values=np.inf).reshape(n_buckets, bucket_size)
+    highs = np.pad(y, (0, pad), constant_values=-np.inf).reshape(n_buckets, bucket_size)
+    idx = np.concatenate([
+        offsets + lows.argmin(axis=1),
+        offsets + highs.argmax(axis=1),
+        [0, n - 1]
+    ])
+    return np.unique(idx[idx < n])
+
+
+def stratified_indices(n, n_out, seed=0):
+    """One random row from each of n_out equal-sized row buckets"""
+    if n_out >= n:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(0, n, n_out + 1).astype(np.int64)
+    return edges[:-1] + (rng.random(n_out) * np.diff(edges)).astype(np.int64)
+
+
+def uniform_indices(n, n_out, seed=0):
+    """Uniform random sample of rows without replacement, in row order"""
+    if n_out >= n:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n, n_out, replace=False))
+
+
+def decimate_indices(x, y, n_out, method):
+    """Row indices to keep for a trace; rows with missing x or y are dropped"""
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) <= n_out:
+        return valid
+
+    if method == 'lttb':
+        keep = lttb_indices(x[valid], y[valid], n_out)
+    elif method == 'minmax':
+        keep = minmax_indices(y[valid], n_out)
+    elif method == 'stratified':
+        keep = stratified_indices(len(valid), n_out)
+    elif method == 'uniform':
+        keep = uniform_indices(len(valid), n_out)
+    else:
+        raise ValueError(f'Unknown decimation method: {method}')
+    return valid[keep]
+
+
+def decimated_xy(df, x_col, y_col, config, default_method):
+    """Return the (x, y) Series for a trace, reduced to config['max_points']"""
+    x = df[x_col]
+    y = df[y_col]
+    max_points = int(config.get('max_points') or DEFAULT_MAX_POINTS)
+    method = config.get('decimation') or 'auto'
+    if method == 'auto':
+        method = default_method
+
+    if method == 'none' or len(df) <= max_points:
+        return x, y
+
+    idx = decimate_indices(numeric_axis(x), numeric_axis(y), max_points, method)
+    return x.iloc[idx], y.iloc[idx]
+
+
+def render_figure(fig, config):
+    """Pick SVG or WebGL for a built figure, see render_mode.py.
+
+    config['render_mode'] is 'auto', 'webgl' or 'svg'; config['webgl_threshold']
+    overrides the point count where 'auto' switches to WebGL.
+    """
+    return apply_render_mode(fig, config.get('render_mode'), config.get('webgl_threshold'))
+
+
+def point_counts(original, fig):
+    """Original vs. rendered point totals across all traces of a figure"""
+    # Map traces have lat/lon instead of x/y
+    lengths = (trace['lat'] if 'lat' in trace else trace['x'] for trace in fig.data)
+    rendered = sum(len(values) for values in lengths if values is not None)
+    return {
+        'original': original,
+        'rendered': rendered,
+        'decimated': rendered < original
+    }
+
+
+# =============================================================================
+# BINARY FIGURE ENCODING
+# =============================================================================
+
+def datetime_values(values):
+    """Datetime64 view of a tz-naive datetime array, None for anything else"""
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]')
+    if values.dtype == object and isinstance(values[0], (datetime.datetime, np.datetime64)):
+        try:
+            index = pd.DatetimeIndex(values)
+        except (TypeError, ValueError):
+            return None
+        if index.tz is None:
+            return index.to_numpy()
+    return None
+
+
+def encode_array(values):
+    """Base64 typed array for a numeric trace array, None if it should stay JSON.
+
+    Datetimes become float64 milliseconds since epoch, which Plotly reads as
+    the same wall clock time on a date axis.
+    """
+    values = np.asarray(values)
+    if values.ndim != 1 or len(values) < BINARY_MIN_LENGTH:
+        return None
+
+    is_date = False
+    dates = datetime_values(values)
+    if dates is not None:
+        ms = dates.astype(np.int64).astype(np.float64) / 1e6
+        ms[np.isnat(dates)] = np.nan
+        values, is_date = ms, True
+
+    kind = values.dtype.kind
+    if kind == 'b':
+        values = values.astype('u1')
+    elif kind in 'iu':
+        for dtype in ('i1', 'u1', 'i2', 'u2', 'i4', 'u4'):
+            info = np.iinfo(dtype)
+            if values.min() >= info.min and values.max() <= info.max:
+                values = values.astype('<' + dtype)
+                break
+        else:
+            values = values.astype('<f8')
+    elif kind == 'f':
+        with np.errstate(over='ignore'):
+            narrow = values.astype('<f4')
+        if not is_date and np.array_equal(narrow, values, equal_nan=True):
+            values = narrow
+        else:
+            values = values.astype('<f8')
+    else:
+        return None
+
+    encoded = {'dtype': values.dtype.str[1:], 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    return encoded, is_date
+
+
+def encode_trace(trace, layout):
+    """Replace the numeric arrays of a trace dict (and its marker/line) in place"""
+    for container in (trace, trace.get('marker'), trace.get('line')):
+        if not isinstance(container, dict):
+            continue
+        for key, values in container.items():
+            if not isinstance(values, (np.ndarray, list, tuple)):
+                continue
+            if isinstance(values, np.ndarray) and values.dtype == np.float32:
+                # Shrunk columns go out as the decimals they were read from
+                values = container[key] = float32_as_decimal(values)
+            result = encode_array(values)
+            if result is None:
+                continue
+            container[key], is_date = result
+            if is_date and container is trace and key in ('x', 'y'):
+                # Numbers on an untyped axis would be drawn as a linear axis
+                axis_id = trace.get(f'{key}axis') or key
+                axis = layout.setdefault(f'{key}axis{axis_id[1:]}', {})
+                axis.setdefault('type', 'date')
+
+
+def encode_figure(fig):
+    """Figure dict with numeric trace arrays as base64 typed arrays"""
+    figure = fig.to_plotly_json()
+    for trace in figure['data']:
+        encode_trace(trace, figure['layout'])
+    return figure
+
+
+# Default decimation method and y-column config keys for each trace-based graph
+TRACE_METHODS = {'scatter': 'stratified', 'single_line': 'lttb', 'dual_line': 'lttb'}
+
+
+def trace_columns(graph_type, config):
+    """Y columns in the order the chart builders add their traces"""
+    if graph_type == 'dual_line':
+        return config.get('y1_columns', []) + config.get('y2_columns', [])
+    return config.get('y_columns', [])
+
+
+# Sorted x index per (dataset fingerprint, x column), built on first zoom
+SORTED_INDEX_MAX_ENTRIES = 16
+_sorted_indexes = OrderedDict()
+_sorted_indexes_lock = threading.Lock()
+
+
+def sortable_axis(values):
+    """Float keys for binary search on an x column, plus whether they are datetimes"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return numeric_axis(values), True
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return numeric_axis(values), False
+    # Text columns such as 'Date' in sample_data.csv are plotted as dates by Plotly
+    parsed = pd.to_datetime(values, errors='raise')
+    return numeric_axis(parsed), True
+
+
+def sorted_x_index(fingerprint, df, x_col):
+    """Return (sorted_keys, order, is_datetime); order is None if already sorted"""
+    key = fingerprint + (x_col,)
+    with _sorted_indexes_lock:
+        if key in _sorted_indexes:
+            _sorted_indexes.move_to_end(key)
+            return _sorted_indexes[key]
+
+    keys, is_datetime = sortable_axis(df[x_col])
+    order = None
+    if not np.all(keys[1:] >= keys[:-1]):
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+    entry = (keys, order, is_datetime)
+
+    with _sorted_indexes_lock:
+        _sorted_indexes[key] = entry
+        while len(_sorted_indexes) > SORTED_INDEX_MAX_ENTRIES:
+            _sorted_indexes.popitem(last=False)
+    return entry
+
+
+def window_rows(fingerprint, df, x_col, x_range):
+    """Rows of df whose x falls inside x_range, in ascending x order.
+
+    One extra row is kept on each side so lines run off the edge of the plot
+    instead of stopping short. A missing x_range returns the whole dataset.
+    """
+    if not x_range:
+        return df
+
+    keys, order, is_datetime = sorted_x_index(fingerprint, df, x_col)
+    if is_datetime:
+        bounds = [pd.Timestamp(bound).value for bound in x_range]
+    else:
+        bounds = [float(bound) for bound in x_range]
+
+    lo = max(int(np.searchsorted(keys, min(bounds), side='left')) - 1, 0)
+    hi = min(int(np.searchsorted(keys, max(bounds), side='right')) + 1, len(keys))
+    if order is None:
+        return df.iloc[lo:hi]
+    return df.iloc[order[lo:hi]]
+
+
+# =============================================================================
+# OUT-OF-CORE AGGREGATION
+# =============================================================================
+
+def use_out_of_core(filepath, graph_type, config):
+    """Whether a render streams bucket aggregates instead of loading the file"""
+    if graph_type not in COLUMN_BUILDERS and graph_type != 'scatter_on_map':
+        return False
+    return streams_file(filepath, config.get('aggregate') or 'auto')
+
+
+def streams_file(filepath, mode='auto'):
+    """Whether a file is read in chunks rather than loaded (mode auto/on/off)"""
+    if mode == 'off':
+        return False
+    if filepath.rsplit('.', 1)[-1].lower() not in ('csv', 'txt', 'log', 'zip', 'feather'):
+        return False
+    if mode == 'on':
+        return True
+    return os.path.getsize(filepath) > OUT_OF_CORE_FILE_MB * 1024 * 1024
+
+
+def text_read_options(filepath, columns):
+    """read_csv options for a text upload, the same ones read_dataset_file uses"""
+    extension = filepath.rsplit('.', 1)[-1].lower()
+    if extension not in ('txt', 'log'):
+        return {}
+    detected = text_format(filepath)
+    missing = [col for col in columns or [] if col not in detected['columns']]
+    if not detected['tabular'] or missing:
+        raise ValueError(f'Columns {missing or columns} not found in {os.path.basename(filepath)}')
+    options = dict(detected['options'])
+    if columns is not None and 'parse_dates' in options:
+        # read_csv rejects date columns that usecols leaves out
+        options['parse_dates'] = [col for col in options['parse_dates'] if col in columns]
+    return options
+
+
+def iter_file_chunks(filepath, columns):
+    """DataFrames of up to OUT_OF_CORE_CHUNK_ROWS rows of the given columns"""
+    extension = filepath.rsplit('.', 1)[-1].lower()
+    if extension == 'zip':
+        with zipfile.ZipFile(filepath, 'r') as zip_ref:
+            members = zip_csv_members(zip_ref)
+        for member in members:
+            with open_zip_member(filepath, member) as member_file:
+                yield from pd.read_csv(member_file, usecols=columns, chunksize=OUT_OF_CORE_CHUNK_ROWS)
+    elif extension == 'feather' or has_columnar_copy(filepath):
+        with pa.memory_map(columnar_path(filepath)) as source:
+            reader = pyarrow.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, OUT_OF_CORE_CHUNK_ROWS):
+                    yield batch.slice(start, OUT_OF_CORE_CHUNK_ROWS).to_pandas()
     else:
-        return jsonify({'error': 'Invalid file type'}), 400
+        options = text_read_options(filepath, columns)
+        yield from iter_csv(filepath, OUT_OF_CORE_CHUNK_ROWS, csv_engine=CSV_ENGINE, usecols=columns, **options)
 
 
-#TODO refactor this to properly sort out the file types and generate the appropriate graph / post process
-@app.route('/generate_graph', methods=['POST'])
-def generate_graph():
-    try:
-        data = request.json
-        filename = data.get('filename')
-        graph_type = data.get('graph_type')
-        config = data.get('config', {})
-        
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Determine file type and read accordingly
-        file_extension = filename.rsplit('.', 1)[1].lower()
-        
-        if file_extension == 'csv':
-            df = pd.read_csv(filepath)
-        elif file_extension == 'txt':
-            # Try different delimiters for text files
-            try:
-                df = pd.read_csv(filepath, delimiter='\t')  # Tab-separated
-            except:
-                try:
-                    df = pd.read_csv(filepath, delimiter=',')  # Comma-separated
-                except:
-                    df = pd.read_csv(filepath, delimiter='\s+')  # Space-separated
-        elif file_extension == 'log':
-            # Try to read log files as space or tab separated
-            try:
-
-                df = pd.read_csv(filepath, delimiter='\s+', engine='python')
-            except:
-                df = pd.read_csv(filepath, delimiter='\t')
-        elif file_extension == 'json':
-            df = pd.read_json(filepath)
-        elif file_extension == 'zip':
-            # Handle zip files - extract and read the first CSV file
-            import zipfile
-            with zipfile.ZipFile(filepath, 'r') as zip_ref:
-                csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
-                if csv_files:
-                    with zip_ref.open(csv_files[0]) as csv_file:
-                        df = pd.read_csv(csv_file)
-                else:
-                    return jsonify({'error': 'No CSV file found in zip archive'}), 400
-        else:
-            return jsonify({'error': f'Unsupported file type: {file_extension}'}), 400
-        
-        # Create graph based on type
+def aggregation_axis(values, is_datetime):
+    """Float positions of a chunk's x values (ns for dates), NaN where unusable"""
+    if is_datetime:
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                values = pd.to_datetime(values, errors='coerce')
+        return numeric_axis(values)
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def stream_bucket_aggregates(filepath, x_col, value_cols, n_buckets):
+    """Per x-bucket min/max/mean/count of value_cols, streaming the file twice.
+
+    The first pass finds the x extent, the second assigns rows to n_buckets
+    equal-width buckets. Returns the aggregate frame (x is the bucket centre,
+    empty buckets dropped) and the number of rows read.
+    """
+    columns = list(dict.fromkeys([x_col] + value_cols))
+    is_datetime = None
+    lo, hi = np.inf, -np.inf
+    for chunk in iter_file_chunks(filepath, [x_col]):
+        if is_datetime is None:
+            is_datetime = not pd.api.types.is_numeric_dtype(chunk[x_col])
+        x = aggregation_axis(chunk[x_col], is_datetime)
+        if np.isfinite(x).any():
+            lo, hi = min(lo, np.nanmin(x)), max(hi, np.nanmax(x))
+    if not np.isfinite(lo) or not np.isfinite(hi):
+        raise ValueError(f'Column {x_col} has no numeric or date values to aggregate on')
+
+    width = (hi - lo) / n_buckets or 1.0
+    stats = {col: BucketStats(n_buckets) for col in value_cols}
+    rows = 0
+    for chunk in iter_file_chunks(filepath, columns):
+        rows += len(chunk)
+        x = aggregation_axis(chunk[x_col], is_datetime)
+        inside = (x >= lo) & (x <= hi)
+        buckets = np.minimum(((x[inside] - lo) / width).astype(np.int64), n_buckets - 1)
+        for col in value_cols:
+            stats[col].add(buckets, chunk[col].to_numpy()[inside])
+
+    keep = np.zeros(n_buckets, dtype=bool)
+    for col_stats in stats.values():
+        keep |= col_stats.count > 0
+    centres = lo + (np.arange(n_buckets) + 0.5) * width
+    x_values = pd.to_datetime(centres[keep].astype(np.int64)) if is_datetime else centres[keep]
+    data = {x_col: x_values}
+    for col in value_cols:
+        data.update(stats[col].columns(col, keep))
+    return pd.DataFrame(data), rows
+
+
+def aggregated_figure(filepath, graph_type, config):
+    """Column graph of bucket aggregates: mean traces plus the min/max envelope"""
+    x_col = config.get('x_column')
+    y_cols = trace_columns(graph_type, config)
+    n_buckets = int(config.get('max_points') or DEFAULT_MAX_POINTS)
+    agg, rows = stream_bucket_aggregates(filepath, x_col, list(dict.fromkeys(y_cols)), n_buckets)
+
+    # The aggregates are already small, the builder plots the means as is
+    fig = COLUMN_BUILDERS[graph_type](agg, dict(config, decimation='none'))
+    for trace, y_col in zip(list(fig.data), y_cols):
         if graph_type == 'scatter':
-            fig = create_scatter_plot(df, config)
-        elif graph_type == 'single_line':
-            fig = create_single_line_chart(df, config)
-        elif graph_type == 'dual_line':
-            fig = create_dual_line_chart(df, config)
-        elif graph_type == 'scatter_on_map':
-            result = scatter_on_map_legacy(df, config)
-            # For scatter_on_map, we return a success message instead of a graph
-            if result == "Success":
-                return jsonify({'success': True, 'message': 'Scatter map generated successfully! Check the new window that opened.'})
-            else:
-                return jsonify({'error': 'Failed to generate scatter map'}), 400
-        else:
-            return jsonify({'error': 'Invalid graph type'}), 400
-        
-        # Convert to JSON for frontend (for regular graphs)
-        graph_json = fig.to_json()
-        return jsonify({'success': True, 'graph': graph_json})
-        
-    except Exception as e:
-        return jsonify({'error': f'Error generating graph: {str(e)}'}), 400
+            trace.error_y = dict(type='data', symmetric=False, thickness=1, width=0,
+                                 array=agg[f'{y_col}_max'] - agg[y_col],
+                                 arrayminus=agg[y_col] - agg[f'{y_col}_min'])
+            continue
+        band = dict(x=agg[x_col], mode='lines', line=dict(width=0), hoverinfo='skip',
+                    showlegend=False, yaxis=trace.yaxis)
+        fig.add_trace(go.Scatter(y=agg[f'{y_col}_max'], **band))
+        fig.add_trace(go.Scatter(y=agg[f'{y_col}_min'], fill='tonexty',
+                                 fillcolor='rgba(128, 128, 128, 0.25)', name=f'{y_col} min/max', **band))
+    return fig, rows * len(y_cols)
+
+
+def grid_map_points(read_chunks, config):
+    """Map points of grid cell aggregates; hover, color and size columns become the cell
+    mean, or the most frequent value of text columns"""
+    lat_col = config.get('latitude_column')
+    lon_col = config.get('longitude_column')
+    n_cells = int(config.get('max_points') or MAP_MAX_POINTS)
+    value_cols = [col for col in [config.get('color_column'), config.get('size_column')]
+                  + list(config.get('hover_columns') or []) if col and col not in (lat_col, lon_col)]
+    value_cols = list(dict.fromkeys(value_cols))
+    agg, rows = grid_aggregates(read_chunks, lat_col, lon_col, value_cols, n_cells)
+    hover = [col for col in config.get('hover_columns') or [] if col in agg.columns]
+    return agg, dict(config, hover_columns=hover + ['points']), rows
+
+
+def aggregated_map(filepath, config):
+    """Grid cell map points of a file streamed from disk"""
+    return grid_map_points(lambda columns: iter_file_chunks(filepath, columns), config)
+
 
 def create_scatter_plot(df, config):
     x_col = config.get('x_column')
@@ -185,9 +2193,10 @@ def create_scatter_plot(df, config):
         
     for i, y_col in enumerate(y_cols):
         # color = colors[i % len(colors)]
+        x, y = decimated_xy(df, x_col, y_col, config, 'stratified')
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y_col],
+            x=x,
+            y=y,
             mode='markers',
             marker=dict(
                 size=8,
@@ -224,9 +2233,10 @@ def create_single_line_chart(df, config):
     fig = go.Figure()
         
     for i, y_col in enumerate(y_cols):
+        x, y = decimated_xy(df, x_col, y_col, config, 'lttb')
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y_col],
+            x=x,
+            y=y,
             mode='lines+markers',
             line=dict(width=3),
             marker=dict(size=6),
@@ -263,13 +2273,14 @@ def create_dual_line_chart(df, config):
     fig = go.Figure()
 
     #needed to allow for each access to have a unique color. 
-    marker_styles = ["circle", "x", "square", "diamond","triangle-up", "pentagon", "hexagon", "star" "triangle-down", "triangle-left", "triangle-right", "star"]
+    marker_styles = ["circle", "x", "square", "diamond","triangle-up", "pentagon", "hexagon", "star", "triangle-down", "triangle-left", "triangle-right"]
         
     # First y-axis traces (left axis)
     for i, y1_col in enumerate(y1_cols):
+        x, y = decimated_xy(df, x_col, y1_col, config, 'lttb')
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y1_col],
+            x=x,
+            y=y,
             mode='lines+markers',
             line=dict(width=3),
             marker=dict(size=8, symbol=marker_styles[i % len(marker_styles)]),
@@ -280,9 +2291,10 @@ def create_dual_line_chart(df, config):
     
     # Second y-axis traces (right axis)
     for i, y2_col in enumerate(y2_cols):
+        x, y = decimated_xy(df, x_col, y2_col, config, 'lttb')
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y2_col],
+            x=x,
+            y=y,
             mode='lines+markers',
             line=dict(width=3),
             marker=dict(size=8, symbol=marker_styles[i % len(marker_styles)]),
@@ -320,7 +2332,33 @@ def create_dual_line_chart(df, config):
     
     return fig
 
-def scatter_on_map_legacy(df, config):
+# Chart builders of the graph types drawn from dataset columns
+COLUMN_BUILDERS = {
+    'scatter': create_scatter_plot,
+    'single_line': create_single_line_chart,
+    'dual_line': create_dual_line_chart
+}
+
+def map_style(map_type):
+    """mapbox style and raster layers drawing a map type without an access token"""
+    if map_type in MAP_RASTER_LAYERS:
+        layers = [{'sourcetype': 'raster', 'source': [url], 'below': 'traces'}
+                  for url in MAP_RASTER_LAYERS[map_type]]
+        return 'white-bg', layers
+    return MAP_STYLE_ALIASES.get(map_type, map_type), []
+
+
+def map_view(lat, lon):
+    """Centre and zoom level that fit all points"""
+    lat = pd.to_numeric(lat, errors='coerce')
+    lon = pd.to_numeric(lon, errors='coerce')
+    span = max(lat.max() - lat.min(), lon.max() - lon.min(), 1e-4)
+    zoom = float(np.clip(np.log2(360 / span) + 1, 0, 16)) if np.isfinite(span) else 1
+    center = {'lat': float(lat.mean()), 'lon': float(lon.mean())} if lat.notna().any() else {'lat': 0, 'lon': 0}
+    return center, zoom
+
+
+def map_figure(df, config):
     title = config.get('title', 'Scatter Plot on Map')
     map_type = config.get('map_type', 'satellite')
     lat_col = config.get('latitude_column')
@@ -328,13 +2366,16 @@ def scatter_on_map_legacy(df, config):
     hover_cols = config.get('hover_columns', [])
     color_col = config.get('color_column')
     size_col = config.get('size_column')
+    light_mode = config.get('light_mode', True)
+    center, zoom = map_view(df[lat_col], df[lon_col])
     
     # Build parameters dynamically to avoid None/empty values
     scatter_params = {
         'lat': lat_col,
         'lon': lon_col,
         'size_max': 15,
-        'zoom': 10
+        'center': center,
+        'zoom': zoom
     }
     
     # Only add color if a valid column is selected
@@ -351,36 +2392,1124 @@ def scatter_on_map_legacy(df, config):
     if hover_cols and len(hover_cols) > 0:
         scatter_params['hover_data'] = hover_cols
     
-    # Create the plot with only the parameters that have valid values
-    fig = px.scatter_map(df, **scatter_params)
+    # scattermapbox, the bundled plotly.js predates the maplibre scattermap
+    fig = px.scatter_mapbox(df, **scatter_params)
     
+    style, layers = map_style(map_type)
     fig.update_layout(
-        map_style=map_type,
+        mapbox_style=style,
+        mapbox_layers=layers,
         title=title,
+        template='plotly_white' if light_mode else 'plotly_dark',
+        margin=dict(l=0, r=0, t=50, b=0)
     )
-    
-    # Show the figure in a new window
-    fig.show()
-    
-    # Return a simple success message instead of the figure
-    # This will be displayed in the web interface
-    return "Success"
+    return fig
+
+
+def map_tiles_apply(df, config):
+    """Whether /map_tiles can redraw the map as the user pans.
+
+    Viewport traces use one numeric color scale, so maps colored by a text
+    column (one trace and legend entry per category) keep their first render.
+    """
+    color_col = config.get('color_column')
+    return not color_col or (color_col in df.columns and pd.api.types.is_numeric_dtype(df[color_col]))
 
 
 def scatter_on_map(df, config):
-    pass
+    """Map figure of the dataset, grid-thinned above MAP_MAX_POINTS rows"""
+    if len(df) > int(config.get('max_points') or MAP_MAX_POINTS):
+        df, config, _ = grid_map_points(lambda columns: [df[columns]], config)
+    return map_figure(df, config)
+
+
+# =============================================================================
+# MAP VIEWPORT TILES
+# =============================================================================
+
+def quadkey_codes(lat, lon):
+    """Morton (quadkey) code of each point at MAP_INDEX_ZOOM in Web Mercator.
+
+    The first 2*z bits of a code are the quadkey of the tile containing the
+    point at zoom z, so every tile is one contiguous range of sorted codes.
+    """
+    size = 1 << MAP_INDEX_ZOOM
+    lat = np.clip(lat, -MERCATOR_MAX_LAT, MERCATOR_MAX_LAT)
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) / (2 * np.pi)
+    tile_x = np.clip((x * size).astype(np.int64), 0, size - 1).astype(np.uint64)
+    tile_y = np.clip((y * size).astype(np.int64), 0, size - 1).astype(np.uint64)
+    return spread_bits(tile_x) | (spread_bits(tile_y) << np.uint64(1))
+
+
+def spread_bits(values):
+    """Put a zero bit between each of the low 32 bits of values"""
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def lon_ranges(west, east):
+    """[(west, east)] longitude ranges within -180..180 covering a viewport.
+
+    A map panned across the antimeridian reports east > 180 (or west < -180),
+    some clients send west > east instead; both give two ranges, one on each
+    side of it. Viewports a whole turn wide or wider cover every longitude.
+    """
+    if east < west:
+        east += 360
+    if east - west >= 360:
+        return [(-180.0, 180.0)]
+    # Whole turns only, so bounds already in range are used as sent
+    turns = (west + 180) // 360 * 360
+    west, east = west - turns, east - turns
+    if east <= 180:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east - 360)]
+
+
+class MapIndex:
+    """Points of one dataset sorted by quadkey, with the map's value columns"""
+
+    def __init__(self, lat, lon, values):
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        codes = quadkey_codes(lat[valid], lon[valid])
+        order = np.argsort(codes, kind='stable')
+        self.codes = codes[order]
+        self.lat = lat[valid][order]
+        self.lon = lon[valid][order]
+        self.values = {name: column[valid][order] for name, column in values.items()}
+        # Text columns (hover only) have no range and no cluster mean
+        self.numeric = {name for name, column in self.values.items() if column.dtype.kind == 'f'}
+        self.ranges = {name: (np.nanmin(column), np.nanmax(column)) if np.isfinite(column).any() else (0, 0)
+                       for name, column in self.values.items() if name in self.numeric}
+
+    def viewport_slices(self, bounds, zoom):
+        """Index ranges of the tiles covering bounds (west, south, east, north).
+
+        Tiles are taken at ``zoom``, or coarser if that needs more than
+        MAP_MAX_VIEWPORT_TILES; returns the ranges and the zoom used.
+        """
+        west, south, east, north = bounds
+        corners = [quadkey_codes(np.array([north, south]), np.array(lons)) for lons in lon_ranges(west, east)]
+        while True:
+            shift = np.uint64(2 * (MAP_INDEX_ZOOM - zoom))
+            # Tile coordinates back from the interleaved codes of the corners
+            tiles = [(compact_bits(codes >> shift), compact_bits(codes >> shift >> np.uint64(1))) for codes in corners]
+            count = sum(int(xs[1] - xs[0] + 1) * int(ys[1] - ys[0] + 1) for xs, ys in tiles)
+            if count <= MAP_MAX_VIEWPORT_TILES or zoom == 0:
+                break
+            zoom -= 1
+        # Both sides of the antimeridian may share a tile at low zooms
+        slices = set()
+        for xs, ys in tiles:
+            for tile_y in range(int(ys[0]), int(ys[1]) + 1):
+                for tile_x in range(int(xs[0]), int(xs[1]) + 1):
+                    code = spread_bits(np.uint64(tile_x)) | (spread_bits(np.uint64(tile_y)) << np.uint64(1))
+                    start = code << shift
+                    lo, hi = np.searchsorted(self.codes, [start, start + (np.uint64(1) << shift)])
+                    if hi > lo:
+                        slices.add((int(lo), int(hi)))
+        return sorted(slices), zoom
+
+
+def compact_bits(values):
+    """Inverse of spread_bits for the even bits of values"""
+    values = values & np.uint64(0x5555555555555555)
+    for shift, mask in ((1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F), (4, 0x00FF00FF00FF00FF),
+                        (8, 0x0000FFFF0000FFFF), (16, 0x00000000FFFFFFFF)):
+        values = (values | (values >> np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def map_index(filename, lat_col, lon_col, value_cols):
+    """MapIndex of an upload, built on first use and kept in an LRU of MAP_INDEX_CACHE_SIZE"""
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    key = (dataset_fingerprint(filepath), lat_col, lon_col, tuple(value_cols))
+    with map_index_lock:
+        index = map_indexes.get(key)
+        if index is not None:
+            map_indexes.move_to_end(key)
+            return index
+
+    columns = list(dict.fromkeys([lat_col, lon_col] + value_cols))
+    if streams_file(filepath):
+        chunks = iter_file_chunks(filepath, columns)
+    else:
+        chunks = [load_dataset(filename, columns)]
+    parts = {col: [] for col in columns}
+    for chunk in chunks:
+        for col in columns:
+            parts[col].append(chunk[col])
+    arrays = {col: map_index_values(pd.concat(parts[col], ignore_index=True)) for col in columns}
+    index = MapIndex(arrays[lat_col], arrays[lon_col], {col: arrays[col] for col in value_cols})
+
+    with map_index_lock:
+        map_indexes[key] = index
+        while len(map_indexes) > MAP_INDEX_CACHE_SIZE:
+            map_indexes.popitem(last=False)
+    return index
+
+
+def map_index_values(col):
+    """float64 values of a map column, or its values as text if it is not numeric"""
+    if not pd.api.types.is_numeric_dtype(col):
+        numbers = pd.to_numeric(col, errors='coerce')
+        if numbers.notna().sum() < col.notna().sum():
+            return col.astype(str).where(col.notna(), '').to_numpy(dtype=object)
+        col = numbers
+    return col.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def viewport_points(index, slices, bounds):
+    """Every point inside bounds, from the tiles overlapping them"""
+    rows = np.concatenate([np.arange(lo, hi) for lo, hi in slices]) if slices else np.empty(0, dtype=np.int64)
+    west, south, east, north = bounds
+    lon = index.lon[rows]
+    inside = np.zeros(len(rows), dtype=bool)
+    for low, high in lon_ranges(west, east):
+        inside |= (lon >= low) & (lon <= high)
+    inside &= (index.lat[rows] >= south) & (index.lat[rows] <= north)
+    rows = rows[inside]
+    return (index.lat[rows], index.lon[rows], np.ones(len(rows), dtype=np.int64),
+            {name: values[rows] for name, values in index.values.items()})
+
+
+def viewport_clusters(index, slices, cluster_zoom):
+    """Mean position/values and point count of each cluster cell in the tiles"""
+    shift = np.uint64(2 * (MAP_INDEX_ZOOM - cluster_zoom))
+    lat, lon, counts, values = [], [], [], {name: [] for name in index.numeric}
+    for lo, hi in slices:
+        cells = index.codes[lo:hi] >> shift
+        # Codes are sorted, so each cell is a run of equal values
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        count = np.diff(np.r_[starts, len(cells)])
+        counts.append(count)
+        lat.append(np.add.reduceat(index.lat[lo:hi], starts) / count)
+        lon.append(np.add.reduceat(index.lon[lo:hi], starts) / count)
+        for name in index.numeric:
+            column = index.values[name][lo:hi]
+            finite = np.isfinite(column)
+            sums = np.add.reduceat(np.where(finite, column, 0.0), starts)
+            n = np.add.reduceat(finite.astype(np.int64), starts)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values[name].append(sums / n)
+    join = lambda parts: np.concatenate(parts) if parts else np.empty(0)
+    return join(lat), join(lon), join(counts).astype(np.int64), {name: join(parts) for name, parts in values.items()}
+
+
+def viewport_trace(index, config, bounds, zoom, mode):
+    """scattermapbox (or densitymapbox) trace of the points or clusters in view"""
+    tile_zoom = int(np.clip(np.floor(zoom), 0, MAP_INDEX_ZOOM))
+    slices, tile_zoom = index.viewport_slices(bounds, tile_zoom)
+    in_tiles = sum(hi - lo for lo, hi in slices)
+    clustered = in_tiles > int(config.get('max_points') or MAP_MAX_POINTS)
+    if clustered:
+        cluster_zoom = min(tile_zoom + MAP_CLUSTER_LEVELS, MAP_INDEX_ZOOM)
+        lat, lon, counts, values = viewport_clusters(index, slices, cluster_zoom)
+    else:
+        lat, lon, counts, values = viewport_points(index, slices, bounds)
+
+    if mode == 'density':
+        trace = {'type': 'densitymapbox', 'lat': lat, 'lon': lon, 'z': counts,
+                 'radius': MAP_DENSITY_RADIUS, 'showscale': False,
+                 'hovertemplate': 'Points: %{z}<extra></extra>'}
+        return trace, clustered, int(counts.sum())
+
+    color_col = config.get('color_column')
+    size_col = config.get('size_column')
+    marker = {'opacity': 0.8}
+    if clustered:
+        # Bigger dots for cells holding more points
+        marker['size'] = np.clip(4 + 3 * np.log2(counts), 4, 28)
+    elif size_col in index.ranges and size_col in values:
+        low, high = index.ranges[size_col]
+        marker['size'] = 4 + 11 * (np.nan_to_num(values[size_col], nan=low) - low) / ((high - low) or 1)
+    else:
+        marker['size'] = 8
+    if color_col in index.ranges and color_col in values:
+        marker['color'] = values[color_col]
+        marker['coloraxis'] = 'coloraxis'
+
+    # Same hover fields as the first render; clusters only carry numeric means
+    hover_cols = [col for col in dict.fromkeys([color_col, size_col] + list(config.get('hover_columns') or []))
+                  if col in values]
+    hover = ['Lat: %{lat}', 'Lon: %{lon}'] + [f'{col}: %{{customdata[{i + 1}]}}' for i, col in enumerate(hover_cols)]
+    if clustered:
+        hover.append('Points: %{customdata[0]}')
+    trace = {'type': 'scattermapbox', 'mode': 'markers', 'lat': lat, 'lon': lon, 'marker': marker,
+             'customdata': np.column_stack([counts] + [values[col] for col in hover_cols]),
+             'hovertemplate': '<br>'.join(hover) + '<extra></extra>', 'showlegend': False}
+    return trace, clustered, int(counts.sum())
+
+@contextmanager
+def open_zip_member(zip_path, member):
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zip_ref.open(member) as member_file:
+            yield member_file
+
+
+class SortedCsvStream:
+    """Chunked reader over one CSV that is sorted by a key column.
+
+    Keeps a small buffer of rows around the key range currently being joined
+    so merge_asof can look backward/forward across chunk boundaries without
+    the whole file in memory. A file that is not sorted by the key is loaded
+    and sorted in memory instead.
+    """
+
+    def __init__(self, open_file, name, key):
+        self.open_file = open_file
+        self.name = name
+        self.key = key
+        self.buffer = None
+        self.exhausted = False
+        self.chunks = self._sorted_chunks()
+
+    def _is_sorted(self):
+        # Key column only, so this pass is cheap compared to the join itself
+        last = None
+        with self.open_file() as f:
+            for chunk in pd.read_csv(f, usecols=[self.key], chunksize=JOIN_CHUNK_ROWS):
+                keys = normalize_join_key(chunk, self.key)[self.key]
+                if len(keys) == 0:
+                    continue
+                if not keys.is_monotonic_increasing or (last is not None and keys.iloc[0] < last):
+                    return False
+                last = keys.iloc[-1]
+        return True
+
+    def _sorted_chunks(self):
+        if self._is_sorted():
+            with self.open_file() as f:
+                for chunk in pd.read_csv(f, chunksize=JOIN_CHUNK_ROWS):
+                    yield normalize_join_key(chunk, self.key)
+            return
+
+        app.logger.info("CSV joiner: %s is not sorted by %s, sorting in memory", self.name, self.key)
+        with self.open_file() as f:
+            df = normalize_join_key(pd.read_csv(f), self.key).sort_values(self.key, kind='stable')
+        for start in range(0, len(df), JOIN_CHUNK_ROWS):
+            yield df.iloc[start:start + JOIN_CHUNK_ROWS]
+
+    def next_chunk(self):
+        """Next non-empty chunk, or None once the file is exhausted"""
+        for chunk in self.chunks:
+            if len(chunk):
+                return chunk
+        self.exhausted = True
+        return None
+
+    def window(self, low, high):
+        """Rows whose key lies in [low, high] plus one neighbour on each side"""
+        while not self.exhausted and (self.buffer is None or self.buffer[self.key].iloc[-1] <= high):
+            chunk = self.next_chunk()
+            if chunk is not None:
+                self.buffer = chunk if self.buffer is None else pd.concat([self.buffer, chunk], ignore_index=True)
+        if self.buffer is None:
+            return None
+        keys = self.buffer[self.key]
+        start = max(int(keys.searchsorted(low, side='left')) - 1, 0)
+        stop = int(keys.searchsorted(high, side='right')) + 1
+        # Rows before the window are never needed again, left keys only grow
+        self.buffer = self.buffer.iloc[start:].reset_index(drop=True)
+        return self.buffer.iloc[:stop - start]
+
+
+def normalize_join_key(df, key):
+    """Make key columns comparable across files: text keys (e.g. 'Date')
+    become datetimes, numeric keys float64, and rows without a key are dropped"""
+    if df[key].dtype == object:
+        df[key] = pd.to_datetime(df[key])
+    elif pd.api.types.is_numeric_dtype(df[key]):
+        df[key] = df[key].astype(np.float64)
+    return df[df[key].notna()]
+
+
+def join_tolerance(value, key_is_datetime):
+    """config['tolerance'] as a Timedelta for datetime keys ('5s', or seconds)"""
+    if value in (None, ''):
+        return None
+    if key_is_datetime:
+        try:
+            # Bare numbers, including numeric strings from the text field, are seconds
+            return pd.Timedelta(seconds=float(value))
+        except (TypeError, ValueError):
+            return pd.Timedelta(value)
+    return float(value)
+
+
+def arrow_join_batch(df, schema):
+    """Convert a joined chunk to Arrow, keeping the schema of the first chunk.
+
+    Numeric columns are widened to float64 since a later chunk may have
+    unmatched (NaN) rows where the first had none.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_bool_dtype(df[col]) or not (
+                pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col])):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(np.float64)
+    if schema is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Object columns that were all-null in the first chunk are strings later
+        schema = pa.schema([
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+            for field in table.schema
+        ]).remove_metadata()
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False), schema
 
-def csv_joiner(filepath, config):
-    pass
+
+def csv_joiner(filepath, config, progress=None):
+    """Join the CSVs of a zip on a sorted key with merge_asof semantics.
+
+    config:
+    - join_column: key column present in every CSV (e.g. 'Date')
+    - direction: 'backward' (default), 'forward' or 'nearest'
+    - tolerance: max key distance for a match ('5s', '1min', or a number;
+      numbers are seconds for datetime keys)
+
+    The first CSV drives the output rows, every other CSV contributes its
+    columns from the matching row. Output is streamed to an Arrow IPC file
+    chunk by chunk; returns its filename in the upload folder.
+    """
+    if feather is None:
+        raise RuntimeError('CSV joiner requires pyarrow')
+
+    key = config.get('join_column')
+    direction = config.get('direction') or 'backward'
+    if not key:
+        raise ValueError('Please select a join column')
+
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        members = zip_csv_members(zip_ref)
+    if len(members) < 2:
+        raise ValueError('CSV joiner needs a zip with at least two CSV files')
+
+    streams = [SortedCsvStream(partial(open_zip_member, filepath, member), member, key)
+               for member in members]
+    left, rights = streams[0], streams[1:]
+
+    base = os.path.splitext(os.path.basename(filepath))[0]
+    out_name = f'{base}_joined.feather'
+    out_path = os.path.join(app.config['UPLOAD_FOLDER'], out_name)
+    tmp_path = out_path + '.tmp'
+
+    tolerance = None
+    pad = None
+    renames = [None] * len(rights)
+    schema = None
+    writer = None
+    chunks = 0
+    try:
+        while True:
+            chunk = left.next_chunk()
+            if chunk is None:
+                break
+            if pad is None:
+                key_is_datetime = pd.api.types.is_datetime64_any_dtype(chunk[key])
+                tolerance = join_tolerance(config.get('tolerance'), key_is_datetime)
+                if tolerance is not None:
+                    pad = tolerance
+                else:
+                    pad = pd.Timedelta(0) if key_is_datetime else 0.0
+            low, high = chunk[key].iloc[0] - pad, chunk[key].iloc[-1] + pad
+
+            joined = chunk
+            for i, right in enumerate(rights):
+                window = right.window(low, high)
+                if window is None:
+                    continue
+                if renames[i] is None:
+                    # Suffix clashing column names with the member they came from
+                    stem = os.path.splitext(os.path.basename(right.name))[0]
+                    renames[i] = {col: f'{col}_{stem}' for col in window.columns
+                                  if col != key and col in joined.columns}
+                joined = pd.merge_asof(joined, window.rename(columns=renames[i]), on=key,
+                                       direction=direction, tolerance=tolerance)
+
+            table, schema = arrow_join_batch(joined, schema)
+            if writer is None:
+                writer = pa.ipc.new_file(tmp_path, schema)
+            writer.write_table(table)
+            chunks += 1
+            if progress:
+                # Total rows are unknown up front, so just show steady movement
+                progress('join', min(95, 5 + 5 * chunks))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError(f'{members[0]} has no rows')
+    os.replace(tmp_path, out_path)
+    forget_upload_info(out_name)
+    return out_name
     
-def ping_plotter(filepath, config):
-    pass
+# One match per probe line, replies and timeouts alike, so their order is
+# kept. Covers Linux/macOS ping (optionally with -D timestamps and -O) and
+# Windows ping, over IPv4 and IPv6. Patterns are anchored and literal-heavy to
+# keep findall fast. Source addresses may contain colons (IPv6), so they are
+# matched lazily up to the first field that follows them.
+PING_LINE_PATTERN = re.compile(
+    rb'^(?:\[(\d+(?:\.\d+)?)\] )?(?:'
+    rb'\d+ bytes from .*?[:,] icmp_seq=(\d+) (?:ttl|hlim)=(\d+) time=(\d+(?:\.\d+)?) ms'
+    rb'|Reply from .*?: (?:bytes=\d+ )?time[=<](\d+)ms(?: TTL=(\d+))?'
+    rb'|(Request timeout for icmp_seq |no answer yet for icmp_seq=|Request timed out|From [^\n]*?icmp_seq=)(\d*)'
+    rb')',
+    re.MULTILINE
+)
+
+
+def add_decimated_trace(fig, df, x_col, y_col, config, method, trace_args, **placement):
+    """Add a decimated line trace for a log plotter, returns the source point count.
+
+    Log plotters store the total in layout.meta['source_points'] so the
+    response can report original vs. rendered points like column graphs.
+    """
+    x, y = decimated_xy(df, x_col, y_col, config, method)
+    fig.add_trace(go.Scatter(x=x, y=y, **trace_args), **placement)
+    return len(df)
+
+
+def ascii_numbers(values):
+    """Bytes array of regex captures to float64, empty captures become NaN"""
+    # astype copies and leaves room for b'nan' even in 1-byte wide columns
+    values = values.astype(f'S{max(values.itemsize, 3)}')
+    values[values == b''] = b'nan'
+    return values.astype(np.float64)
+
+
+def parse_ping_log(filepath):
+    """Parse ping output into one row per probe: timestamp, seq, ttl, rtt_ms, lost.
+
+    The whole file is memory-mapped and scanned with a single compiled regex
+    (findall runs the loop in C), then converted to columns in bulk.
+    """
+    if os.path.getsize(filepath) == 0:
+        raise ValueError('Ping log is empty')
+    samples = read_ping_samples(filepath)
+    if samples.empty:
+        raise ValueError('No ping replies or timeouts found in file')
+    return samples
+
+
+def read_ping_samples(filepath, limit=None):
+    """Probe rows of the first ``limit`` bytes of a ping log, all of it by default"""
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or limit == 0:
+            return ping_samples(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return ping_samples(buffer, size if limit is None else min(size, limit))
+
+
+def ping_samples(buffer, end=None):
+    """Probe rows of a bytes-like buffer of ping output (up to ``end``), empty if it has none"""
+    matches = PING_LINE_PATTERN.findall(buffer, 0, len(buffer) if end is None else end)
+    if not matches:
+        return pd.DataFrame({'seq': [], 'ttl': [], 'rtt_ms': [], 'lost': pd.Series(dtype=bool)})
+
+    # One 2-D bytes array is much cheaper than transposing millions of tuples
+    captures = np.array(matches, dtype='S32')
+    ts, seq, ttl, rtt, win_rtt, win_ttl, lost, lost_seq = captures.T
+    samples = pd.DataFrame({
+        'seq': ascii_numbers(np.where(seq != b'', seq, lost_seq)),
+        'ttl': ascii_numbers(np.where(ttl != b'', ttl, win_ttl)),
+        'rtt_ms': ascii_numbers(np.where(rtt != b'', rtt, win_rtt)),
+        'lost': lost != b''
+    })
+    if (ts != b'').any():
+        # ping -D prints microseconds, which float seconds only get close to
+        samples.insert(0, 'timestamp', pd.to_datetime(ascii_numbers(ts), unit='s').round('us'))
+    return samples
+
+
+def ping_stats(samples, window):
+    """Per-probe x, RTT, rolling jitter and loss of ping samples, and the x axis title.
+
+    Probe numbers are the row index, so rows sliced from a longer log keep
+    their position.
+    """
+    if 'timestamp' in samples:
+        x, x_title = samples['timestamp'], 'Time'
+    elif samples['seq'].notna().all():
+        x, x_title = samples['seq'], 'ICMP Sequence'
+    else:
+        x, x_title = pd.Series(samples.index, index=samples.index), 'Probe'
+
+    rtt = samples['rtt_ms']
+    stats = pd.DataFrame({
+        'x': x,
+        'rtt_ms': rtt,
+        # Mean absolute difference between consecutive replies (RFC 3550 style)
+        'jitter_ms': rtt.dropna().diff().abs().rolling(window, min_periods=1).mean().reindex(rtt.index),
+        'loss_pct': samples['lost'].rolling(window, min_periods=1).mean() * 100
+    })
+    return stats, x_title
+
+
+def ping_plotter(filepath, config, samples=None):
+    """RTT over time with rolling loss rate and jitter from a ping log.
+
+    Probes are plotted against their ping -D timestamp when present, else
+    against icmp_seq (or probe number for Windows output, which has none).
+    Live renders pass the probes their tail has parsed as ``samples``.
+    """
+    if samples is None:
+        samples = cached_parse(filepath, 'ping', parse_ping_log)
+    window = int(config.get('stats_window') or PING_STATS_WINDOW)
+    title = config.get('title') or 'Ping Results'
+    light_mode = config.get('light_mode', True)
+    stats, default_x_title = ping_stats(samples, window)
+
+    fig = go.Figure()
+    source_points = 0
+    for col, name, axis, method in (('rtt_ms', 'RTT (ms)', 'y', 'minmax'),
+                                    ('jitter_ms', f'Jitter, {window} probe avg (ms)', 'y', 'lttb'),
+                                    ('loss_pct', f'Loss, {window} probe window (%)', 'y2', 'lttb')):
+        source_points += add_decimated_trace(fig, stats, 'x', col, config, method,
+                                             dict(mode='lines', name=name, yaxis=axis))
+
+    lost = stats[samples['lost']]
+    max_points = int(config.get('max_points') or DEFAULT_MAX_POINTS)
+    shown = lost.iloc[stratified_indices(len(lost), max_points)]
+    fig.add_trace(go.Scatter(
+        x=shown['x'],
+        y=np.zeros(len(shown)),
+        mode='markers',
+        marker=dict(symbol='x', color='red', size=8),
+        name=f'Timeouts ({len(lost)})'
+    ))
+    source_points += len(lost)
+
+    template = 'plotly_white' if light_mode else 'plotly_dark'
+    fig.update_layout(
+        title=title,
+        xaxis_title=config.get('x_title') or default_x_title,
+        template=template,
+        yaxis=dict(title=config.get('y_title') or 'Milliseconds', side='left'),
+        yaxis2=dict(title='Loss (%)', side='right', overlaying='y', range=[0, 100]),
+        meta={'source_points': source_points}
+    )
+    return fig
+
+
+# Whitespace and commas between the items of a JSON array
+JSON_ITEM_SEPARATOR = re.compile(r'[\s,]*')
+
+
+def iter_json_array(f, key):
+    """Yield the items of the array stored under ``key`` in a JSON document.
+
+    Reads the file in IPERF_READ_SIZE pieces and decodes one item at a time
+    with raw_decode at a position in the buffer; the decoded head is only
+    dropped when the buffer is refilled, so items are never copied. The first
+    occurrence of the key is used, which for iperf3 output is the top-level
+    'intervals' array.
+    """
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    buffer = ''
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        block = f.read(IPERF_READ_SIZE)
+        if not block:
+            eof = True
+        buffer += block
+
+    # Find the key, keeping a tail in case it straddles two reads
+    while True:
+        pos = buffer.find(marker)
+        if pos >= 0:
+            buffer = buffer[pos + len(marker):]
+            break
+        if eof:
+            return
+        buffer = buffer[-len(marker):]
+        read_more()
+
+    # Step over ':' and '['
+    for expected in ':[':
+        while True:
+            stripped = buffer.lstrip()
+            if stripped or eof:
+                break
+            read_more()
+        if not stripped.startswith(expected):
+            raise ValueError(f'Expected "{expected}" after "{key}"')
+        buffer = stripped[1:]
+
+    pos = 0
+    while True:
+        pos = JSON_ITEM_SEPARATOR.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError(f'"{key}" array is cut off before its closing "]"')
+            buffer, pos = '', 0
+            read_more()
+            continue
+        if buffer.startswith(']', pos):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Item continues past the end of the buffer
+            buffer, pos = buffer[pos:], 0
+            read_more()
+            continue
+        if not eof and (end == len(buffer) or buffer[end] in '.eE'):
+            # A number whose digits, fraction or exponent go on in the next read
+            buffer, pos = buffer[pos:], 0
+            read_more()
+            continue
+        pos = end
+        yield item
+
+
+IPERF_STREAM_FIELDS = ('bits_per_second', 'bytes', 'retransmits', 'snd_cwnd', 'rtt',
+                       'jitter_ms', 'lost_packets', 'packets', 'lost_percent')
+
+
+def parse_iperf_json(filepath):
+    """Flatten iperf3 --json intervals into one row per stream per interval.
+
+    The interval 'sum' entries are kept as stream 'sum'. Missing fields (e.g.
+    jitter for TCP, cwnd for UDP) are NaN. Columns: start, end, stream,
+    throughput_mbps, plus the raw per-stream counters. A truncated file
+    gives the intervals before the cut.
+    """
+    columns = {name: [] for name in ('start', 'end', 'stream') + IPERF_STREAM_FIELDS}
+
+    def add_row(entry, stream):
+        columns['start'].append(entry.get('start'))
+        columns['end'].append(entry.get('end'))
+        columns['stream'].append(stream)
+        for name in IPERF_STREAM_FIELDS:
+            columns[name].append(entry.get(name))
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        try:
+            for interval in iter_json_array(f, 'intervals'):
+                for entry in interval.get('streams', []):
+                    add_row(entry, str(entry.get('socket', '?')))
+                if 'sum' in interval:
+                    add_row(interval['sum'], 'sum')
+        except ValueError as e:
+            if not columns['start']:
+                raise
+            # A cut-off copy (e.g. of a run that was killed), plot what is complete
+            app.logger.warning("iperf3 output %s is truncated, using its first %d rows: %s",
+                               os.path.basename(filepath), len(columns['start']), e)
+
+    if not columns['start']:
+        raise ValueError('No intervals found in iperf3 output')
+
+    df = pd.DataFrame({name: pd.to_numeric(pd.Series(values), errors='coerce')
+                       for name, values in columns.items() if name != 'stream'})
+    df.insert(2, 'stream', pd.Categorical(columns['stream']))
+    df['throughput_mbps'] = df['bits_per_second'] / 1e6
+    if df['snd_cwnd'].notna().any():
+        df['snd_cwnd_kb'] = df['snd_cwnd'] / 1024
+    if df['rtt'].notna().any():
+        # iperf3 reports rtt in microseconds
+        df['rtt_ms'] = df['rtt'] / 1000
+    return df
+
+
+def iperf_plot(filepath, config, default_title, lower_traces, lower_titles):
+    """Throughput per stream and aggregate on top, protocol counters below"""
+    intervals = cached_parse(filepath, 'iperf', parse_iperf_json)
+    title = config.get('title') or default_title
+    light_mode = config.get('light_mode', True)
+    stream_names = [name for name in intervals['stream'].cat.categories if name != 'sum']
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+                        row_heights=[0.6, 0.4], specs=[[{}], [{'secondary_y': True}]])
+    source_points = 0
+
+    for name in stream_names + ['sum']:
+        rows = intervals[intervals['stream'] == name]
+        if rows.empty:
+            continue
+        is_sum = name == 'sum'
+        source_points += add_decimated_trace(
+            fig, rows, 'end', 'throughput_mbps', config, 'minmax',
+            dict(mode='lines', name='Total throughput' if is_sum else f'Stream {name} throughput',
+                 line=dict(width=3 if is_sum else 1.5)),
+            row=1, col=1)
+
+    # Counters come from the aggregate when iperf provides it there
+    for col, label, secondary, per_stream in lower_traces:
+        if col not in intervals or intervals[col].isna().all():
+            continue
+        names = stream_names if per_stream else ['sum']
+        for name in names:
+            rows = intervals[(intervals['stream'] == name) & intervals[col].notna()]
+            if rows.empty:
+                continue
+            trace_name = label if len(names) == 1 else f'Stream {name} {label}'
+            source_points += add_decimated_trace(
+                fig, rows, 'end', col, config, 'minmax',
+                dict(mode='lines', name=trace_name),
+                row=2, col=1, secondary_y=secondary)
+
+    template = 'plotly_white' if light_mode else 'plotly_dark'
+    fig.update_layout(title=title, template=template, meta={'source_points': source_points})
+    fig.update_xaxes(title_text=config.get('x_title') or 'Seconds', row=2, col=1)
+    fig.update_yaxes(title_text=config.get('y_title') or 'Mbit/s', row=1, col=1)
+    fig.update_yaxes(title_text=lower_titles[0], row=2, col=1, secondary_y=False)
+    fig.update_yaxes(title_text=lower_titles[1], row=2, col=1, secondary_y=True)
+    return fig
 
-def iperf_udp_plotter(filepath, config):
-    pass
 
 def iperf_tcp_plotter(filepath, config):
-    pass
+    """Throughput, retransmits, congestion window and RTT from iperf3 TCP JSON"""
+    return iperf_plot(filepath, config, 'iperf3 TCP Results', [
+        ('retransmits', 'retransmits', False, False),
+        ('snd_cwnd_kb', 'cwnd (KB)', True, True),
+        ('rtt_ms', 'RTT (ms)', True, True)
+    ], ('Retransmits', 'cwnd (KB) / RTT (ms)'))
+
+
+def iperf_udp_plotter(filepath, config):
+    """Throughput, jitter and packet loss from iperf3 UDP JSON"""
+    return iperf_plot(filepath, config, 'iperf3 UDP Results', [
+        ('jitter_ms', 'jitter (ms)', False, True),
+        ('lost_packets', 'lost packets', True, False),
+        ('lost_percent', 'loss (%)', True, False)
+    ], ('Jitter (ms)', 'Lost packets / Loss (%)'))
+
+
+# Graph types that parse a whole log format themselves: (cache tag, parser, plotter)
+LOG_PLOTTERS = {
+    'ping': ('ping', parse_ping_log, ping_plotter),
+    'iperf_tcp': ('iperf', parse_iperf_json, iperf_tcp_plotter),
+    'iperf_udp': ('iperf', parse_iperf_json, iperf_udp_plotter)
+}
+
+
+# =============================================================================
+# LIVE LOG TAIL
+# =============================================================================
+
+def complete_lines_size(f, end):
+    """Offset just past the last newline in the first ``end`` bytes of open file ``f``, 0 if none"""
+    pos = end
+    while pos > 0:
+        start = max(0, pos - 64 * 1024)
+        f.seek(start)
+        newline = f.read(pos - start).rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        pos = start
+    return 0
+
+
+class LogTail:
+    """Rows parsed so far from a file that is still being appended to.
+
+    ``make_parsers()`` gives (parse_file, parse_lines): ``parse_file(limit)``
+    parses the first ``limit`` bytes of the file with the dataset's own
+    reader, ``parse_lines(data)`` turns lines appended later into a
+    DataFrame. Both only ever get complete lines. They are made when the
+    first lines are parsed, again after a reset, as a file truncated and
+    written again may have another layout. Rows are kept
+    as a list of chunks, so an update costs as much as the new lines and the
+    full frame is only concatenated when a render asks for it.
+    """
+
+    def __init__(self, filepath, key, make_parsers):
+        self.filepath = filepath
+        # dataset_cache key, the tail's rows count against its budget
+        self.key = key
+        self.make_parsers = make_parsers
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.chunks = []
+        self.empty = pd.DataFrame()
+        self.rows = 0
+        self.nbytes = 0
+        # Byte offset and row count after each parsed piece, for rows_before
+        self.offsets = [0]
+        self.totals = [0]
+        self.generation = getattr(self, 'generation', -1) + 1
+
+    def advance(self, limit=None):
+        """Parse the complete lines appended since the last call (up to ``limit`` bytes).
+
+        Returns True if rows were added or the tail started over.
+        """
+        with self.lock:
+            size = os.path.getsize(self.filepath)
+            started_over = size < self.offset
+            if started_over:
+                # Truncated or replaced, start over
+                self.reset()
+            end = size if limit is None else min(size, limit)
+            if end <= self.offset:
+                return started_over
+            # A line still being written is left for the next call
+            with open(self.filepath, 'rb') as f:
+                if self.offset == 0:
+                    complete = complete_lines_size(f, end)
+                    if complete:
+                        self.parse_file, self.parse_lines = self.make_parsers()
+                    rows = self.parse_file(complete) if complete else None
+                else:
+                    f.seek(self.offset)
+                    data = f.read(end - self.offset)
+                    complete = data.rfind(b'\n') + 1
+                    rows = self.parse_lines(data[:complete]) if complete else None
+                    complete += self.offset
+            if rows is None:
+                return started_over
+            if self.offset == 0:
+                self.empty = rows.iloc[:0]
+            self.offset = complete
+            if len(rows):
+                self.chunks.append(rows.set_axis(pd.RangeIndex(self.rows, self.rows + len(rows))))
+                self.rows += len(rows)
+                self.nbytes += dataframe_footprint(rows)['heap_bytes']
+            self.offsets.append(self.offset)
+            self.totals.append(self.rows)
+            return started_over or len(rows) > 0
+
+    def rows_before(self, offset):
+        """Number of rows parsed from the first ``offset`` bytes of the file"""
+        with self.lock:
+            if offset >= self.offset:
+                return self.rows
+            i = bisect.bisect_right(self.offsets, offset) - 1
+            if self.offsets[i] == offset:
+                return self.totals[i]
+            with open(self.filepath, 'rb') as f:
+                if self.offsets[i] == 0:
+                    complete = complete_lines_size(f, offset)
+                    return len(self.parse_file(complete)) if complete else 0
+                f.seek(self.offsets[i])
+                data = f.read(offset - self.offsets[i])
+            complete = data.rfind(b'\n') + 1
+            if complete == 0:
+                return self.totals[i]
+            return self.totals[i] + len(self.parse_lines(data[:complete]))
+
+    def frame(self):
+        """All rows as one DataFrame and the byte offset they end at.
+
+        The chunks are merged for later calls.
+        """
+        with self.lock:
+            if len(self.chunks) > 1:
+                self.chunks = [pd.concat(self.chunks)]
+                self.nbytes = dataframe_footprint(self.chunks[0])['heap_bytes']
+            return (self.chunks[0] if self.chunks else self.empty), self.offset
+
+    def rows_since(self, start):
+        """Rows from ``start`` on, touching only the chunks that hold them"""
+        with self.lock:
+            picked = []
+            for chunk in reversed(self.chunks):
+                if chunk.index[-1] < start:
+                    break
+                picked.append(chunk)
+        if not picked:
+            return pd.DataFrame()
+        rows = pd.concat(picked[::-1]) if len(picked) > 1 else picked[0]
+        return rows.loc[start:]
+
+
+def table_tail_parsers(filepath):
+    """(parse_file, parse_lines) of a LogTail over a CSV or delimited text file"""
+    options = {}
+    if filepath.rsplit('.', 1)[-1].lower() in ('txt', 'log'):
+        detected = text_format(filepath)
+        if not detected['tabular']:
+            raise ValueError(f'{os.path.basename(filepath)} is not a delimited table')
+        options = dict(detected['options'])
+    # Appended lines have no header or preamble
+    line_options = {key: value for key, value in options.items() if key not in ('header', 'names', 'skiprows')}
+    columns = []
+
+    def parse_file(limit):
+        rows = read_csv(filepath, csv_engine=CSV_ENGINE, limit=limit, **options)
+        columns[:] = rows.columns.tolist()
+        return rows
+
+    def parse_lines(data):
+        try:
+            return pd.read_csv(io.BytesIO(data), header=None, names=columns, **line_options)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame(columns=columns)
+
+    return parse_file, parse_lines
+
+
+def log_tail(filename, kind, since=None):
+    """Shared LogTail of an upload, 'ping' for ping output and 'table' for delimited files.
+
+    Tails live in the dataset cache and are put back after every advance so
+    their size stays current; a stream keeps its tail even once evicted.
+    """
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    key = (filename, LIVE_TAIL_TAG, kind)
+    with log_tails_lock:
+        tail = dataset_cache.get(key)
+        if tail is None:
+            if kind == 'ping':
+                make_parsers = lambda: (partial(read_ping_samples, filepath), ping_samples)
+            else:
+                make_parsers = partial(table_tail_parsers, filepath)
+            tail = LogTail(filepath, key, make_parsers)
+            dataset_cache.put(key, tail, 0)
+    if since is not None and tail.offset == 0:
+        # Stop once at the render's offset so rows_before(since) needs no re-parse
+        tail.advance(since)
+    tail.advance()
+    dataset_cache.put(key, tail, tail.nbytes)
+    return tail
+
+
+def tail_values(values):
+    """JSON list of trace values: datetimes as epoch ms like encode_array, NaN as null"""
+    values = float32_as_decimal(values)
+    dates = datetime_values(values) if len(values) else None
+    if dates is not None:
+        values = dates.astype(np.int64) / 1e6
+        values[np.isnat(dates)] = np.nan
+    if values.dtype.kind in 'biuf':
+        values = values.astype(np.float64)
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    return [str(v) for v in values]
+
+
+def tail_traces(graph_type, config, tail, start):
+    """(x, y) per figure trace for the rows from ``start`` on, in trace order"""
+    if graph_type == 'ping':
+        window = int(config.get('stats_window') or PING_STATS_WINDOW)
+        # Rolling jitter and loss need the window before the new rows
+        rows = tail.rows_since(max(0, start - 2 * window))
+        if rows.empty:
+            return []
+        stats, _ = ping_stats(rows, window)
+        stats = stats.loc[start:]
+        lost = stats[rows['lost'].loc[start:].astype(bool)]
+        return [(stats['x'], stats[col]) for col in ('rtt_ms', 'jitter_ms', 'loss_pct')] + \
+               [(lost['x'], np.zeros(len(lost)))]
+
+    rows = tail.rows_since(start)
+    if rows.empty:
+        return []
+    x_col = config.get('x_column')
+    return [(rows[x_col], rows[y_col]) for y_col in trace_columns(graph_type, config)]
+
+
+# Graph types whose figures can be extended as their file grows
+TAIL_GRAPH_TYPES = {'ping', 'single_line', 'dual_line'}
+
+
+def follows_file(filepath, graph_type, config):
+    """True if a render is drawn from the file's LogTail, for /tail to extend"""
+    return (bool(config.get('live')) and graph_type in TAIL_GRAPH_TYPES
+            and filepath.rsplit('.', 1)[-1].lower() in TAIL_FILE_TYPES
+            and not use_out_of_core(filepath, graph_type, config))
+
+
+def live_render(filename, graph_type, config, progress):
+    """/generate_graph response for a growing file, drawn from its LogTail.
+
+    The tail has parsed up to the end of the last complete line, which is
+    reported as source_bytes: /tail streams the rows after it, so a line
+    still being written is neither plotted half-way nor sent twice.
+    """
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    progress('parse', 5)
+    df, source_bytes = log_tail(filename, 'ping' if graph_type == 'ping' else 'table').frame()
+    progress('decimate', 40)
+    if graph_type == 'ping':
+        if df.empty:
+            raise ValueError('No ping replies or timeouts found in file')
+        fig = render_figure(ping_plotter(filepath, config, df), config)
+        original = fig.layout.meta['source_points']
+    else:
+        fig = render_figure(COLUMN_BUILDERS[graph_type](df, config), config)
+        original = len(df) * len(fig.data)
+    progress('serialize', 80)
+    return {'success': True, 'graph': encode_figure(fig), 'point_counts': point_counts(original, fig),
+            'source_bytes': source_bytes}
+
+
+@app.route('/tail/<filename>', methods=['GET'])
+def tail_stream(filename):
+    """Server-sent events with the points appended to a growing file after a render.
+
+    Query parameters are the render's graph_type, config (JSON) and the
+    source_bytes it reported as ``since``. Each 'extend' event holds the
+    arguments for Plotly.extendTraces; 'reset' means the file was truncated
+    and the graph should be rendered again.
+    """
+    graph_type = request.args.get('graph_type')
+    if graph_type not in TAIL_GRAPH_TYPES:
+        return jsonify({'error': f'Live tail is not available for {graph_type} graphs'}), 400
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if not os.path.exists(filepath):
+        return jsonify({'error': f'Unknown file: {filename}'}), 404
+    if filepath.rsplit('.', 1)[-1].lower() not in TAIL_FILE_TYPES:
+        return jsonify({'error': 'Live tail is only available for CSV and text files'}), 400
+    try:
+        config = json.loads(request.args.get('config') or '{}')
+        since = request.args.get('since', type=int)
+        # Shorter than when it was rendered: replaced or truncated since
+        truncated = since is not None and since > os.path.getsize(filepath)
+        tail = log_tail(filename, 'ping' if graph_type == 'ping' else 'table', since)
+        cursor = tail.rows_before(since) if since is not None else tail.rows
+    except Exception as e:
+        return jsonify({'error': f'Error following file: {str(e)}'}), 400
+
+    def events(cursor):
+        generation = tail.generation
+        last_sent = time.monotonic()
+        # Sends the headers right away so the client sees the stream open
+        yield ': live\n\n'
+        while True:
+            if tail.advance():
+                dataset_cache.put(tail.key, tail, tail.nbytes)
+            if truncated or tail.generation != generation:
+                yield 'event: reset\ndata: {}\n\n'
+                return
+            if tail.rows > cursor:
+                traces = tail_traces(graph_type, config, tail, cursor)
+                cursor = tail.rows
+                update = {
+                    'x': [tail_values(x) for x, _ in traces],
+                    'y': [tail_values(y) for _, y in traces],
+                    'indices': list(range(len(traces))),
+                    'max_points': TAIL_MAX_POINTS,
+                    'rows': cursor
+                }
+                yield f'event: extend\ndata: {json.dumps(update)}\n\n'
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent > TAIL_KEEPALIVE_SECONDS:
+                # Comment line, lets the server notice a closed connection
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+            time.sleep(TAIL_POLL_SECONDS)
+
+    response = app.response_class(events(cursor), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies (nginx) from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 if __name__ == '__main__':
     print(f"Starting server on {HOST}:{PORT}")
@@ -0,0 +1,289 @@
+"""
+Summary statistics for DataFrame columns, computed from chunks of rows.
+
+Every statistic is computed from one pass over the data, fed chunk by chunk,
+with the columns of a chunk processed in parallel by a thread pool (numpy and
+pandas release the GIL for the heavy parts). Per-column state is mergeable:
+Chan-merged moments, null counts, min/max, a HyperLogLog sketch for distinct
+counts and a merging t-digest for quantiles.
+"""
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# STATISTICS ENGINE CONFIGURATION
+# =============================================================================
+# HLL_PRECISION: 2**p registers per HyperLogLog sketch, standard error is about
+#   1.04 / sqrt(2**p) (0.8% at 14)
+# HLL_EXACT_LIMIT: distinct hashes kept as an exact set before a sketch relies
+#   on its registers alone
+# TDIGEST_COMPRESSION: maximum number of centroids a t-digest keeps, higher is
+#   more accurate in the middle of the distribution
+# TDIGEST_BUFFER: values buffered before a digest is compressed. Columns that
+#   never fill the buffer report exact quantiles
+# STATS_WORKERS: threads used to process the columns of a chunk
+# =============================================================================
+HLL_PRECISION = 14
+HLL_EXACT_LIMIT = 100_000
+TDIGEST_COMPRESSION = 200
+TDIGEST_BUFFER = 100_000
+STATS_WORKERS = min(8, os.cpu_count() or 1)
+
+# Statistics that can be requested from summarize_columns
+ALL_STATISTICS = frozenset({'moments', 'minmax', 'nulls', 'distinct', 'quantiles', 'samples'})
+SAMPLE_VALUES = 3
+
+
+class HyperLogLog:
+    """Distinct-count sketch over 64-bit value hashes"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        # Sparse phase: small columns get an exact count
+        self.exact = np.empty(0, dtype=np.uint64)
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.exact is not None:
+            self.exact = np.union1d(self.exact, hashes)
+            if len(self.exact) > HLL_EXACT_LIMIT:
+                self.exact = None
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Position of the leftmost set bit of the suffix, from its bit length.
+        # frexp is exact here since the suffix is narrower than a float mantissa
+        bit_length = np.frexp(suffix.astype(np.float64))[1]
+        rank = (suffix_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, values):
+        self.add_hashes(pd.util.hash_array(np.asarray(values)))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if self.exact is not None and other.exact is not None:
+            self.exact = np.union1d(self.exact, other.exact)
+            if len(self.exact) > HLL_EXACT_LIMIT:
+                self.exact = None
+        else:
+            self.exact = None
+
+    def estimate(self):
+        if self.exact is not None:
+            return len(self.exact)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is far more accurate while many registers are empty
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class TDigest:
+    """Merging t-digest for quantiles of a stream of floats"""
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.buffer = []
+        self.buffered = 0
+        self.compressed = False
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.buffer.append(values)
+        self.buffered += len(values)
+        if self.buffered >= TDIGEST_BUFFER:
+            self.compress()
+
+    def merge(self, other):
+        self.flush()
+        other.flush()
+        means = np.concatenate([self.means, other.means])
+        order = np.argsort(means, kind='stable')
+        self.means = means[order]
+        self.weights = np.concatenate([self.weights, other.weights])[order]
+        self.compressed = self.compressed or other.compressed
+        # Digests that together still fit the buffer stay exact
+        if self.compressed or len(self.means) >= TDIGEST_BUFFER:
+            self.compress()
+
+    def flush(self):
+        """Sort the buffered values in among the centroids"""
+        if not self.buffer:
+            return
+        # Only the new values need a full sort, the centroids are already
+        # sorted and few, so they are inserted at their positions
+        values = np.sort(np.concatenate(self.buffer))
+        positions = np.searchsorted(values, self.means)
+        self.means = np.insert(values, positions, self.means)
+        self.weights = np.insert(np.ones(len(values)), positions, self.weights)
+        self.buffer = []
+        self.buffered = 0
+
+    def compress(self):
+        self.flush()
+        total = self.weights.sum()
+        if len(self.means) <= self.compression or total == 0:
+            return
+        # Every centroid covers at most one unit of the k1 scale function
+        # k(q) = delta / (2 pi) * asin(2q - 1), which keeps the tails fine
+        cumulative = np.cumsum(self.weights)
+        q = (cumulative - self.weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+        weights = np.add.reduceat(self.weights, starts)
+        self.means = np.add.reduceat(self.means * self.weights, starts) / weights
+        self.weights = weights
+        self.compressed = True
+
+    def quantile(self, q):
+        self.flush()
+        if len(self.means) == 0:
+            return np.nan
+        if not self.compressed:
+            # Still every value on its own, interpolate like pandas does
+            return float(np.quantile(self.means, q))
+        # Interpolate between centroid centres, each at the middle of its weight
+        centres = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.weights.sum(), centres, self.means))
+
+
+class ColumnSummary:
+    """Mergeable single-pass statistics for one column"""
+
+    def __init__(self, name, dtype, statistics=ALL_STATISTICS):
+        self.name = name
+        self.dtype = dtype
+        self.statistics = statistics
+        self.numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        self.rows = 0
+        self.nulls = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.samples = []
+        self.hll = HyperLogLog() if 'distinct' in statistics else None
+        self.digest = TDigest() if 'quantiles' in statistics and self.numeric else None
+
+    def update(self, col):
+        self.rows += len(col)
+        if self.numeric and not pd.api.types.is_numeric_dtype(col.dtype):
+            # A later chunk of a streamed file came back as text (e.g. one bad
+            # cell); whatever does not parse as a number counts as missing
+            col = pd.to_numeric(col, errors='coerce')
+        missing = col.isnull().to_numpy()
+        self.nulls += int(missing.sum())
+        if 'samples' in self.statistics and len(self.samples) < SAMPLE_VALUES:
+            head = col.head(SAMPLE_VALUES - len(self.samples))
+            self.samples.extend(map(self._reported, head) if self.dtype == np.float32 else head.tolist())
+        if self.hll is not None:
+            self.hll.add(col.to_numpy()[~missing])
+        if not self.numeric:
+            return
+
+        values = col.to_numpy(dtype=np.float64, na_value=np.nan)[~missing]
+        if len(values) == 0:
+            return
+        if 'moments' in self.statistics:
+            n = len(values)
+            chunk_mean = values.mean()
+            chunk_m2 = np.square(values - chunk_mean).sum()
+            self._merge_moments(n, chunk_mean, chunk_m2)
+        else:
+            self.count += len(values)
+        if 'minmax' in self.statistics or 'quantiles' in self.statistics:
+            self.min = np.nanmin([self.min, values.min()])
+            self.max = np.nanmax([self.max, values.max()])
+        if self.digest is not None:
+            self.digest.add(values)
+
+    def _merge_moments(self, n, mean, m2):
+        # Chan et al. pairwise combination of count, mean and squared deviations
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    def merge(self, other):
+        """Fold another summary of the same column (e.g. another file) into this one"""
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.samples = (self.samples + other.samples)[:SAMPLE_VALUES]
+        if other.count:
+            self._merge_moments(other.count, other.mean, other.m2)
+            self.min = np.nanmin([self.min, other.min])
+            self.max = np.nanmax([self.max, other.max])
+        if self.hll is not None and other.hll is not None:
+            self.hll.merge(other.hll)
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+
+    def _reported(self, value):
+        """Values of float32 columns as their shortest decimal, i.e. as the source had them"""
+        if self.dtype == np.float32 and np.isfinite(value):
+            return float(str(np.float32(value)))
+        return value
+
+    def mean_value(self):
+        return self.mean if self.count else np.nan
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        return self.digest.quantile(q) if self.digest is not None else np.nan
+
+    def distinct(self):
+        return self.hll.estimate() if self.hll is not None else None
+
+    def to_dict(self):
+        result = {'column': self.name, 'dtype': str(self.dtype), 'rows': self.rows, 'nulls': self.nulls}
+        if self.numeric:
+            result['count'] = self.count
+            if 'moments' in self.statistics:
+                result.update({'mean': self.mean_value(), 'std': self.std()})
+            if 'minmax' in self.statistics:
+                result.update({'min': self._reported(self.min), 'max': self._reported(self.max)})
+            if self.digest is not None:
+                result.update({label: self._reported(self.quantile(q))
+                               for label, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75))})
+        if self.hll is not None:
+            result['distinct'] = self.distinct()
+        if self.samples:
+            result['samples'] = [str(value) for value in self.samples]
+        return result
+
+
+def summarize_columns(chunks, statistics=ALL_STATISTICS, workers=STATS_WORKERS):
+    """ColumnSummary per column of an iterable of DataFrame chunks.
+
+    The chunks are read once. Within a chunk each column is updated by its own
+    pool task, so a summary is only ever touched by one thread at a time.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    statistics = frozenset(statistics)
+    summaries = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for chunk in chunks:
+            if not summaries:
+                summaries = [ColumnSummary(col, chunk[col].dtype, statistics) for col in chunk.columns]
+            list(pool.map(lambda summary: summary.update(chunk[summary.name]), summaries))
+    return summaries
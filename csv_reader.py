@@ -0,0 +1,212 @@
+"""
+CSV parsing with pandas or with pyarrow's multi-threaded reader.
+
+read_csv and iter_csv take the same options as pandas.read_csv. With the
+pyarrow engine the file is parsed by pyarrow's multi-threaded CSV reader,
+which splits it into blocks parsed on all cores, with every column's type
+pinned from a pandas parse of the first bytes so both engines produce the
+same DataFrame. Anything pyarrow cannot do the same way (decimal commas,
+comment lines, regex separators, open file objects, rows that do not fit the
+sniffed types) falls back to pandas. read_csv can stop after the first bytes
+of a file, e.g. at the last complete line of a log that is still being written.
+"""
+import io
+import os
+import logging
+from contextlib import nullcontext
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+from text_format import read_sample
+
+# pyarrow is optional, every file is parsed by pandas without it
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CSV READER CONFIGURATION
+# =============================================================================
+# CSV_ENGINE: default csv_engine, 'pyarrow' (falls back to pandas where needed) or
+#   'pandas'. The apps pass their own setting
+# ARROW_BLOCK_SIZE: bytes per block, blocks are parsed in parallel
+# ARROW_USE_THREADS: parse blocks on a thread pool sized to the machine
+# =============================================================================
+CSV_ENGINE = 'pyarrow'
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+ARROW_USE_THREADS = True
+
+# read_csv options with a pyarrow equivalent
+ARROW_SUPPORTED_OPTIONS = {'sep', 'delimiter', 'header', 'names', 'skiprows', 'usecols',
+                           'parse_dates', 'engine', 'decimal', 'on_bad_lines'}
+
+
+def arrow_type(dtype):
+    """pyarrow type that converts back to ``dtype``, None if there is none"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(dtype):
+        return pa.int64()
+    if pd.api.types.is_float_dtype(dtype):
+        return pa.float64()
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return pa.timestamp('ns')
+    if dtype == np.object_:
+        # Kept as text even if pyarrow would infer dates or numbers
+        return pa.string()
+    return None
+
+
+class ArrowPlan:
+    """pyarrow.csv options matching a set of read_csv options for one file"""
+
+    def __init__(self, read_options, parse_options, convert_options, empty):
+        self.read_options = read_options
+        self.parse_options = parse_options
+        self.convert_options = convert_options
+        # What pandas returns for a file with no rows after the header
+        self.empty = empty
+
+    def read(self, source):
+        table = pacsv.read_csv(source, self.read_options, self.parse_options, self.convert_options)
+        return self.to_pandas(table)
+
+    def batches(self, filepath):
+        reader = pacsv.open_csv(filepath, self.read_options, self.parse_options, self.convert_options)
+        for batch in reader:
+            yield self.to_pandas(batch)
+
+    @staticmethod
+    def to_pandas(data):
+        df = data.to_pandas(split_blocks=True, self_destruct=True)
+        # pyarrow gives None for missing text where pandas gives NaN
+        for col in df.columns:
+            if df[col].dtype == np.object_ and df[col].hasnans:
+                df[col] = df[col].where(df[col].notna(), np.nan)
+        return df
+
+
+class LimitedReader(io.RawIOBase):
+    """The first ``limit`` bytes of a file as a file object of their own"""
+
+    def __init__(self, filepath, limit):
+        self.file = open(filepath, 'rb')
+        self.remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        read = self.file.readinto(memoryview(buffer)[:self.remaining])
+        self.remaining -= read
+        return read
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def open_source(filepath, limit):
+    """What the readers parse: the path, or a reader stopping after ``limit`` bytes"""
+    if limit is None:
+        return nullcontext(filepath)
+    return io.BufferedReader(LimitedReader(filepath, limit))
+
+
+def arrow_plan(filepath, options, limit=None):
+    """ArrowPlan equivalent to ``options``, None if pyarrow cannot match pandas here"""
+    if pa is None or not isinstance(filepath, (str, os.PathLike)):
+        return None
+    if set(options) - ARROW_SUPPORTED_OPTIONS or options.get('decimal', '.') != '.':
+        return None
+    sep = options.get('sep', options.get('delimiter', ','))
+    header = options.get('header', 0)
+    skiprows = options.get('skiprows', 0) or 0
+    if len(sep) != 1 or header not in (0, None) or not isinstance(skiprows, int):
+        return None
+
+    # The sample parse gives the column names (deduplicated the pandas way)
+    # and the types to pin, so pyarrow does not infer them per block
+    sample_options = {key: value for key, value in options.items() if key != 'usecols'}
+    try:
+        sample = pd.read_csv(io.BytesIO(read_sample(filepath, limit)), **sample_options)
+    except Exception:
+        return None
+    column_types = {}
+    for col in sample.columns:
+        column_type = arrow_type(sample[col].dtype)
+        if column_type is None:
+            return None
+        column_types[str(col)] = column_type
+    names = list(column_types)
+
+    include = []
+    if options.get('usecols') is not None:
+        # pandas returns usecols in file order
+        include = [col for col in names if col in options['usecols']]
+        if len(include) != len(set(options['usecols'])):
+            return None
+    read_options = pacsv.ReadOptions(
+        column_names=names,
+        skip_rows=skiprows + (1 if header == 0 else 0),
+        block_size=ARROW_BLOCK_SIZE,
+        use_threads=ARROW_USE_THREADS
+    )
+    parse_options = pacsv.ParseOptions(
+        delimiter=sep,
+        invalid_row_handler=(lambda row: 'skip') if options.get('on_bad_lines') == 'skip' else None
+    )
+    convert_options = pacsv.ConvertOptions(
+        column_types=column_types,
+        include_columns=include,
+        # The NA tokens pandas uses by default, pyarrow's own list differs
+        null_values=sorted(STR_NA_VALUES),
+        strings_can_be_null=True
+    )
+    empty = sample.iloc[:0]
+    if include:
+        empty = empty[include]
+    return ArrowPlan(read_options, parse_options, convert_options, empty)
+
+
+def read_csv(filepath, csv_engine=CSV_ENGINE, limit=None, **options):
+    """pandas.read_csv through the configured engine, of the first ``limit`` bytes if given"""
+    plan = arrow_plan(filepath, options, limit) if csv_engine == 'pyarrow' else None
+    if plan is not None:
+        try:
+            with open_source(filepath, limit) as source:
+                return plan.read(source)
+        except pa.ArrowException as e:
+            logger.info("pyarrow could not parse %s (%s), using pandas", os.path.basename(filepath), e)
+    with open_source(filepath, limit) as source:
+        return pd.read_csv(source, **options)
+
+
+def iter_csv(filepath, chunksize, csv_engine=CSV_ENGINE, **options):
+    """DataFrames of at most ``chunksize`` rows, like read_csv(chunksize=...)"""
+    plan = arrow_plan(filepath, options) if csv_engine == 'pyarrow' else None
+    rows = 0
+    if plan is not None:
+        try:
+            for df in plan.batches(filepath):
+                for start in range(0, len(df), chunksize):
+                    chunk = df.iloc[start:start + chunksize]
+                    rows += len(chunk)
+                    yield chunk
+            if rows == 0:
+                # pandas yields one empty chunk for a header-only file
+                yield plan.empty
+            return
+        except pa.ArrowException as e:
+            logger.info("pyarrow could not parse %s (%s), using pandas", os.path.basename(filepath), e)
+    # Rows already yielded by pyarrow before it failed are skipped
+    for chunk in pd.read_csv(filepath, chunksize=chunksize, **options):
+        if rows >= len(chunk):
+            rows -= len(chunk)
+            continue
+        yield chunk.iloc[rows:]
+        rows = 0
@@ -7,28 +7,143 @@ import dash
 from dash import dcc, html, Input, Output, State, callback_context
 import dash_bootstrap_components as dbc
 from dash.exceptions import PreventUpdate
-import base64
-import io
 import datetime
 import zipfile
+import re
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from flask import request, jsonify
+from werkzeug.utils import secure_filename
+
+# Modules shared with the Flask app, imported from the repository root
+# (on PYTHONPATH, see start_dash.sh)
+from column_stats import summarize_columns
+from text_format import sniff_text_format
+from csv_reader import read_csv, iter_csv
+from render_mode import apply_render_mode
+from grid_aggregation import grid_aggregates
+from zip_reader import ZIP_SOURCE_COLUMN, zip_csv_members, read_zip_member
 
 # Initialize Dash app with dark theme and blue accent
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
 app.title = "Graphing Tool - Dash Version"
 
-# Global variable to store uploaded data
-uploaded_data = None
+# Callbacks share the stored DataFrames instead of copying them; copy-on-write
+# makes any modification (e.g. data cleaning) copy only the columns it touches
+pd.set_option('mode.copy_on_write', True)
+
+# Uploaded data is kept per browser session (see SessionDatasets). Sessions
+# idle for SESSION_IDLE_MINUTES are dropped, and the least recently used ones
+# are dropped once all sessions together hold more than SESSION_STORE_MAX_MB
+SESSION_STORE_MAX_MB = 2048
+SESSION_IDLE_MINUTES = 60
 
 # File size configuration - set to 1 GB maximum
 MAX_FILE_SIZE_MB = 1024  # 1 GB maximum file size
 ALLOWED_EXTENSIONS = {'csv', 'txt', 'log', 'json', 'zip'}
+app.server.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE_MB * 1024 * 1024
+
+# Uploads are streamed by assets/upload.js to the /upload route and written to
+# UPLOAD_FOLDER in UPLOAD_CHUNK_BYTES pieces; the upload callback only gets a
+# handle to the file, parses it from disk and deletes it
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Handle files untouched for this long were never claimed (closed tab, crash)
+STALE_UPLOAD_MINUTES = 60
+HANDLE_PATTERN = re.compile(r'[0-9a-f]{32}\.(?:' + '|'.join(sorted(ALLOWED_EXTENSIONS)) + ')')
+
+# The summary and statistics functions read their input STATS_CHUNK_ROWS rows
+# at a time and merge per-chunk results, so they also accept the path of a CSV
+# file too large to load. Distinct counts and quantiles are sketched
+# (HyperLogLog / t-digest) once a column has more than 100,000 values.
+STATS_CHUNK_ROWS = 200_000
+
+# CSV uploads over OUT_OF_CORE_FILE_MB are not loaded: the file is kept in
+# SESSION_FILE_FOLDER as the session's data, summaries and statistics stream
+# it and graphs read only the columns they plot
+OUT_OF_CORE_FILE_MB = 256
+SESSION_FILE_FOLDER = os.path.join(UPLOAD_FOLDER, 'sessions')
+os.makedirs(SESSION_FILE_FOLDER, exist_ok=True)
+
+# Maps with more points than this are thinned onto a lat/lon grid of about as
+# many cells, one marker per occupied cell (see grid_aggregation.py)
+MAP_MAX_POINTS = 50000
+
+# CSV and delimited text uploads are parsed by pyarrow's multi-threaded CSV
+# reader ('pyarrow', falls back to pandas for what it cannot parse the same
+# way) or by pandas alone ('pandas'), see csv_reader.py
+CSV_ENGINE = 'pyarrow'
 
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+class SessionDatasets:
+    """Uploaded data keyed by session id, evicted by idle time and total memory.
+
+    The data is a DataFrame, or the path of a CSV file kept on disk that is
+    deleted with its entry and costs no memory.
+    """
+    
+    def __init__(self, max_bytes, idle_seconds):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.entries = OrderedDict()  # session id -> (df, nbytes, last used)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+    
+    def get(self, session_id):
+        with self.lock:
+            self._evict_idle()
+            entry = self.entries.get(session_id)
+            if entry is None:
+                return None
+            self.entries[session_id] = (entry[0], entry[1], time.time())
+            self.entries.move_to_end(session_id)
+            if not isinstance(entry[0], pd.DataFrame):
+                # In use, so the stale file sweep of other workers leaves it alone
+                os.utime(entry[0])
+            return entry[0]
+    
+    def put(self, session_id, data):
+        nbytes = int(data.memory_usage(index=True, deep=True).sum()) if isinstance(data, pd.DataFrame) else 0
+        with self.lock:
+            self._drop(session_id)
+            self.entries[session_id] = (data, nbytes, time.time())
+            self.total_bytes += nbytes
+            self._evict_idle()
+            # Never evict the session that just uploaded
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                oldest = next(iter(self.entries))
+                app.server.logger.info("Evicting data of session %s to stay under %d MB",
+                                       oldest, SESSION_STORE_MAX_MB)
+                self._drop(oldest)
+    
+    def _drop(self, session_id):
+        entry = self.entries.pop(session_id, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+            if not isinstance(entry[0], pd.DataFrame):
+                try:
+                    os.remove(entry[0])
+                except OSError:
+                    pass
+    
+    def _evict_idle(self):
+        cutoff = time.time() - self.idle_seconds
+        for session_id in [sid for sid, entry in self.entries.items() if entry[2] < cutoff]:
+            self._drop(session_id)
+
+session_datasets = SessionDatasets(SESSION_STORE_MAX_MB * 1024 * 1024, SESSION_IDLE_MINUTES * 60)
+
+def session_expired_alert():
+    return dbc.Alert("❌ Your uploaded data has expired. Please upload the file again.", color="warning")
+
 # Layout
-app.layout = dbc.Container([
+main_layout = dbc.Container([
     dbc.Row([
         dbc.Col([
             html.H1("📊 Graphing Tool", className="text-center mb-4"),
@@ -43,7 +158,8 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("📁 File Upload"),
                 dbc.CardBody([
-                    dcc.Upload(
+                    # Click and drop handling live in assets/upload.js
+                    html.Div(
                         id='upload-data',
                         children=html.Div([
                             'Drag and Drop or ',
@@ -59,10 +175,10 @@ app.layout = dbc.Container([
                             'textAlign': 'center',
                             'margin': '10px',
                             'cursor': 'pointer'
-                        },
-                        multiple=False,
-                        accept='.csv,.txt,.log,.json,.zip'
+                        }
                     ),
+                    dcc.Store(id='upload-handle'),
+                    html.Div(id='upload-progress', className="mt-2 text-muted"),
                     html.Div(id='upload-status', className="mt-2")
                 ])
             ], className="mb-3"),
@@ -133,76 +249,120 @@ app.layout = dbc.Container([
     ])
 ], fluid=True)
 
+def serve_layout():
+    """Page layout with a fresh session id, so every browser tab gets its own data"""
+    return html.Div([
+        dcc.Store(id='session-id', data=uuid.uuid4().hex),
+        main_layout
+    ])
+
+app.layout = serve_layout
+
+def remove_stale_uploads():
+    """Delete upload handles nobody claimed within STALE_UPLOAD_MINUTES, and
+    session files unused for SESSION_IDLE_MINUTES (left by a stopped worker).
+
+    Fresh handles may belong to uploads another worker is still processing,
+    and anything not named like a handle is not ours, so both are left alone.
+    """
+    for folder, minutes in ((UPLOAD_FOLDER, STALE_UPLOAD_MINUTES), (SESSION_FILE_FOLDER, SESSION_IDLE_MINUTES)):
+        cutoff = time.time() - minutes * 60
+        for entry in os.scandir(folder):
+            if not (HANDLE_PATTERN.fullmatch(entry.name) and entry.is_file(follow_symlinks=False)):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                # Claimed by another worker meanwhile
+                pass
+
+remove_stale_uploads()
+
+# Streaming upload route
+@app.server.route(app.config.routes_pathname_prefix + 'upload', methods=['POST'])
+def upload_file():
+    """Write the raw request body to UPLOAD_FOLDER and return a handle to it"""
+    filename = secure_filename(request.args.get('filename', ''))
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Please upload a supported file type (CSV, TXT, LOG, JSON, ZIP).'}), 400
+    if request.content_length and request.content_length > app.server.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': f'File too large. Maximum size is {MAX_FILE_SIZE_MB} MB.'}), 413
+    
+    remove_stale_uploads()
+    handle = f"{uuid.uuid4().hex}.{filename.rsplit('.', 1)[1].lower()}"
+    size = 0
+    with open(os.path.join(UPLOAD_FOLDER, handle), 'wb') as f:
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            f.write(chunk)
+            size += len(chunk)
+    return jsonify({'handle': handle, 'filename': filename, 'size': size})
+
+def read_uploaded_file(filepath, file_extension):
+    """Parse an uploaded file straight from disk, None for a zip without a CSV"""
+    if file_extension == 'csv':
+        return read_csv(filepath, csv_engine=CSV_ENGINE)
+    elif file_extension in ('txt', 'log'):
+        # Delimiter, header and preamble lines are sniffed from a sample first
+        options = sniff_text_format(filepath)['options']
+        return read_csv(filepath, csv_engine=CSV_ENGINE, **options)
+    elif file_extension == 'json':
+        return pd.read_json(filepath)
+    elif file_extension == 'zip':
+        # Every CSV in the archive, stacked with the member each row came from
+        with zipfile.ZipFile(filepath) as zip_ref:
+            members = zip_csv_members(zip_ref)
+        if not members:
+            return None
+        df = pd.concat([read_zip_member(filepath, member) for member in members], ignore_index=True)
+        df[ZIP_SOURCE_COLUMN] = df[ZIP_SOURCE_COLUMN].astype('category')
+        return df
+
 # Callback for file upload
 @app.callback(
     [Output('upload-status', 'children'),
      Output('graph-config', 'children'),
      Output('generate-btn', 'disabled'),
      Output('process-btn', 'disabled')],
-    [Input('upload-data', 'contents')],
-    [State('upload-data', 'filename')]
+    [Input('upload-handle', 'data')],
+    [State('session-id', 'data')]
 )
-def update_upload_status(contents, filename):
-    global uploaded_data
-    
-    if contents is None:
+def update_upload_status(upload, session_id):
+    if not upload:
         return "", "", True, True
+    if upload.get('error'):
+        return dbc.Alert(f"❌ {upload['error']}", color="danger"), "", True, True
+    
+    filename = upload.get('filename')
+    handle = upload.get('handle', '')
+    filepath = os.path.join(UPLOAD_FOLDER, handle)
+    # The handle comes back from the browser, only accept names /upload creates
+    if secure_filename(handle) != handle or not os.path.isfile(filepath):
+        return dbc.Alert("❌ Uploaded file not found. Please upload it again.", color="danger"), "", True, True
     
     try:
-        print(f"DEBUG: Upload triggered with filename: {filename}")
-        print(f"DEBUG: Contents type: {type(contents)}")
-        
-        # Parse uploaded file
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
-        
-        print(f"DEBUG: Content type: {content_type}")
-        print(f"DEBUG: Decoded size: {len(decoded)} bytes")
-        
         if filename and allowed_file(filename):
             file_extension = filename.rsplit('.', 1)[1].lower()
-            print(f"DEBUG: Processing {file_extension} file")
-            
-            if file_extension == 'csv':
-                df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-                print(f"DEBUG: CSV loaded with {len(df)} rows, {len(df.columns)} columns")
-            elif file_extension == 'txt':
-                # Try different delimiters for text files
-                try:
-                    df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), delimiter='\t')
-                    print(f"DEBUG: TXT loaded with tab delimiter")
-                except Exception as e1:
-                    try:
-                        df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), delimiter=',')
-                        print(f"DEBUG: TXT loaded with comma delimiter")
-                    except Exception as e2:
-                        df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), delimiter='\s+')
-                        print(f"DEBUG: TXT loaded with space delimiter")
-            elif file_extension == 'log':
-                # Try to read log files as space or tab separated
-                try:
-                    df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), delimiter='\s+', engine='python')
-                    print(f"DEBUG: LOG loaded with space delimiter")
-                except Exception as e:
-                    df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), delimiter='\t')
-                    print(f"DEBUG: LOG loaded with tab delimiter")
-            elif file_extension == 'json':
-                df = pd.read_json(io.StringIO(decoded.decode('utf-8')))
-                print(f"DEBUG: JSON loaded with {len(df)} rows, {len(df.columns)} columns")
-            elif file_extension == 'zip':
-                # Handle zip files - extract and read the first CSV file
-                with zipfile.ZipFile(io.BytesIO(decoded)) as zip_ref:
-                    csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
-                    if csv_files:
-                        with zip_ref.open(csv_files[0]) as csv_file:
-                            df = pd.read_csv(csv_file)
-                        print(f"DEBUG: ZIP CSV loaded with {len(df)} rows, {len(df.columns)} columns")
-                    else:
-                        return dbc.Alert("❌ No CSV file found in zip archive.", color="danger"), "", True, True
-            
-            uploaded_data = df
-            columns = df.columns.tolist()
-            numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+            size_mb = os.path.getsize(filepath) / (1024 * 1024)
+            if file_extension == 'csv' and size_mb > OUT_OF_CORE_FILE_MB:
+                # Too large to load, the session keeps the file instead
+                data = os.path.join(SESSION_FILE_FOLDER, handle)
+                os.replace(filepath, data)
+                session_datasets.put(session_id, data)
+                columns = dataset_columns(data)
+                status = dbc.Alert(f"✅ File uploaded successfully! Found {len(columns)} columns. At {size_mb:.0f} MB "
+                                   "it is read from disk: summaries and statistics stream it and graphs load only "
+                                   "the columns they plot.", color="success")
+            else:
+                df = read_uploaded_file(filepath, file_extension)
+                if df is None:
+                    return dbc.Alert("❌ No CSV file found in zip archive.", color="danger"), "", True, True
+                session_datasets.put(session_id, df)
+                columns = df.columns.tolist()
+                status = dbc.Alert(f"✅ File uploaded successfully! Found {len(df)} rows and {len(df.columns)} columns.", color="success")
             
             # Create configuration elements
             config_elements = [
@@ -213,21 +373,33 @@ def update_upload_status(contents, filename):
                 dcc.Dropdown(id='y-columns', options=[{'label': col, 'value': col} for col in columns], multi=True, placeholder="Select Y-axis column(s)..."),
                 
                 html.Label("Title:", className="mt-2"),
-                dbc.Input(id='graph-title', placeholder="Enter graph title...", value="My Graph")
+                dbc.Input(id='graph-title', placeholder="Enter graph title...", value="My Graph"),
+                
+                html.Label("Rendering:", className="mt-2"),
+                dcc.Dropdown(
+                    id='render-mode',
+                    options=[
+                        {'label': 'Auto (WebGL for large graphs)', 'value': 'auto'},
+                        {'label': 'WebGL', 'value': 'webgl'},
+                        {'label': 'SVG', 'value': 'svg'}
+                    ],
+                    value='auto',
+                    clearable=False
+                )
             ]
             
-            status = dbc.Alert(f"✅ File uploaded successfully! Found {len(df)} rows and {len(df.columns)} columns.", color="success")
             return status, config_elements, False, False
             
         else:
-            print(f"DEBUG: File not allowed - filename: {filename}")
             return dbc.Alert("❌ Please upload a supported file type (CSV, TXT, LOG, JSON, ZIP).", color="danger"), "", True, True
             
     except Exception as e:
-        print(f"DEBUG: Upload error: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        app.server.logger.exception("Could not parse upload %s", filename)
         return dbc.Alert(f"❌ Error uploading file: {str(e)}", color="danger"), "", True, True
+    
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
 
 # Callback for graph generation
 @app.callback(
@@ -238,21 +410,30 @@ def update_upload_status(contents, filename):
     [State('graph-type', 'value'),
      State('x-column', 'value'),
      State('y-columns', 'value'),
-     State('graph-title', 'value')],
+     State('graph-title', 'value'),
+     State('render-mode', 'value'),
+     State('session-id', 'data')],
     prevent_initial_call=True
 )
-def generate_graph(n_clicks, graph_type, x_col, y_cols, title):
-    global uploaded_data
-    
-    if n_clicks is None or uploaded_data is None:
+def generate_graph(n_clicks, graph_type, x_col, y_cols, title, render_mode, session_id):
+    if n_clicks is None:
         raise PreventUpdate
     
+    data = session_datasets.get(session_id)
+    if data is None:
+        return {}, "", session_expired_alert()
+    
     try:
-        df = uploaded_data.copy()
         
         if not x_col or not y_cols:
             return {}, "", dbc.Alert("❌ Please select X-axis and Y-axis columns.", color="warning")
         
+        # Maps take latitude and longitude from the first two columns
+        if graph_type == 'scatter_on_map':
+            df = load_columns(data, dataset_columns(data)[:3] + y_cols[:1])
+        else:
+            df = load_columns(data, [x_col] + y_cols)
+        
         # Create graph based on type
         if graph_type == 'scatter':
             fig = create_scatter_plot(df, x_col, y_cols, title)
@@ -261,16 +442,19 @@ def generate_graph(n_clicks, graph_type, x_col, y_cols, title):
         elif graph_type == 'dual_line':
             fig = create_dual_line_chart(df, x_col, y_cols, title)
         elif graph_type == 'scatter_on_map':
-            result = scatter_on_map(df, x_col, y_cols, title)
-            if result == "Success":
-                return {}, "", dbc.Alert("✅ Scatter map generated successfully! Check the new window that opened.", color="success", duration=5000)
-            else:
+            fig = scatter_on_map(df, x_col, y_cols, title)
+            if fig is None:
                 return {}, "", dbc.Alert("❌ Failed to generate scatter map.", color="danger")
         else:
             return {}, "", dbc.Alert("❌ Invalid graph type.", color="danger")
         
+        fig = apply_render_mode(fig, render_mode)
+        
         # Return the graph and info
-        info = dbc.Alert(f"✅ Graph generated successfully! Showing {len(df)} data points.", color="success")
+        if graph_type == 'scatter_on_map' and len(fig.data[0].lat) < len(df):
+            info = dbc.Alert(f"✅ Map generated! Showing {len(fig.data[0].lat)} grid cells summarising {len(df)} data points.", color="success")
+        else:
+            info = dbc.Alert(f"✅ Graph generated successfully! Showing {len(df)} data points.", color="success")
         return fig, info, ""
         
     except Exception as e:
@@ -279,11 +463,10 @@ def generate_graph(n_clicks, graph_type, x_col, y_cols, title):
 # Callback for processing configuration
 @app.callback(
     Output('process-config', 'children'),
-    [Input('process-type', 'value')]
+    [Input('process-type', 'value')],
+    [State('session-id', 'data')]
 )
-def update_process_config(process_type):
-    global uploaded_data
-    
+def update_process_config(process_type, session_id):
     if not process_type:
         return ""
     
@@ -303,8 +486,9 @@ def update_process_config(process_type):
     elif process_type == 'filter':
         # Get column options from uploaded data
         column_options = []
-        if uploaded_data is not None:
-            column_options = [{'label': col, 'value': col} for col in uploaded_data.columns]
+        data = session_datasets.get(session_id)
+        if data is not None:
+            column_options = [{'label': col, 'value': col} for col in dataset_columns(data)]
         
         return [
             html.Label("Filter Column:"),
@@ -357,17 +541,19 @@ def update_process_config(process_type):
      State('filter-column', 'value'),
      State('filter-value', 'value'),
      State('stats-ops', 'value'),
-     State('clean-ops', 'value')],
+     State('clean-ops', 'value'),
+     State('session-id', 'data')],
     prevent_initial_call=True
 )
-def process_file(n_clicks, process_type, summary_type, filter_col, filter_val, stats_ops, clean_ops):
-    global uploaded_data
-    
-    if n_clicks is None or uploaded_data is None:
+def process_file(n_clicks, process_type, summary_type, filter_col, filter_val, stats_ops, clean_ops, session_id):
+    if n_clicks is None:
         raise PreventUpdate
     
+    df = session_datasets.get(session_id)
+    if df is None:
+        return None, session_expired_alert()
+    
     try:
-        df = uploaded_data.copy()
         filename = f"processed_data_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
         if process_type == 'summary':
@@ -378,7 +564,7 @@ def process_file(n_clicks, process_type, summary_type, filter_col, filter_val, s
             if not filter_col or not filter_val:
                 return None, dbc.Alert("❌ Please select a column and enter a filter value.", color="warning")
             processed_df = filter_data(df, filter_col, filter_val)
-            message = f"✅ Data filtered successfully! {len(processed_df)} rows remaining (from {len(df)} original)."
+            message = f"✅ Data filtered successfully! {len(processed_df)} rows remaining{original_rows(df)}."
             
         elif process_type == 'stats':
             processed_df = calculate_statistics(df, stats_ops)
@@ -386,7 +572,7 @@ def process_file(n_clicks, process_type, summary_type, filter_col, filter_val, s
             
         elif process_type == 'clean':
             processed_df = clean_data(df, clean_ops)
-            message = f"✅ Data cleaned successfully! {len(processed_df)} rows remaining (from {len(df)} original)."
+            message = f"✅ Data cleaned successfully! {len(processed_df)} rows remaining{original_rows(df)}."
         
         else:
             return None, dbc.Alert("❌ Invalid processing type.", color="danger")
@@ -506,13 +692,22 @@ def scatter_on_map(df, x_col, y_cols, title):
     # For scatter on map, we'll use the first two columns as lat/lon
     # and the first y column as the value to display
     if len(df.columns) < 2:
-        return "Error: Need at least 2 columns for map visualization"
+        return None
     
     # Use first two columns as latitude and longitude
     lat_col = df.columns[0]
     lon_col = df.columns[1]
     value_col = y_cols[0] if y_cols else df.columns[2] if len(df.columns) > 2 else lat_col
     
+    # Large datasets are drawn as grid cells, hovering shows how many points each holds
+    if len(df) > MAP_MAX_POINTS and value_col not in (lat_col, lon_col):
+        df, _ = grid_aggregates(lambda columns: [df[columns]], lat_col, lon_col, [value_col], MAP_MAX_POINTS)
+        points_line = 'Points: %{customdata}<br>'
+        customdata = df['points']
+    else:
+        points_line = ''
+        customdata = None
+    
     # Create scatter map using go.Scattermap
     fig = go.Figure(go.Scattermap(
         lat=df[lat_col],
@@ -526,10 +721,12 @@ def scatter_on_map(df, x_col, y_cols, title):
             colorbar=dict(title=value_col)
         ),
         text=df[value_col],
+        customdata=customdata,
         hovertemplate=f'<b>{value_col}</b><br>' +
                      f'Lat: %{{lat}}<br>' +
                      f'Lon: %{{lon}}<br>' +
                      f'Value: %{{text}}<br>' +
+                     points_line +
                      '<extra></extra>'
     ))
     
@@ -543,36 +740,71 @@ def scatter_on_map(df, x_col, y_cols, title):
         template='plotly_dark'
     )
     
-    # Show the figure in a new window
-    fig.show()
-    
-    return "Success"
+    return fig
 
 # Data processing functions
+def dataset_columns(data):
+    """Column names of a session's data, a DataFrame or the path of a CSV kept on disk"""
+    if isinstance(data, pd.DataFrame):
+        return data.columns.tolist()
+    return pd.read_csv(data, nrows=0).columns.tolist()
+
+def load_columns(data, columns):
+    """A session's DataFrame, or just ``columns`` of its CSV kept on disk"""
+    if isinstance(data, pd.DataFrame):
+        return data
+    return read_csv(data, csv_engine=CSV_ENGINE, usecols=list(dict.fromkeys(columns)))
+
+def original_rows(data):
+    """' (from N original)' for a loaded DataFrame, files on disk are never counted"""
+    return f" (from {len(data)} original)" if isinstance(data, pd.DataFrame) else ""
+
+def iter_chunks(data, columns=None):
+    """Yield DataFrame chunks of an in-memory DataFrame or of a CSV file path"""
+    if isinstance(data, pd.DataFrame):
+        if columns is not None:
+            data = data[columns]
+        for start in range(0, max(len(data), 1), STATS_CHUNK_ROWS):
+            yield data.iloc[start:start + STATS_CHUNK_ROWS]
+    else:
+        yield from iter_csv(data, STATS_CHUNK_ROWS, csv_engine=CSV_ENGINE, usecols=columns)
+
+# Statistics each summary type needs from the engine
+SUMMARY_STATISTICS = {
+    'basic': {'moments', 'minmax', 'quantiles'},
+    'quality': {'nulls', 'distinct'},
+    'columns': {'samples', 'distinct'}
+}
+
 def generate_summary_report(df, summary_type):
-    """Generate different types of summary reports"""
+    """Generate different types of summary reports (df may also be a CSV path)"""
+    stats = summarize_columns(iter_chunks(df), SUMMARY_STATISTICS[summary_type])
+    
     if summary_type == 'basic':
-        # Basic statistics for numeric columns
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        summary = df[numeric_cols].describe()
+        # Basic statistics for numeric columns, laid out like DataFrame.describe()
+        summary = pd.DataFrame({
+            col_stats.name: [col_stats.count, col_stats.mean_value(), col_stats.std(),
+                             col_stats.min, col_stats.quantile(0.25), col_stats.quantile(0.5),
+                             col_stats.quantile(0.75), col_stats.max]
+            for col_stats in stats if col_stats.numeric
+        }, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
         return summary.reset_index()
     
     elif summary_type == 'quality':
         # Data quality report
         quality_report = []
-        for col in df.columns:
-            total_rows = len(df)
-            null_count = df[col].isnull().sum()
-            null_percent = (null_count / total_rows) * 100
-            unique_count = df[col].nunique()
+        for col_stats in stats:
+            total_rows = col_stats.rows
+            null_count = col_stats.nulls
+            null_percent = (null_count / total_rows) * 100 if total_rows else 0.0
             
             quality_report.append({
-                'Column': col,
+                'Column': col_stats.name,
                 'Total_Rows': total_rows,
                 'Null_Count': null_count,
                 'Null_Percentage': round(null_percent, 2),
-                'Unique_Values': unique_count,
-                'Data_Type': str(df[col].dtype)
+                'Unique_Values': col_stats.distinct(),
+                'Data_Type': str(col_stats.dtype)
             })
         
         return pd.DataFrame(quality_report)
@@ -580,18 +812,20 @@ def generate_summary_report(df, summary_type):
     elif summary_type == 'columns':
         # Column analysis
         col_analysis = []
-        for col in df.columns:
+        for col_stats in stats:
             col_analysis.append({
-                'Column': col,
-                'Data_Type': str(df[col].dtype),
-                'Sample_Values': ', '.join([str(x) for x in df[col].head(3).tolist()]),
-                'Unique_Count': df[col].nunique()
+                'Column': col_stats.name,
+                'Data_Type': str(col_stats.dtype),
+                'Sample_Values': ', '.join([str(x) for x in col_stats.samples]),
+                'Unique_Count': col_stats.distinct()
             })
         
         return pd.DataFrame(col_analysis)
 
 def filter_data(df, column, value):
-    """Filter data based on column and value"""
+    """Filter data based on column and value (df may also be a CSV path, filtered chunk by chunk)"""
+    if not isinstance(df, pd.DataFrame):
+        return pd.concat([filter_data(chunk, column, value) for chunk in iter_chunks(df)], ignore_index=True)
     try:
         # Try to convert value to numeric if the column is numeric
         if df[column].dtype in ['int64', 'float64']:
@@ -605,30 +839,42 @@ def filter_data(df, column, value):
         return filtered_df
 
 def calculate_statistics(df, operations):
-    """Calculate statistical measures"""
-    numeric_cols = df.select_dtypes(include=['number']).columns
+    """Calculate statistical measures (df may also be a CSV path)"""
+    statistics = set()
+    if 'mean' in operations or 'std' in operations:
+        statistics.add('moments')
+    if 'median' in operations:
+        statistics.add('quantiles')
+    if 'minmax' in operations:
+        statistics.add('minmax')
     stats_data = []
     
-    for col in numeric_cols:
-        col_stats = {'Column': col}
+    for column in summarize_columns(iter_chunks(df), statistics):
+        if not column.numeric:
+            continue
+        col_stats = {'Column': column.name}
         
         if 'mean' in operations:
-            col_stats['Mean'] = df[col].mean()
+            col_stats['Mean'] = column.mean_value()
         if 'median' in operations:
-            col_stats['Median'] = df[col].median()
+            col_stats['Median'] = column.quantile(0.5)
         if 'std' in operations:
-            col_stats['Standard_Deviation'] = df[col].std()
+            col_stats['Standard_Deviation'] = column.std()
         if 'minmax' in operations:
-            col_stats['Min'] = df[col].min()
-            col_stats['Max'] = df[col].max()
+            col_stats['Min'] = column.min
+            col_stats['Max'] = column.max
         
         stats_data.append(col_stats)
     
     return pd.DataFrame(stats_data)
 
 def clean_data(df, operations):
-    """Clean data based on selected operations"""
-    cleaned_df = df.copy()
+    """Clean data based on selected operations (df may also be a CSV path)"""
+    if not isinstance(df, pd.DataFrame):
+        # Duplicates can be anywhere in the file, so cleaning reads all of it
+        df = read_csv(df, csv_engine=CSV_ENGINE)
+    # Shallow under copy-on-write, columns are only copied when modified
+    cleaned_df = df.copy(deep=False)
     
     if 'duplicates' in operations:
         cleaned_df = cleaned_df.drop_duplicates()
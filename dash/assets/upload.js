@@ -0,0 +1,93 @@
+// Streams the chosen file to the server's /upload route as the raw request
+// body instead of letting dcc.Upload base64-encode it into a callback, then
+// hands the upload callback a handle to the stored file via the
+// upload-handle store.
+(function () {
+    const ACCEPTED_TYPES = '.csv,.txt,.log,.json,.zip';
+    let fileInput = null;
+
+    function uploadUrl(filename) {
+        const config = JSON.parse(document.getElementById('_dash-config').textContent);
+        const prefix = config.requests_pathname_prefix || '/';
+        return prefix + 'upload?filename=' + encodeURIComponent(filename);
+    }
+
+    function showProgress(message) {
+        dash_clientside.set_props('upload-progress', {children: message});
+    }
+
+    function uploadFile(file) {
+        const xhr = new XMLHttpRequest();
+        xhr.open('POST', uploadUrl(file.name));
+        xhr.setRequestHeader('Content-Type', 'application/octet-stream');
+
+        xhr.upload.onprogress = function (event) {
+            if (event.lengthComputable) {
+                const percent = Math.round((event.loaded / event.total) * 100);
+                showProgress(`Uploading ${file.name}... ${percent}%`);
+            }
+        };
+        xhr.onload = function () {
+            let result = {};
+            try {
+                result = JSON.parse(xhr.responseText);
+            } catch (e) {
+                result = {};
+            }
+            showProgress('');
+            if (xhr.status !== 200) {
+                result = {error: result.error || `Upload failed (HTTP ${xhr.status})`};
+            }
+            dash_clientside.set_props('upload-handle', {data: result});
+        };
+        xhr.onerror = function () {
+            showProgress('');
+            dash_clientside.set_props('upload-handle', {data: {error: 'Upload failed: network error'}});
+        };
+
+        showProgress(`Uploading ${file.name}... 0%`);
+        xhr.send(file);
+    }
+
+    function chooseFile() {
+        if (!fileInput) {
+            fileInput = document.createElement('input');
+            fileInput.type = 'file';
+            fileInput.accept = ACCEPTED_TYPES;
+            fileInput.style.display = 'none';
+            fileInput.addEventListener('change', function () {
+                if (fileInput.files.length) {
+                    uploadFile(fileInput.files[0]);
+                }
+                // Allow picking the same file again
+                fileInput.value = '';
+            });
+            document.body.appendChild(fileInput);
+        }
+        fileInput.click();
+    }
+
+    // The layout is rendered by React after load, so listen on the document
+    function dropZone(event) {
+        return event.target.closest && event.target.closest('#upload-data');
+    }
+
+    document.addEventListener('click', function (event) {
+        if (dropZone(event)) {
+            chooseFile();
+        }
+    });
+    document.addEventListener('dragover', function (event) {
+        if (dropZone(event)) {
+            event.preventDefault();
+        }
+    });
+    document.addEventListener('drop', function (event) {
+        if (dropZone(event)) {
+            event.preventDefault();
+            if (event.dataTransfer.files.length) {
+                uploadFile(event.dataTransfer.files[0]);
+            }
+        }
+    });
+})();
@@ -61,7 +61,9 @@ echo.
 echo Press Ctrl+C to stop the server
 echo.
 
-REM Start the application
+REM Start the application, with the modules it shares with the Flask app
+REM (repository root) importable
+set PYTHONPATH=%~dp0..;%PYTHONPATH%
 python app.py
 
 pause
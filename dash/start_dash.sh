@@ -67,5 +67,7 @@ echo ""
 echo "Press Ctrl+C to stop the server"
 echo ""
 
-# Start the application
+# Start the application, with the modules it shares with the Flask app
+# (repository root) importable
+export PYTHONPATH="$(cd .. && pwd)${PYTHONPATH:+:$PYTHONPATH}"
 python app.py
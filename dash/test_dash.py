@@ -4,8 +4,10 @@ Test script for the Dash Graphing Tool
 This script verifies that all dependencies are available and the app can start
 """
 
+import os
 import sys
 import importlib
+import importlib.util
 
 def test_imports():
     """Test if all required packages can be imported"""
@@ -39,7 +41,10 @@ def test_imports():
 def test_app_creation():
     """Test if the Dash app can be created"""
     try:
-        from app import app
+        # By path, the Flask app.py at the repository root is also named app
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+        spec = importlib.util.spec_from_file_location('dash_app', path)
+        spec.loader.exec_module(importlib.util.module_from_spec(spec))
         print("✅ Dash app created successfully!")
         return True
     except Exception as e:
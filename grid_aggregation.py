@@ -0,0 +1,117 @@
+"""
+Per-bucket aggregates built chunk by chunk, and map point thinning on a
+lat/lon grid.
+
+BucketStats keeps count/sum/min/max per bucket for one column and is fed
+chunk by chunk, so aggregates can be built from a file streamed from disk
+as well as from a loaded DataFrame. grid_aggregates uses it to thin map
+points onto a lat/lon grid: one row per occupied cell at the mean position
+of its points, with the mean of the value columns and the point count.
+Text value columns (e.g. a categorical colour) get their most frequent value
+per cell from BucketMode instead.
+"""
+import numpy as np
+import pandas as pd
+
+
+class BucketStats:
+    """count/sum/min/max per bucket for one value column, merged chunk by chunk"""
+
+    def __init__(self, n_buckets):
+        self.count = np.zeros(n_buckets, dtype=np.int64)
+        self.total = np.zeros(n_buckets)
+        self.min = np.full(n_buckets, np.inf)
+        self.max = np.full(n_buckets, -np.inf)
+
+    def add(self, buckets, values):
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        grouped = pd.Series(values[valid]).groupby(buckets[valid]).agg(['count', 'sum', 'min', 'max'])
+        index = grouped.index.to_numpy()
+        self.count[index] += grouped['count'].to_numpy()
+        self.total[index] += grouped['sum'].to_numpy()
+        self.min[index] = np.minimum(self.min[index], grouped['min'].to_numpy())
+        self.max[index] = np.maximum(self.max[index], grouped['max'].to_numpy())
+
+    def columns(self, name, keep):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.total / self.count
+        empty = self.count == 0
+        return {
+            name: np.where(empty, np.nan, mean)[keep],
+            f'{name}_min': np.where(empty, np.nan, self.min)[keep],
+            f'{name}_max': np.where(empty, np.nan, self.max)[keep],
+            f'{name}_count': self.count[keep]
+        }
+
+
+class BucketMode:
+    """Most frequent value per bucket for one text column, merged chunk by chunk"""
+
+    def __init__(self, n_buckets):
+        self.n_buckets = n_buckets
+        self.counts = pd.Series(dtype=np.int64)
+
+    def add(self, buckets, values):
+        values = pd.Series(values)
+        valid = values.notna().to_numpy()
+        counts = values[valid].groupby([buckets[valid], values[valid].to_numpy()]).size()
+        self.counts = self.counts.add(counts, fill_value=0) if len(self.counts) else counts
+
+    def columns(self, name, keep):
+        mode = np.full(self.n_buckets, None, dtype=object)
+        if len(self.counts):
+            # Highest count first, so the first row of each bucket is its mode
+            top = self.counts.sort_values(ascending=False, kind='stable')
+            top = top[~top.index.get_level_values(0).duplicated()]
+            mode[top.index.get_level_values(0).to_numpy()] = top.index.get_level_values(1).to_numpy()
+        return {name: mode[keep]}
+
+
+def grid_aggregates(read_chunks, lat_col, lon_col, value_cols, n_cells):
+    """Points per lat/lon grid cell with the mean of value_cols (the mode of text ones).
+
+    ``read_chunks(columns)`` yields DataFrame chunks of those columns and is
+    called twice, once for the extent and once for the cells, so the data can
+    be a file streamed from disk as well as a loaded DataFrame.
+    """
+    columns = list(dict.fromkeys([lat_col, lon_col] + value_cols))
+    extent = np.array([np.inf, -np.inf, np.inf, -np.inf])
+    for chunk in read_chunks([lat_col, lon_col]):
+        lat = pd.to_numeric(chunk[lat_col], errors='coerce')
+        lon = pd.to_numeric(chunk[lon_col], errors='coerce')
+        extent = [min(extent[0], lat.min()), max(extent[1], lat.max()),
+                  min(extent[2], lon.min()), max(extent[3], lon.max())]
+    if not np.all(np.isfinite(extent)):
+        raise ValueError('No valid coordinates to aggregate')
+
+    side = max(int(np.sqrt(n_cells)), 1)
+    lat_width = (extent[1] - extent[0]) / side or 1.0
+    lon_width = (extent[3] - extent[2]) / side or 1.0
+    n_buckets = side * side
+    # Mean position of the points in a cell looks better than the cell centre
+    stats = {col: BucketStats(n_buckets) for col in [lat_col, lon_col]}
+    rows = 0
+    for chunk in read_chunks(columns):
+        for name in value_cols:
+            if name not in stats:
+                numeric = pd.api.types.is_numeric_dtype(chunk[name]) and not pd.api.types.is_bool_dtype(chunk[name])
+                stats[name] = (BucketStats if numeric else BucketMode)(n_buckets)
+        rows += len(chunk)
+        lat = pd.to_numeric(chunk[lat_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        lon = pd.to_numeric(chunk[lon_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        row = np.minimum(((lat[valid] - extent[0]) / lat_width).astype(np.int64), side - 1)
+        col = np.minimum(((lon[valid] - extent[2]) / lon_width).astype(np.int64), side - 1)
+        buckets = row * side + col
+        for name in stats:
+            stats[name].add(buckets, chunk[name].to_numpy()[valid])
+
+    keep = stats[lat_col].count > 0
+    data = {}
+    for name in value_cols:
+        data[name] = stats[name].columns(name, keep)[name]
+    data[lat_col] = stats[lat_col].columns(lat_col, keep)[lat_col]
+    data[lon_col] = stats[lon_col].columns(lon_col, keep)[lon_col]
+    data['points'] = stats[lat_col].count[keep]
+    return pd.DataFrame(data), rows
@@ -0,0 +1,41 @@
+"""
+Picks the SVG or WebGL renderer for a Plotly figure from its point count.
+
+Builders always produce plain Scatter traces. apply_render_mode swaps them
+for Scattergl afterwards when the figure is large enough, so every graph
+type gets the WebGL path without changes of its own.
+"""
+import plotly.graph_objects as go
+
+# =============================================================================
+# WEBGL CONFIGURATION
+# =============================================================================
+# SVG scatter traces get sluggish in the browser past a few tens of thousands
+# of points, so figures rendering more than WEBGL_POINT_THRESHOLD points in
+# total switch to Scattergl when the render mode is 'auto'.
+# =============================================================================
+WEBGL_POINT_THRESHOLD = 20000
+
+
+def apply_render_mode(fig, render_mode=None, threshold=None):
+    """Convert the figure's scatter traces to Scattergl when it is large enough.
+
+    ``render_mode`` is 'auto' (the default), 'webgl' or 'svg'; ``threshold``
+    moves the point count where 'auto' switches to WebGL. Styling and axis
+    assignment (yaxis='y2', subplot axes) carry over as is.
+    """
+    render_mode = render_mode or 'auto'
+    threshold = int(threshold or WEBGL_POINT_THRESHOLD)
+    scatter = [trace for trace in fig.data if trace.type == 'scatter']
+    points = sum(len(trace.y) for trace in scatter if trace.y is not None)
+    if not scatter or render_mode == 'svg' or (render_mode == 'auto' and points < threshold):
+        return fig
+
+    data = []
+    for trace in fig.data:
+        if trace.type == 'scatter':
+            props = trace.to_plotly_json()
+            props.pop('type')
+            trace = go.Scattergl(props)
+        data.append(trace)
+    return go.Figure(data=data, layout=fig.layout)
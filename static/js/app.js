@@ -2,6 +2,27 @@
 let uploadedFile = null;
 let csvData = null;
 let currentGraph = null;
+let currentGraphRequest = null;
+let windowRequestTimer = null;
+let windowRequestSeq = 0;
+let currentMapRequest = null;
+let mapRequestTimer = null;
+let mapRequestSeq = 0;
+let liveTail = null;
+
+// Uploads are sent in checksummed chunks through the resumable upload endpoints
+const UPLOAD_PARALLEL_CHUNKS = 4;
+const UPLOAD_CHUNK_RETRIES = 5;
+
+// Graph types /graph_window can re-decimate on zoom
+const WINDOWED_GRAPH_TYPES = ['scatter', 'single_line', 'dual_line'];
+// Rendered figures by request, reused when /generate_graph answers 304
+const graphCache = new Map();
+const GRAPH_CACHE_ENTRIES = 5;
+// Graph types whose columns come from a fixed log format rather than the column pickers
+const LOG_GRAPH_TYPES = ['ping', 'iperf_tcp', 'iperf_udp'];
+// Graph types the server can extend as their file grows (see /tail)
+const TAIL_GRAPH_TYPES = ['ping', 'single_line', 'dual_line'];
 
 // DOM elements
 const uploadArea = document.getElementById('uploadArea');
@@ -74,24 +95,22 @@ async function handleFileUpload(file) {
     }
 
     showLoading(true);
-    
-    const formData = new FormData();
-    formData.append('file', file);
 
     try {
-        const response = await fetch('/upload', {
-            method: 'POST',
-            body: formData
-        });
-
-        const result = await response.json();
+        const result = await uploadFileChunked(file);
 
         if (result.success) {
             uploadedFile = result.filename;
-            if (result.file_type === 'csv') {
+            if (result.columns) {
                 csvData = result;
                 const fileType = result.file_type ? result.file_type.toUpperCase() : 'CSV';
-                showNotification(`${fileType} file uploaded successfully! Found ${result.row_count} rows and ${result.columns.length} columns.`, 'success');
+                if (result.row_count_pending) {
+                    const members = result.member_count ? ` across ${result.member_count} CSV files` : '';
+                    showNotification(`${fileType} file uploaded successfully! Found ${result.columns.length} columns${members}, counting rows...`, 'success');
+                    pollDatasetInfo(result.filename);
+                } else {
+                    showNotification(`${fileType} file uploaded successfully! Found ${result.row_count} rows and ${result.columns.length} columns.`, 'success');
+                }
                 showConfigSection();
                 populateColumnDropdowns();
             } else {
@@ -116,6 +135,154 @@ async function handleFileUpload(file) {
     }
 }
 
+// Upload a file in checksummed chunks, several in parallel, resuming a
+// previous attempt of the same file if the server still has its chunks
+async function uploadFileChunked(file) {
+    const resumeKey = `upload:${file.name}:${file.size}:${file.lastModified}`;
+    let upload = null;
+
+    const previousId = localStorage.getItem(resumeKey);
+    if (previousId) {
+        const response = await fetch(`/upload/${previousId}`);
+        if (response.ok) {
+            upload = await response.json();
+        }
+    }
+
+    if (!upload) {
+        const response = await fetch('/upload/init', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ filename: file.name, size: file.size })
+        });
+        upload = await response.json();
+        if (!upload.success) {
+            return upload;
+        }
+        localStorage.setItem(resumeKey, upload.upload_id);
+    }
+
+    const received = new Set(upload.received);
+    const pending = [];
+    for (let index = 0; index < upload.total_chunks; index++) {
+        if (!received.has(index)) pending.push(index);
+    }
+    if (received.size > 0) {
+        showNotification(`Resuming upload: ${received.size} of ${upload.total_chunks} chunks already on the server.`, 'info');
+    }
+
+    let done = received.size;
+    setLoadingText(`Uploading... ${Math.floor(100 * done / upload.total_chunks)}%`);
+
+    async function worker() {
+        while (pending.length > 0) {
+            const index = pending.shift();
+            await uploadChunk(file, upload, index);
+            done++;
+            setLoadingText(`Uploading... ${Math.floor(100 * done / upload.total_chunks)}%`);
+        }
+    }
+    const workers = [];
+    for (let i = 0; i < UPLOAD_PARALLEL_CHUNKS; i++) {
+        workers.push(worker());
+    }
+    await Promise.all(workers);
+
+    setLoadingText('Processing your data...');
+    const response = await fetch(`/upload/${upload.upload_id}/finalize`, { method: 'POST' });
+    const result = await response.json();
+    if (result.success) {
+        localStorage.removeItem(resumeKey);
+    }
+    return result;
+}
+
+async function uploadChunk(file, upload, index) {
+    const start = index * upload.chunk_size;
+    const buffer = await file.slice(start, start + upload.chunk_size).arrayBuffer();
+    const checksum = crc32(new Uint8Array(buffer)).toString(16).padStart(8, '0');
+
+    let lastError = null;
+    for (let attempt = 1; attempt <= UPLOAD_CHUNK_RETRIES; attempt++) {
+        let response = null;
+        try {
+            response = await fetch(`/upload/${upload.upload_id}/chunk/${index}`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-Chunk-CRC32': checksum
+                },
+                body: buffer
+            });
+        } catch (error) {
+            // Network failure, retry below
+            lastError = error;
+        }
+
+        if (response) {
+            if (response.ok) return;
+            const result = await response.json().catch(() => ({}));
+            lastError = new Error(result.error || `Chunk ${index} upload failed (${response.status})`);
+            if (response.status === 404) throw lastError;
+        }
+
+        if (attempt < UPLOAD_CHUNK_RETRIES) {
+            // Back off before retrying, e.g. while Wi-Fi reconnects
+            await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** (attempt - 1)));
+        }
+    }
+    throw lastError;
+}
+
+// CRC32 (IEEE) to match zlib.crc32 on the server
+const CRC32_TABLE = (() => {
+    const table = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+        let c = n;
+        for (let k = 0; k < 8; k++) {
+            c = c & 1 ? 0xEDB88320 ^ (c >>> 1) : c >>> 1;
+        }
+        table[n] = c >>> 0;
+    }
+    return table;
+})();
+
+function crc32(bytes) {
+    let crc = 0xFFFFFFFF;
+    for (let i = 0; i < bytes.length; i++) {
+        crc = CRC32_TABLE[(crc ^ bytes[i]) & 0xFF] ^ (crc >>> 8);
+    }
+    return (crc ^ 0xFFFFFFFF) >>> 0;
+}
+
+// Poll the background row count of an upload until it is ready
+async function pollDatasetInfo(filename) {
+    while (uploadedFile === filename) {
+        try {
+            const response = await fetch(`/dataset_info/${encodeURIComponent(filename)}`);
+            const info = await response.json();
+
+            if (info.status === 'ready') {
+                if (csvData && csvData.filename === filename) {
+                    csvData.row_count = info.row_count;
+                }
+                showNotification(`Row count complete: ${info.row_count.toLocaleString()} rows.`, 'info');
+                return;
+            }
+            if (info.status === 'error' || info.error) {
+                showNotification('Error scanning file: ' + info.error, 'error');
+                return;
+            }
+        } catch (error) {
+            showNotification('Error checking upload status: ' + error.message, 'error');
+            return;
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 // Show configuration section
 function showConfigSection() {
     uploadSection.style.display = 'none';
@@ -206,6 +373,20 @@ function populateMapDropdowns() {
     });
 }
 
+// Populate the CSV joiner key dropdown (the zip source column is not a key)
+function populateJoinDropdown() {
+    if (!csvData || !csvData.columns) return;
+
+    const joinSelect = document.getElementById('joinColumn');
+    joinSelect.innerHTML = '<option value="">Select Join Column</option>';
+    csvData.columns.filter(column => column !== 'source_file').forEach(column => {
+        const option = document.createElement('option');
+        option.value = column;
+        option.textContent = column;
+        joinSelect.appendChild(option);
+    });
+}
+
 // Create form group
 function createFormGroup(label, id, options) {
     const group = document.createElement('div');
@@ -288,6 +469,7 @@ function updateConfigFields() {
     const axisRangeConfig = document.getElementById('axisRangeConfig');
     
     const scatterMapConfig = document.getElementById('scatterMapConfig');
+    const csvJoinerConfig = document.getElementById('csvJoinerConfig');
     const y2Group = document.getElementById('y2Group');
     const y2TitleGroup = document.getElementById('y2TitleGroup');
     const y2MinGroup = document.getElementById('y2MinGroup');
@@ -301,6 +483,7 @@ function updateConfigFields() {
         stylingConfig.style.display = 'none';
         axisRangeConfig.style.display = 'none';
         scatterMapConfig.style.display = 'none';
+        csvJoinerConfig.style.display = 'none';
 
         return;
     }
@@ -314,14 +497,32 @@ function updateConfigFields() {
         stylingConfig.style.display = 'none';
         axisRangeConfig.style.display = 'none';
         scatterMapConfig.style.display = 'block';
+        csvJoinerConfig.style.display = 'none';
         populateMapDropdowns();
 
+    } else if (LOG_GRAPH_TYPES.includes(graphType)) {
+        // Ping and iperf plots only need styling, columns come from the log format
+        columnSelection.style.display = 'none';
+        stylingConfig.style.display = 'block';
+        axisRangeConfig.style.display = 'none';
+        scatterMapConfig.style.display = 'none';
+        csvJoinerConfig.style.display = 'none';
+
+    } else if (graphType === 'csv_joiner') {
+        columnSelection.style.display = 'none';
+        stylingConfig.style.display = 'none';
+        axisRangeConfig.style.display = 'none';
+        scatterMapConfig.style.display = 'none';
+        csvJoinerConfig.style.display = 'block';
+        populateJoinDropdown();
+
     } else {
         // Show standard config sections for other graph types
         columnSelection.style.display = 'block';
         stylingConfig.style.display = 'block';
         axisRangeConfig.style.display = 'block';
         scatterMapConfig.style.display = 'none';
+        csvJoinerConfig.style.display = 'none';
 
     }
 
@@ -367,33 +568,86 @@ async function generateGraph() {
     if (!validateConfig(config, graphType)) {
         return;
     }
+    if (document.getElementById('liveMode').value === 'tail' && TAIL_GRAPH_TYPES.includes(graphType)) {
+        // Drawn from the complete lines the server's tail has parsed, see startLiveTail
+        config.live = true;
+    }
 
+    stopLiveTail();
     showLoading(true);
 
     try {
-        const response = await fetch('/generate_graph', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                filename: uploadedFile,
-                graph_type: graphType,
-                config: config
-            })
+        const requestKey = JSON.stringify([uploadedFile, graphType, config]);
+        const body = JSON.stringify({
+            filename: uploadedFile,
+            graph_type: graphType,
+            config: config
         });
+        const cached = graphCache.get(requestKey);
+        let response = await requestGraph(body, cached && cached.etag);
+        if (response.status === 304 && !(cached && cached.result)) {
+            // Nothing to reuse (the browser may revalidate on its own), ask for the graph itself
+            response = await requestGraph(body, null);
+        }
 
-        const result = await response.json();
+        let result;
+        if (response.status === 304) {
+            // Same dataset version and config as a graph we already have
+            result = cached.result;
+        } else {
+            result = await response.json();
+
+            // Rendering runs as a background job on the server
+            if (result.success && result.job_id) {
+                const etag = result.etag;
+                result = await waitForJob(result.job_id);
+                if (result.success && result.graph && etag) {
+                    cacheGraphResult(requestKey, etag, result);
+                }
+            }
+        }
 
         if (result.success) {
-            if (result.message) {
-                // For scatter maps, show the success message
-                showNotification(result.message, 'success');
+            if (result.dataset) {
+                // CSV joiner output becomes the active dataset for graphing
+                uploadedFile = result.dataset.filename;
+                csvData = result.dataset;
+                populateColumnDropdowns();
+                document.getElementById('graphType').value = '';
+                updateConfigFields();
+                showNotification(`${result.message}. Select a graph type to plot it.`, 'success');
             } else if (result.graph) {
                 // For regular graphs, display the graph
-                currentGraph = JSON.parse(result.graph);
+                currentGraph = decodeTypedArrays(result.graph);
+                // Only downsampled column graphs need fresh data from the server on zoom
+                // Aggregated (out-of-core) graphs keep their buckets when zooming
+                currentGraphRequest = (WINDOWED_GRAPH_TYPES.includes(graphType) && !result.aggregated &&
+                                       result.point_counts && result.point_counts.decimated)
+                    ? { filename: uploadedFile, graph_type: graphType, config: config }
+                    : null;
+                // Maps fetch the points in view from /map_tiles as the user pans,
+                // unless the server kept the first render (categorical colours)
+                currentMapRequest = graphType === 'scatter_on_map' && result.map_tiles
+                    ? { filename: uploadedFile, config: config }
+                    : null;
                 displayGraph(currentGraph);
                 showNotification('Graph generated successfully!', 'success');
+                if (document.getElementById('liveMode').value === 'tail') {
+                    if (TAIL_GRAPH_TYPES.includes(graphType) && !result.aggregated && result.source_bytes !== undefined) {
+                        startLiveTail(graphType, config, result.source_bytes);
+                    } else {
+                        showNotification('Live updates are available for line, dual line and ping graphs that are not aggregated.', 'info');
+                    }
+                }
+                if (graphType === 'scatter_on_map') {
+                    if (result.point_counts && result.point_counts.decimated) {
+                        showNotification(`Map thinned: ${result.point_counts.rendered.toLocaleString()} grid cells summarising ${result.point_counts.original.toLocaleString()} points.`, 'info');
+                    }
+                } else if (result.aggregated) {
+                    showNotification(`Large file: showing min/max/mean of ${result.point_counts.original.toLocaleString()} points per x interval.`, 'info');
+                } else if (result.point_counts && result.point_counts.decimated) {
+                    showNotification(`Reduced view: showing ${result.point_counts.rendered.toLocaleString()} of ${result.point_counts.original.toLocaleString()} points.`, 'info');
+                }
             }
         } else {
             showNotification(result.error || 'Failed to generate graph', 'error');
@@ -405,6 +659,59 @@ async function generateGraph() {
     }
 }
 
+// Poll a background job, mirroring its progress under the spinner
+const JOB_PHASE_LABELS = {
+    queued: 'Waiting for a worker',
+    starting: 'Starting',
+    parse: 'Reading data',
+    decimate: 'Building traces',
+    serialize: 'Preparing graph',
+    join: 'Joining files',
+    aggregate: 'Aggregating large file'
+};
+
+// POST /generate_graph, conditional on the ETag of a graph we hold
+function requestGraph(body, etag) {
+    const headers = {
+        'Content-Type': 'application/json',
+    };
+    if (etag) {
+        headers['If-None-Match'] = `"${etag}"`;
+    }
+    return fetch('/generate_graph', {
+        method: 'POST',
+        headers: headers,
+        body: body
+    });
+}
+
+function cacheGraphResult(requestKey, etag, result) {
+    graphCache.delete(requestKey);
+    graphCache.set(requestKey, { etag: etag, result: result });
+    // Map keeps insertion order, so the first key is the oldest
+    while (graphCache.size > GRAPH_CACHE_ENTRIES) {
+        graphCache.delete(graphCache.keys().next().value);
+    }
+}
+
+async function waitForJob(jobId) {
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}`);
+        const job = await response.json();
+
+        if (job.status === 'done') {
+            return job.result;
+        }
+        if (job.status === 'error' || job.error) {
+            return { success: false, error: job.error };
+        }
+
+        const label = JOB_PHASE_LABELS[job.phase] || 'Processing';
+        setLoadingText(`${label}... ${job.percent}%`);
+        await new Promise(resolve => setTimeout(resolve, 300));
+    }
+}
+
 // Get graph configuration from form
 function getGraphConfig() {
     const graphType = document.getElementById('graphType').value;
@@ -421,10 +728,32 @@ function getGraphConfig() {
             hover_columns: getSelectedValues('hoverColumns'),
             color_column: document.getElementById('colorColumn').value,
             size_column: document.getElementById('sizeColumn').value,
+            tile_mode: document.getElementById('mapTileMode').value,
             light_mode: document.getElementById('lightMode').checked
         };
     }
     
+    // Handle Ping and iperf Plot configuration
+    if (LOG_GRAPH_TYPES.includes(graphType)) {
+        return {
+            title: document.getElementById('title').value,
+            x_title: document.getElementById('xTitle').value,
+            y_title: document.getElementById('yTitle').value,
+            max_points: getNumberValue('maxPoints'),
+            render_mode: document.getElementById('renderMode').value,
+            light_mode: document.getElementById('lightMode').checked
+        };
+    }
+    
+        // Handle CSV Joiner configuration
+    if (graphType === 'csv_joiner') {
+        return {
+            join_column: document.getElementById('joinColumn').value,
+            direction: document.getElementById('joinDirection').value,
+            tolerance: document.getElementById('joinTolerance').value
+        };
+    }
+    
     // Standard configuration for other graph types
     const config = {
         title: document.getElementById('title').value,
@@ -436,6 +765,9 @@ function getGraphConfig() {
         x_max: getNumberValue('xMax'),
         y_min: getNumberValue('yMin'),
         y_max: getNumberValue('yMax'),
+        max_points: getNumberValue('maxPoints'),
+        render_mode: document.getElementById('renderMode').value,
+        aggregate: document.getElementById('aggregateMode').value,
         light_mode: document.getElementById('lightMode').checked
     };
 
@@ -485,6 +817,41 @@ function validateConfig(config, graphType) {
         return true;
     }
     
+    // Handle Ping Plot validation
+    if (graphType === 'ping') {
+        if (!['log', 'txt'].includes(csvData.file_type)) {
+            showNotification('Ping Plot needs a .log or .txt file of ping output', 'error');
+            return false;
+        }
+        
+        return true;
+    }
+    
+    // Handle iperf Plot validation
+    if (graphType === 'iperf_tcp' || graphType === 'iperf_udp') {
+        if (csvData.file_type !== 'json') {
+            showNotification('iperf Plots need the .json output of iperf3 --json', 'error');
+            return false;
+        }
+        
+        return true;
+    }
+    
+        // Handle CSV Joiner validation
+    if (graphType === 'csv_joiner') {
+        if (csvData.file_type !== 'zip') {
+            showNotification('CSV Joiner needs a zip file containing the CSVs to join', 'error');
+            return false;
+        }
+
+        if (!config.join_column) {
+            showNotification('Please select a join column', 'error');
+            return false;
+        }
+        
+        return true;
+    }
+    
     // Standard validation for other graph types
     if (!config.x_column) {
         showNotification('Please select an X-axis column', 'error');
@@ -505,6 +872,46 @@ function validateConfig(config, graphType) {
 }
 
 // Display graph
+// Typed arrays for the {dtype, bdata} arrays the server encodes (little endian)
+const TYPED_ARRAYS = {
+    i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+    i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array
+};
+
+function decodeBase64Array(encoded) {
+    const binary = atob(encoded.bdata);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new TYPED_ARRAYS[encoded.dtype](bytes.buffer);
+}
+
+// Replace encoded arrays anywhere in a figure (or part of one) in place
+function decodeTypedArrays(value) {
+    if (Array.isArray(value)) {
+        for (let i = 0; i < value.length; i++) {
+            if (value[i] !== null && typeof value[i] === 'object') {
+                value[i] = decodeTypedArrays(value[i]);
+            }
+        }
+        return value;
+    }
+    if (ArrayBuffer.isView(value)) {
+        // Already decoded, e.g. a figure reused from graphCache
+        return value;
+    }
+    if (value !== null && typeof value === 'object') {
+        if (typeof value.bdata === 'string' && TYPED_ARRAYS[value.dtype]) {
+            return decodeBase64Array(value);
+        }
+        for (const key of Object.keys(value)) {
+            value[key] = decodeTypedArrays(value[key]);
+        }
+    }
+    return value;
+}
+
 function displayGraph(graphData) {
     const graphDisplay = document.getElementById('graphDisplay');
     
@@ -514,13 +921,171 @@ function displayGraph(graphData) {
     // Show graph section
     graphSection.style.display = 'block';
     
+    // Plotly keeps and mutates what it is given (zoom restyles, autorange),
+    // copy so figures held in graphCache stay as the server sent them
+    const data = graphData.data.map(trace => Object.assign({}, trace));
+    const layout = JSON.parse(JSON.stringify(graphData.layout));
+
     // Render the graph
-    Plotly.newPlot(graphDisplay, graphData.data, graphData.layout, {
+    Plotly.newPlot(graphDisplay, data, layout, {
         responsive: true,
         displayModeBar: true,
         modeBarButtonsToRemove: ['pan2d', 'lasso2d', 'select2d'],
         displaylogo: false
     });
+
+    graphDisplay.on('plotly_relayout', handleGraphRelayout);
+}
+
+// Follow a file that is still being written: the server streams the rows
+// appended after the bytes the render covered and they are added to the plot
+function startLiveTail(graphType, config, sinceBytes) {
+    const params = new URLSearchParams({
+        graph_type: graphType,
+        config: JSON.stringify(config),
+        since: sinceBytes
+    });
+    const source = new EventSource(`/tail/${encodeURIComponent(uploadedFile)}?${params}`);
+    source.addEventListener('extend', event => extendGraph(JSON.parse(event.data)));
+    source.addEventListener('reset', () => {
+        stopLiveTail();
+        showNotification('File was truncated, rendering it again.', 'info');
+        generateGraph();
+    });
+    source.onerror = () => {
+        // A reconnect would resend rows from the render's offset, so stop instead
+        if (liveTail === source) {
+            stopLiveTail();
+            showNotification('Live updates stopped. Generate the graph again to resume.', 'warning');
+        }
+    };
+    liveTail = source;
+}
+
+function stopLiveTail() {
+    if (liveTail) {
+        liveTail.close();
+        liveTail = null;
+    }
+}
+
+function extendGraph(update) {
+    const graphDisplay = document.getElementById('graphDisplay');
+    if (!graphDisplay.data) return;
+
+    update.indices.forEach(index => {
+        const trace = graphDisplay.data[index];
+        ['x', 'y'].forEach(key => {
+            // Integer typed arrays from the render are sized to its values
+            if (ArrayBuffer.isView(trace[key]) && !(trace[key] instanceof Float64Array)) {
+                trace[key] = Float64Array.from(trace[key]);
+            }
+        });
+    });
+    const gaps = values => values.map(value => value === null ? NaN : value);
+    Plotly.extendTraces(graphDisplay, {
+        x: update.x.map(gaps),
+        y: update.y.map(gaps)
+    }, update.indices, update.max_points);
+}
+
+// Re-fetch decimated traces for the visible x-range after zoom/reset
+function handleGraphRelayout(eventData) {
+    if (currentMapRequest) {
+        if (Object.keys(eventData).some(key => key.startsWith('mapbox'))) {
+            clearTimeout(mapRequestTimer);
+            mapRequestTimer = setTimeout(fetchMapViewport, 250);
+        }
+        return;
+    }
+    if (!currentGraphRequest) return;
+
+    let xRange;
+    if (eventData['xaxis.autorange']) {
+        xRange = null;
+    } else if (eventData['xaxis.range[0]'] !== undefined) {
+        xRange = [eventData['xaxis.range[0]'], eventData['xaxis.range[1]']];
+    } else if (eventData['xaxis.range']) {
+        xRange = eventData['xaxis.range'];
+    } else {
+        return;
+    }
+
+    // Debounce so scroll-zooming does not fire a request per wheel tick
+    clearTimeout(windowRequestTimer);
+    windowRequestTimer = setTimeout(() => fetchGraphWindow(xRange), 250);
+}
+
+async function fetchGraphWindow(xRange) {
+    const seq = ++windowRequestSeq;
+    const request = currentGraphRequest;
+
+    try {
+        const response = await fetch('/graph_window', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ ...request, x_range: xRange })
+        });
+
+        const result = await response.json();
+
+        // Ignore responses for windows the user has already zoomed away from
+        if (seq !== windowRequestSeq || request !== currentGraphRequest) return;
+
+        if (result.success) {
+            const graphDisplay = document.getElementById('graphDisplay');
+            const traces = decodeTypedArrays(result.traces);
+            Plotly.restyle(graphDisplay, {
+                x: traces.map(trace => trace.x),
+                y: traces.map(trace => trace.y)
+            }, traces.map((_, i) => i));
+        } else {
+            showNotification(result.error || 'Failed to load zoomed data', 'error');
+        }
+    } catch (error) {
+        showNotification('Error loading zoomed data: ' + error.message, 'error');
+    }
+}
+
+// Replace the map trace with the points (or clusters) in the current viewport
+async function fetchMapViewport() {
+    const seq = ++mapRequestSeq;
+    const request = currentMapRequest;
+    const graphDisplay = document.getElementById('graphDisplay');
+    const mapbox = graphDisplay._fullLayout && graphDisplay._fullLayout.mapbox;
+    const map = mapbox && mapbox._subplot && mapbox._subplot.map;
+    if (!map) return;
+    const bounds = map.getBounds();
+
+    try {
+        const response = await fetch('/map_tiles', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                ...request,
+                bounds: [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()],
+                zoom: map.getZoom()
+            })
+        });
+
+        const result = await response.json();
+
+        // Ignore responses for views the user has already moved away from
+        if (seq !== mapRequestSeq || request !== currentMapRequest) return;
+
+        if (result.success) {
+            // The layout keeps the user's view, colour axis and map style
+            Plotly.react(graphDisplay, [decodeTypedArrays(result.trace)], graphDisplay.layout);
+        } else {
+            showNotification(result.error || 'Failed to load map points', 'error');
+        }
+    } catch (error) {
+        showNotification('Error loading map points: ' + error.message, 'error');
+    }
 }
 
 // Download graph
@@ -554,9 +1119,13 @@ function fullscreenGraph() {
 
 // Reset application
 function resetApp() {
+    stopLiveTail();
     uploadedFile = null;
     csvData = null;
     currentGraph = null;
+    currentGraphRequest = null;
+    currentMapRequest = null;
+    graphCache.clear();
     
     // Reset form
     document.getElementById('graphType').value = '';
@@ -570,6 +1139,10 @@ function resetApp() {
     document.getElementById('yMax').value = '';
     document.getElementById('y2Min').value = '';
     document.getElementById('y2Max').value = '';
+    document.getElementById('maxPoints').value = '';
+    document.getElementById('renderMode').value = 'auto';
+    document.getElementById('aggregateMode').value = 'auto';
+    document.getElementById('liveMode').value = 'off';
     document.getElementById('lightMode').checked = false;
     
 
@@ -577,12 +1150,18 @@ function resetApp() {
     // Reset Scatter on Map fields
     document.getElementById('mapTitle').value = '';
     document.getElementById('mapType').value = 'satellite';
+    document.getElementById('mapTileMode').value = 'clusters';
     document.getElementById('latitudeColumn').selectedIndex = 0;
     document.getElementById('longitudeColumn').selectedIndex = 0;
     document.getElementById('hoverColumns').selectedIndex = -1;
     document.getElementById('colorColumn').selectedIndex = 0;
     document.getElementById('sizeColumn').selectedIndex = 0;
     
+    // Reset CSV Joiner fields
+    document.getElementById('joinColumn').selectedIndex = 0;
+    document.getElementById('joinDirection').value = 'backward';
+    document.getElementById('joinTolerance').value = '';
+    
     // Reset file input
     fileInput.value = '';
     
@@ -600,6 +1179,12 @@ function resetApp() {
 // Show loading overlay
 function showLoading(show) {
     loadingOverlay.style.display = show ? 'flex' : 'none';
+    if (!show) setLoadingText('Processing your data...');
+}
+
+// Update the message under the loading spinner
+function setLoadingText(text) {
+    document.getElementById('loadingText').textContent = text;
 }
 
 // Show notification
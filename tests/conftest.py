@@ -0,0 +1,30 @@
+import importlib.util
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def flask_app(tmp_path, monkeypatch):
+    """The Flask app module with an empty upload folder and dataset cache"""
+    import app
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setattr(app, 'dataset_cache', app.DatasetCache(app.DATASET_CACHE_MAX_MB * 1024 * 1024))
+    return app
+
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def dash_app():
+    """dash/app.py, loaded by path since the Flask app.py is also named app"""
+    spec = importlib.util.spec_from_file_location('dash_app', os.path.join(ROOT, 'dash', 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['dash_app'] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,66 @@
+import time
+import zlib
+import pytest
+
+PART_SIZE = 1000
+
+
+@pytest.fixture
+def chunked(flask_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(flask_app, 'PARTIAL_UPLOAD_FOLDER', str(tmp_path / '.partial'))
+    monkeypatch.setattr(flask_app, 'UPLOAD_PART_SIZE', PART_SIZE)
+    monkeypatch.setattr(flask_app, 'upload_info', {})
+    return flask_app
+
+
+def put_chunk(client, upload_id, index, data, crc=None):
+    return client.put(f'/upload/{upload_id}/chunk/{index}', data=data,
+                      headers={'X-Chunk-CRC32': f'{zlib.crc32(data) if crc is None else crc:08x}'})
+
+
+def test_chunks_resume_and_assemble_into_the_upload(client, chunked, tmp_path):
+    content = ('x,y\n' + ''.join(f'{i},{i * i}\n' for i in range(400))).encode()
+    parts = [content[i:i + PART_SIZE] for i in range(0, len(content), PART_SIZE)]
+    init = client.post('/upload/init', json={'filename': 'squares.csv', 'size': len(content)}).get_json()
+    assert init['total_chunks'] == len(parts) and init['received'] == []
+    upload_id = init['upload_id']
+
+    # An interrupted upload: the first chunk and the last one arrived
+    assert put_chunk(client, upload_id, 0, parts[0]).status_code == 200
+    assert put_chunk(client, upload_id, len(parts) - 1, parts[-1]).status_code == 200
+    status = client.get(f'/upload/{upload_id}').get_json()
+    assert status['received'] == [0, len(parts) - 1]
+    missing = client.post(f'/upload/{upload_id}/finalize')
+    assert missing.status_code == 409 and missing.get_json()['missing'] == list(range(1, len(parts) - 1))
+
+    for index in range(1, len(parts) - 1):
+        assert put_chunk(client, upload_id, index, parts[index]).status_code == 200
+    body = client.post(f'/upload/{upload_id}/finalize').get_json()
+    assert body['success'] and body['columns'] == ['x', 'y']
+    assert (tmp_path / 'squares.csv').read_bytes() == content
+    assert not (tmp_path / '.partial' / upload_id).exists()
+
+
+def test_corrupt_or_short_chunks_are_rejected(client, chunked):
+    content = b'a\n' + b'1\n' * 999
+    upload_id = client.post('/upload/init', json={'filename': 'ones.csv', 'size': len(content)}).get_json()['upload_id']
+    part = content[:PART_SIZE]
+    assert put_chunk(client, upload_id, 0, part, crc=zlib.crc32(part) ^ 1).status_code == 422
+    assert put_chunk(client, upload_id, 0, part[:-1]).status_code == 422
+    assert put_chunk(client, upload_id, 5, part).status_code == 400
+    assert client.get(f'/upload/{upload_id}').get_json()['received'] == []
+
+
+def test_unknown_and_malformed_upload_ids_are_refused(client, chunked):
+    assert client.get('/upload/' + '0' * 32).status_code == 404
+    assert put_chunk(client, '..', 0, b'x').status_code == 404
+    assert client.post('/upload/init', json={'filename': 'evil.exe', 'size': 10}).status_code == 400
+    assert client.post('/upload/init', json={'filename': 'empty.csv', 'size': 0}).status_code == 400
+
+
+def test_stale_partial_uploads_are_purged(client, chunked, monkeypatch):
+    first = client.post('/upload/init', json={'filename': 'old.csv', 'size': 10}).get_json()['upload_id']
+    monkeypatch.setattr(chunked, 'PARTIAL_UPLOAD_MAX_AGE_HOURS', 0)
+    time.sleep(0.01)
+    client.post('/upload/init', json={'filename': 'new.csv', 'size': 10})
+    assert client.get(f'/upload/{first}').status_code == 404
@@ -0,0 +1,121 @@
+"""Sketches and mergeable moments of column_stats against exact pandas results"""
+import numpy as np
+import pandas as pd
+import pytest
+import column_stats
+from column_stats import HLL_EXACT_LIMIT, HyperLogLog, TDigest, summarize_columns
+
+rng = np.random.default_rng(0)
+
+
+def chunks_of(df, rows):
+    return [df.iloc[start:start + rows] for start in range(0, len(df), rows)]
+
+
+def test_hll_is_exact_below_the_limit():
+    values = rng.integers(0, 5000, 20000)
+    sketch = HyperLogLog()
+    sketch.add(values)
+    assert sketch.estimate() == len(np.unique(values))
+
+
+@pytest.mark.parametrize('distinct', [HLL_EXACT_LIMIT + 1, 3 * HLL_EXACT_LIMIT])
+def test_hll_estimate_past_the_exact_limit(distinct):
+    values = pd.Series(np.arange(distinct, dtype=np.int64) * 7919).sample(frac=1, random_state=1)
+    sketch = HyperLogLog()
+    for start in range(0, distinct, 50_000):
+        sketch.add(values.to_numpy()[start:start + 50_000])
+    assert sketch.exact is None
+    # Standard error is about 0.8% at the default precision
+    assert abs(sketch.estimate() - values.nunique()) / values.nunique() < 0.03
+
+
+def test_hll_merge_matches_one_sketch():
+    a, b = HyperLogLog(), HyperLogLog()
+    a.add(np.arange(0, 150_000))
+    b.add(np.arange(100_000, 250_000))
+    a.merge(b)
+    assert abs(a.estimate() - 250_000) / 250_000 < 0.03
+
+
+def test_tdigest_is_exact_before_compressing():
+    values = rng.normal(size=5000)
+    digest = TDigest()
+    digest.add(values)
+    for q in (0, 0.1, 0.5, 0.99, 1):
+        assert digest.quantile(q) == pytest.approx(pd.Series(values).quantile(q))
+
+
+@pytest.mark.parametrize('q', [0.01, 0.25, 0.5, 0.75, 0.99])
+def test_tdigest_after_compression(monkeypatch, q):
+    monkeypatch.setattr(column_stats, 'TDIGEST_BUFFER', 1000)
+    values = rng.lognormal(size=50_000)
+    digest = TDigest()
+    for chunk in np.array_split(values, 50):
+        digest.add(chunk)
+    assert digest.compressed and len(digest.means) <= digest.compression
+    # Compare by rank, the error a t-digest bounds
+    rank = np.mean(values <= digest.quantile(q))
+    assert abs(rank - q) < 0.01
+
+
+@pytest.mark.parametrize('q', [0.05, 0.5, 0.95])
+def test_tdigest_after_merge(monkeypatch, q):
+    monkeypatch.setattr(column_stats, 'TDIGEST_BUFFER', 1000)
+    left, right = rng.normal(0, 1, 30_000), rng.normal(3, 2, 20_000)
+    a, b = TDigest(), TDigest()
+    a.add(left)
+    b.add(right)
+    a.merge(b)
+    values = np.concatenate([left, right])
+    rank = np.mean(values <= a.quantile(q))
+    assert abs(rank - q) < 0.01
+    assert a.quantile(q) == pytest.approx(pd.Series(values).quantile(q), rel=0.05, abs=0.05)
+
+
+def test_moments_merged_across_chunks():
+    df = pd.DataFrame({'a': rng.normal(1e6, 3, 100_003), 'b': rng.integers(-50, 50, 100_003)})
+    df.loc[::97, 'a'] = np.nan
+    summaries = {s.name: s for s in summarize_columns(chunks_of(df, 7919))}
+    for col in df.columns:
+        assert summaries[col].count == df[col].count()
+        assert summaries[col].mean_value() == pytest.approx(df[col].mean(), rel=1e-12)
+        assert summaries[col].std() == pytest.approx(df[col].std(), rel=1e-9)
+        assert summaries[col].min == df[col].min() and summaries[col].max == df[col].max()
+        assert summaries[col].nulls == df[col].isnull().sum()
+
+
+def test_merge_of_summaries_matches_one_pass():
+    df = pd.DataFrame({'a': rng.normal(size=10_000)})
+    first = summarize_columns(df.iloc[:3000])[0]
+    first.merge(summarize_columns(df.iloc[3000:])[0])
+    assert first.mean_value() == pytest.approx(df['a'].mean())
+    assert first.std() == pytest.approx(df['a'].std())
+    assert first.quantile(0.5) == pytest.approx(df['a'].median())
+
+
+def test_text_cells_in_a_later_chunk_count_as_nulls():
+    chunks = [pd.DataFrame({'a': [1.0, 2.0]}), pd.DataFrame({'a': ['3', 'n/a?']})]
+    summary = summarize_columns(chunks)[0]
+    assert summary.to_dict()['nulls'] == 1
+    assert summary.count == 3 and summary.max == 3.0
+
+
+def test_float32_values_are_reported_as_read():
+    summary = summarize_columns(pd.DataFrame({'a': np.array([15.2, 0.1], dtype=np.float32)}))[0]
+    result = summary.to_dict()
+    assert result['max'] == 15.2 and result['min'] == 0.1
+    assert result['samples'] == ['15.2', '0.1']
+
+
+def test_large_files_are_streamed(client, flask_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(flask_app, 'OUT_OF_CORE_FILE_MB', 0)
+    monkeypatch.setattr(flask_app, 'OUT_OF_CORE_CHUNK_ROWS', 997)
+    df = pd.DataFrame({'y': rng.normal(size=10_000)})
+    df.loc[::13, 'y'] = np.nan
+    df.to_csv(tmp_path / 'big.csv', index=False)
+    body = client.post('/column_stats', json={'filename': 'big.csv', 'columns': ['y']}).get_json()
+    assert body['streamed'] and body['rows'] == len(df)
+    [column] = body['columns']
+    assert column['mean'] == pytest.approx(df['y'].mean())
+    assert column['nulls'] == df['y'].isna().sum()
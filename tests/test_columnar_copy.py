@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def wide_csv(tmp_path):
+    df = pd.DataFrame({f'c{i}': range(i, i + 50) for i in range(8)})
+    df['label'] = [f'row {i}' for i in range(50)]
+    df.to_csv(tmp_path / 'wide.csv', index=False)
+    return df
+
+
+@pytest.fixture
+def parses(flask_app, monkeypatch):
+    """Paths read_dataset_file has parsed"""
+    calls = []
+    read = flask_app.read_dataset_file
+
+    def counting_read(filepath):
+        calls.append(filepath)
+        return read(filepath)
+
+    monkeypatch.setattr(flask_app, 'read_dataset_file', counting_read)
+    return calls
+
+
+def test_first_load_writes_a_columnar_copy(flask_app, wide_csv, tmp_path, parses):
+    df = flask_app.load_dataset('wide.csv')
+    assert os.path.exists(tmp_path / 'wide.csv.feather')
+    assert flask_app.has_columnar_copy(str(tmp_path / 'wide.csv'))
+    assert df.columns.tolist() == wide_csv.columns.tolist()
+    assert df['label'].tolist() == wide_csv['label'].tolist()
+    assert len(parses) == 1
+
+
+def test_projection_reads_only_the_requested_columns(flask_app, wide_csv, parses, monkeypatch):
+    flask_app.load_dataset('wide.csv')
+    monkeypatch.setattr(flask_app, 'dataset_cache', flask_app.DatasetCache(10 ** 9))
+
+    df = flask_app.load_dataset('wide.csv', ['c3', 'label'])
+    assert df.columns.tolist() == ['c3', 'label']
+    assert df['c3'].tolist() == list(range(3, 53))
+    # A later request for more columns widens the cached projection
+    df = flask_app.load_dataset('wide.csv', ['c3', 'c7'])
+    assert set(df.columns) == {'c3', 'label', 'c7'}
+    assert set(flask_app.load_dataset('wide.csv').columns) == set(wide_csv.columns)
+    assert len(parses) == 1
+
+
+def test_a_copy_older_than_the_upload_is_ignored(flask_app, wide_csv, tmp_path, parses):
+    flask_app.load_dataset('wide.csv')
+    path = tmp_path / 'wide.csv'
+    pd.DataFrame({'c0': [7, 8]}).to_csv(path, index=False)
+    stamp = os.path.getmtime(tmp_path / 'wide.csv.feather') + 10
+    os.utime(path, (stamp, stamp))
+    assert not flask_app.has_columnar_copy(str(path))
+    assert flask_app.load_dataset('wide.csv', ['c0'])['c0'].tolist() == [7, 8]
+    assert len(parses) == 2
+
+
+def test_concurrent_loads_parse_the_file_once(flask_app, wide_csv, monkeypatch):
+    calls = []
+    read = flask_app.read_dataset_file
+
+    def slow_read(filepath):
+        calls.append(filepath)
+        time.sleep(0.2)
+        return read(filepath)
+
+    monkeypatch.setattr(flask_app, 'read_dataset_file', slow_read)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flask_app.load_dataset('wide.csv')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 4 and all(len(df) == 50 for df in results)
+    assert flask_app.dataset_load_locks == {}
@@ -0,0 +1,77 @@
+import gzip
+import os
+import time
+import pandas as pd
+import pytest
+from flask import url_for
+
+
+@pytest.fixture
+def static_dir(flask_app, tmp_path, monkeypatch):
+    folder = tmp_path / 'static'
+    (folder / 'js').mkdir(parents=True)
+    (folder / 'js' / 'app.js').write_text('console.log("graphing tool");\n' * 200)
+    (folder / 'js' / 'tiny.js').write_text('1;')
+    monkeypatch.setattr(flask_app.app, 'static_folder', str(folder))
+    monkeypatch.setattr(flask_app, 'static_hashes', {})
+    monkeypatch.setattr(flask_app, 'static_compressed', {})
+    return folder
+
+
+def static_url(flask_app, filename):
+    with flask_app.app.test_request_context():
+        return url_for('static', filename=filename)
+
+
+def test_static_urls_carry_a_content_hash(flask_app, static_dir):
+    url = static_url(flask_app, 'js/app.js')
+    assert '?v=' in url and url == static_url(flask_app, 'js/app.js')
+
+    path = static_dir / 'js' / 'app.js'
+    path.write_text('changed();\n')
+    later = time.time() + 5
+    os.utime(path, (later, later))
+    assert static_url(flask_app, 'js/app.js') != url
+    # Only the hash of the current version is kept
+    assert len(flask_app.static_hashes) == 1
+
+
+def test_versioned_static_files_are_cached_and_compressed(flask_app, client, static_dir):
+    response = client.get(static_url(flask_app, 'js/app.js'), headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert gzip.decompress(response.data) == (static_dir / 'js' / 'app.js').read_bytes()
+    assert response.headers['ETag'].startswith('W/')
+
+    plain = client.get('/static/js/app.js')
+    assert 'Content-Encoding' not in plain.headers and 'immutable' not in plain.headers.get('Cache-Control', '')
+    tiny = client.get('/static/js/tiny.js', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in tiny.headers
+
+
+def test_large_json_responses_are_compressed(client, tmp_path):
+    pd.DataFrame({'x': range(1000), 'y': range(1000)}).to_csv(tmp_path / 'data.csv', index=False)
+    job_id = client.post('/generate_graph', json={'filename': 'data.csv', 'graph_type': 'scatter', 'config': {
+        'x_column': 'x', 'y_columns': ['y']}}).get_json()['job_id']
+    for _ in range(200):
+        plain = client.get(f'/jobs/{job_id}')
+        if plain.get_json()['status'] == 'done':
+            break
+        time.sleep(0.05)
+    response = client.get(f'/jobs/{job_id}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == plain.data
+    assert len(response.data) < len(plain.data)
+
+
+def test_unchanged_graph_requests_get_304(client, tmp_path):
+    pd.DataFrame({'x': range(10), 'y': range(10)}).to_csv(tmp_path / 'data.csv', index=False)
+    body = {'filename': 'data.csv', 'graph_type': 'scatter', 'config': {'x_column': 'x', 'y_columns': ['y']}}
+    first = client.post('/generate_graph', json=body)
+    etag = first.headers['ETag']
+    assert first.status_code == 202 and first.get_json()['etag'] == etag.strip('"')
+    again = client.post('/generate_graph', json=body, headers={'If-None-Match': etag})
+    assert again.status_code == 304
+
+    other = dict(body, config={'x_column': 'x', 'y_columns': ['y'], 'title': 'New'})
+    assert client.post('/generate_graph', json=other, headers={'If-None-Match': etag}).status_code == 202
@@ -0,0 +1,88 @@
+import zipfile
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+rng = np.random.default_rng(0)
+
+
+@pytest.fixture
+def joiner(flask_app, monkeypatch):
+    # Tiny chunks, so matches keep crossing chunk boundaries
+    monkeypatch.setattr(flask_app, 'JOIN_CHUNK_ROWS', 7)
+    return flask_app
+
+
+def write_zip(path, frames):
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, df in frames.items():
+            zf.writestr(name, df.to_csv(index=False))
+
+
+def run_join(joiner, tmp_path, frames, **config):
+    write_zip(tmp_path / 'runs.zip', frames)
+    out_name = joiner.csv_joiner(str(tmp_path / 'runs.zip'), dict(config, join_column='t'))
+    return feather.read_table(tmp_path / out_name).to_pandas()
+
+
+def expected_join(frames, direction, tolerance=None):
+    left, *rights = frames.values()
+    joined = left
+    for right in rights:
+        joined = pd.merge_asof(joined, right, on='t', direction=direction, tolerance=tolerance)
+    return joined
+
+
+def numeric_frames():
+    left = pd.DataFrame({'t': np.sort(rng.choice(1000, 60, replace=False)).astype(float),
+                         'a': rng.integers(0, 100, 60)})
+    # Dense: many right chunks between two left rows
+    dense = pd.DataFrame({'t': np.arange(0, 1000, 0.5), 'b': rng.normal(size=2000)})
+    # Sparse: one right chunk spans many left chunks
+    sparse = pd.DataFrame({'t': np.sort(rng.choice(1000, 12, replace=False)).astype(float),
+                           'c': rng.normal(size=12)})
+    return {'left.csv': left, 'dense.csv': dense, 'sparse.csv': sparse}
+
+
+@pytest.mark.parametrize('direction', ['backward', 'forward', 'nearest'])
+def test_join_matches_merge_asof(joiner, tmp_path, direction):
+    frames = numeric_frames()
+    result = run_join(joiner, tmp_path, frames, direction=direction)
+    pd.testing.assert_frame_equal(result, expected_join(frames, direction), check_dtype=False)
+
+
+@pytest.mark.parametrize('direction', ['backward', 'forward', 'nearest'])
+def test_numeric_tolerance(joiner, tmp_path, direction):
+    frames = numeric_frames()
+    del frames['dense.csv']
+    result = run_join(joiner, tmp_path, frames, direction=direction, tolerance='20')
+    expected = expected_join(frames, direction, tolerance=20.0)
+    assert expected['c'].isna().any() and expected['c'].notna().any()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('tolerance', ['90', '90s', '1.5min'])
+def test_datetime_keys_and_tolerance(joiner, tmp_path, tolerance):
+    start = pd.Timestamp('2024-03-01 12:00:00')
+    left = pd.DataFrame({'t': start + pd.to_timedelta(np.arange(0, 3000, 37), unit='s'), 'a': np.arange(82)})
+    right = pd.DataFrame({'t': start + pd.to_timedelta(np.sort(rng.choice(3000, 40, replace=False)), unit='s'),
+                          'b': rng.normal(size=40)})
+    result = run_join(joiner, tmp_path, {'left.csv': left, 'right.csv': right},
+                      direction='nearest', tolerance=tolerance)
+    expected = pd.merge_asof(left, right, on='t', direction='nearest', tolerance=pd.Timedelta(seconds=90))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_unsorted_right_file_and_clashing_columns(joiner, tmp_path):
+    left = pd.DataFrame({'t': np.arange(50.0), 'v': rng.normal(size=50)})
+    right = pd.DataFrame({'t': rng.permutation(np.arange(0.0, 50.0, 3)), 'v': rng.normal(size=17)})
+    result = run_join(joiner, tmp_path, {'left.csv': left, 'other.csv': right})
+    expected = pd.merge_asof(left, right.sort_values('t').rename(columns={'v': 'v_other'}), on='t')
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_join_needs_two_csv_members(joiner, tmp_path):
+    write_zip(tmp_path / 'one.zip', {'only.csv': pd.DataFrame({'t': [1]})})
+    with pytest.raises(ValueError, match='at least two'):
+        joiner.csv_joiner(str(tmp_path / 'one.zip'), {'join_column': 't'})
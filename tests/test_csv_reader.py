@@ -0,0 +1,64 @@
+"""The pyarrow engine of csv_reader must give the same DataFrames as pandas"""
+import pandas as pd
+import pytest
+import csv_reader
+import text_format
+from csv_reader import iter_csv, read_csv
+
+pytest.importorskip('pyarrow')
+
+
+def write(tmp_path, text):
+    path = tmp_path / 'data.csv'
+    path.write_text(text)
+    return str(path)
+
+
+def assert_same(path, **options):
+    pd.testing.assert_frame_equal(read_csv(path, csv_engine='pyarrow', **options),
+                                  pd.read_csv(path, **options))
+    # Chunk boundaries may differ, the rows and their values may not
+    chunks = list(iter_csv(path, 7, csv_engine='pyarrow', **options))
+    assert chunks and all(len(chunk) <= 7 for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  pd.concat(pd.read_csv(path, chunksize=7, **options), ignore_index=True))
+
+
+def test_na_tokens(tmp_path):
+    rows = ['1,x,1.5', 'NA,None,', '3,null,n/a', '4,NULL,#N/A', '5,NaN,-nan', '6,,2.5', '7,nan,N/A']
+    assert_same(write(tmp_path, 'a,b,c\n' + '\n'.join(rows * 3) + '\n'))
+
+
+def test_quoted_newlines(tmp_path):
+    rows = [f'{i},"line one\nline two, with comma",{i / 4}' for i in range(30)]
+    assert_same(write(tmp_path, 'id,note,value\n' + '\n'.join(rows) + '\n'))
+
+
+def test_dtype_change_after_the_sample(tmp_path, monkeypatch):
+    # The sample fixes column types, so later text in a numeric column makes
+    # pyarrow fail mid-file; the pandas fallback must not repeat rows
+    monkeypatch.setattr(text_format, 'SNIFF_SAMPLE_BYTES', 64)
+    monkeypatch.setattr(csv_reader, 'ARROW_BLOCK_SIZE', 256)
+    rows = [f'{i},{i * 2}' for i in range(200)] + ['200,late text'] + [f'{i},{i}' for i in range(201, 230)]
+    assert_same(write(tmp_path, 'a,b\n' + '\n'.join(rows) + '\n'))
+
+
+def test_header_only(tmp_path):
+    path = write(tmp_path, 'a,b,c\n')
+    assert_same(path)
+    # pandas yields one empty chunk, callers rely on getting the columns from it
+    chunks = list(iter_csv(path, 7, csv_engine='pyarrow'))
+    assert len(chunks) == 1 and chunks[0].columns.tolist() == ['a', 'b', 'c']
+
+
+def test_usecols_keeps_file_order(tmp_path):
+    path = write(tmp_path, 'a,b,c\n' + ''.join(f'{i},{i + 1},{i + 2}\n' for i in range(20)))
+    assert_same(path, usecols=['c', 'a'])
+
+
+@pytest.mark.parametrize('csv_engine', ['pyarrow', 'pandas'])
+def test_limit_stops_before_a_line_being_written(tmp_path, csv_engine):
+    complete = 'a,b\n' + ''.join(f'{i},{i / 2}\n' for i in range(50))
+    path = write(tmp_path, complete + '50,2')
+    df = read_csv(path, csv_engine=csv_engine, limit=len(complete))
+    pd.testing.assert_frame_equal(df, pd.read_csv(write(tmp_path, complete)))
@@ -0,0 +1,113 @@
+import io
+import os
+import time
+import zipfile
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def uploads(dash_app, tmp_path, monkeypatch):
+    """Empty upload and session folders and session store for the Dash app"""
+    sessions = tmp_path / 'sessions'
+    sessions.mkdir()
+    monkeypatch.setattr(dash_app, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setattr(dash_app, 'SESSION_FILE_FOLDER', str(sessions))
+    monkeypatch.setattr(dash_app, 'session_datasets', dash_app.SessionDatasets(10 ** 8, 3600))
+    return tmp_path
+
+
+def upload(dash_app, filename, body):
+    client = dash_app.app.server.test_client()
+    return client.post(f'/upload?filename={filename}', data=body, content_type='application/octet-stream')
+
+
+def test_uploads_are_written_to_disk_under_a_handle(dash_app, uploads):
+    body = b'x,y\n' + b''.join(b'%d,%d\n' % (i, i * 2) for i in range(1000))
+    response = upload(dash_app, 'my data.csv', body)
+    info = response.get_json()
+    assert response.status_code == 200 and info['filename'] == 'my_data.csv' and info['size'] == len(body)
+    assert dash_app.HANDLE_PATTERN.fullmatch(info['handle'])
+    assert (uploads / info['handle']).read_bytes() == body
+
+    assert upload(dash_app, 'script.py', b'print()').status_code == 400
+
+
+def test_the_callback_parses_the_handle_and_deletes_it(dash_app, uploads):
+    handle = upload(dash_app, 'data.csv', b'x,y\n1,2\n3,4\n').get_json()
+    status, config, generate_disabled, _ = dash_app.update_upload_status(handle, 'session')
+    assert 'Found 2 rows and 2 columns' in status.children and not generate_disabled
+    assert dash_app.session_datasets.get('session')['y'].tolist() == [2, 4]
+    assert not os.path.exists(uploads / handle['handle'])
+
+    # Handles come from the browser, anything but a bare file name is refused
+    (uploads.parent / 'secret.csv').write_text('a\n1\n')
+    status, *_ = dash_app.update_upload_status({'handle': '../secret.csv', 'filename': 'x.csv'}, 'session')
+    assert 'not found' in status.children
+    assert os.path.exists(uploads.parent / 'secret.csv')
+
+
+def test_zip_uploads_stack_every_csv(dash_app, uploads):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('a.csv', 'x,y\n1,2\n')
+        zf.writestr('nested/b.csv', 'x,y\n3,4\n5,6\n')
+        zf.writestr('__MACOSX/._a.csv', 'junk')
+        zf.writestr('notes.txt', 'hello')
+    handle = upload(dash_app, 'logs.zip', archive.getvalue()).get_json()
+    status, *_ = dash_app.update_upload_status(handle, 'session')
+    df = dash_app.session_datasets.get('session')
+    assert 'Found 3 rows and 3 columns' in status.children
+    assert df['x'].tolist() == [1, 3, 5]
+    assert df['source_file'].tolist() == ['a.csv', 'nested/b.csv', 'nested/b.csv']
+
+    empty = io.BytesIO()
+    with zipfile.ZipFile(empty, 'w') as zf:
+        zf.writestr('notes.txt', 'hello')
+    status, *_ = dash_app.update_upload_status(upload(dash_app, 'empty.zip', empty.getvalue()).get_json(), 's2')
+    assert 'No CSV file' in status.children
+
+
+def test_large_csv_uploads_stay_on_disk(dash_app, uploads, monkeypatch):
+    monkeypatch.setattr(dash_app, 'OUT_OF_CORE_FILE_MB', 0)
+    monkeypatch.setattr(dash_app, 'STATS_CHUNK_ROWS', 7)
+    df = pd.DataFrame({'x': range(50), 'y': [i % 5 for i in range(50)], 'label': ['a', 'b'] * 25})
+    handle = upload(dash_app, 'big.csv', df.to_csv(index=False).encode()).get_json()
+    status, *_ = dash_app.update_upload_status(handle, 'session')
+    assert 'read from disk' in status.children
+    data = dash_app.session_datasets.get('session')
+    assert data == str(uploads / 'sessions' / handle['handle']) and os.path.exists(data)
+
+    figure, info, _ = dash_app.generate_graph(1, 'scatter', 'x', ['y'], 'Big', 'auto', 'session')
+    assert '50 data points' in info.children
+    filtered, message = dash_app.process_file(1, 'filter', None, 'y', '3', None, None, 'session')
+    assert pd.read_csv(io.StringIO(filtered['content']))['x'].tolist() == list(range(3, 50, 5))
+    summary, _ = dash_app.process_file(1, 'summary', 'basic', None, None, None, None, 'session')
+    basic = pd.read_csv(io.StringIO(summary['content'])).set_index('index')
+    assert basic.loc['mean', 'x'] == pytest.approx(24.5) and basic.loc['count', 'y'] == 50
+
+    # The file goes with the session
+    dash_app.session_datasets.put('session', df)
+    assert not os.path.exists(data)
+
+
+def test_stale_handles_are_swept(dash_app, uploads, monkeypatch):
+    monkeypatch.setattr(dash_app, 'STALE_UPLOAD_MINUTES', 10)
+    monkeypatch.setattr(dash_app, 'SESSION_IDLE_MINUTES', 60)
+    old = time.time() - 30 * 60
+    names = {
+        'stale': uploads / ('a' * 32 + '.csv'),
+        'fresh': uploads / ('b' * 32 + '.csv'),
+        'foreign': uploads / 'keep.csv',
+        'session': uploads / 'sessions' / ('c' * 32 + '.csv'),
+        'old_session': uploads / 'sessions' / ('d' * 32 + '.csv'),
+    }
+    for path in names.values():
+        path.write_text('x\n1\n')
+    for name in ('stale', 'foreign', 'session'):
+        os.utime(names[name], (old, old))
+    very_old = time.time() - 90 * 60
+    os.utime(names['old_session'], (very_old, very_old))
+
+    dash_app.remove_stale_uploads()
+    assert {name for name, path in names.items() if path.exists()} == {'fresh', 'foreign', 'session'}
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+
+def frame(rows):
+    return pd.DataFrame({'a': np.arange(rows, dtype=np.float64)})
+
+
+def nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def test_least_recently_used_entry_is_evicted(flask_app):
+    df = frame(1000)
+    cache = flask_app.DatasetCache(2 * nbytes(df) + 1)
+    cache.put(('a.csv', 1, 1), df)
+    cache.put(('b.csv', 1, 1), df)
+    assert cache.get(('a.csv', 1, 1)) is df
+    cache.put(('c.csv', 1, 1), df)
+    assert cache.get(('b.csv', 1, 1)) is None
+    assert cache.get(('a.csv', 1, 1)) is df and cache.get(('c.csv', 1, 1)) is df
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['current_bytes'] == 2 * nbytes(df) <= stats['max_bytes']
+
+
+def test_new_version_of_a_file_replaces_the_old_one(flask_app):
+    cache = flask_app.DatasetCache(10 ** 9)
+    old, new = frame(10), frame(20)
+    cache.put(('a.csv', 1, 100), old)
+    cache.put(('a.csv', 2, 200), new)
+    assert cache.get(('a.csv', 1, 100)) is None
+    assert cache.get(('a.csv', 2, 200)) is new
+    assert cache.stats()['current_bytes'] == nbytes(new)
+
+
+def test_entry_larger_than_the_budget_keeps_the_cache(flask_app):
+    small = frame(10)
+    cache = flask_app.DatasetCache(nbytes(small) * 2)
+    cache.put(('a.csv', 1, 1), small)
+    cache.put(('b.csv', 1, 1), frame(10_000))
+    assert cache.get(('a.csv', 1, 1)) is small
+    assert cache.get(('b.csv', 1, 1)) is None
+    assert cache.stats()['evictions'] == 0
+
+
+def test_load_dataset_parses_each_version_once(flask_app, tmp_path, monkeypatch):
+    path = tmp_path / 'data.csv'
+    path.write_text('x,y\n1,2\n3,4\n')
+    parses = []
+    read = flask_app.read_dataset_file
+    monkeypatch.setattr(flask_app, 'read_dataset_file', lambda filepath: parses.append(filepath) or read(filepath))
+
+    first = flask_app.load_dataset('data.csv')
+    second = flask_app.load_dataset('data.csv')
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert first['y'].tolist() == [2, 4]
+
+    path.write_text('x,y\n1,2\n3,4\n5,6\n')
+    assert flask_app.load_dataset('data.csv')['y'].tolist() == [2, 4, 6]
+    assert len(parses) == 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import decimate_indices, decimated_xy, lttb_indices, minmax_indices, stratified_indices
+
+rng = np.random.default_rng(0)
+
+
+@pytest.mark.parametrize('n, n_out', [(10_000, 500), (1001, 100), (50, 7)])
+def test_lttb_keeps_ends_and_stays_within_the_threshold(n, n_out):
+    x = np.arange(n, dtype=np.float64)
+    y = rng.normal(size=n)
+    idx = lttb_indices(x, y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_a_lone_spike():
+    y = np.zeros(10_000)
+    y[4321] = 100.0
+    idx = lttb_indices(np.arange(len(y), dtype=np.float64), y, 200)
+    assert 4321 in idx
+
+
+@pytest.mark.parametrize('n_out', [100, 101, 1000])
+def test_minmax_keeps_every_bucket_extreme_within_the_threshold(n_out):
+    y = rng.normal(size=10_007)
+    idx = minmax_indices(y, n_out)
+    assert len(idx) <= n_out
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    # Buckets as minmax_indices cuts them: equal row ranges, two rows each
+    n_buckets = max((n_out - 2) // 2, 1)
+    bucket_size = -(-len(y) // n_buckets)
+    for start in range(0, len(y), bucket_size):
+        bucket = y[start:start + bucket_size]
+        assert start + bucket.argmin() in idx and start + bucket.argmax() in idx
+
+
+def test_stratified_takes_one_row_per_bucket():
+    idx = stratified_indices(10_000, 100)
+    assert len(idx) == 100
+    assert np.array_equal(idx // 100, np.arange(100))
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax', 'stratified', 'uniform'])
+def test_up_to_the_threshold_every_valid_row_is_kept(method):
+    x = np.arange(10, dtype=np.float64)
+    y = rng.normal(size=10)
+    y[3] = np.nan
+    assert decimate_indices(x, y, 9, method).tolist() == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert len(decimate_indices(x, y, 5, method)) <= 5
+
+
+def test_decimated_xy_skips_small_frames_and_reduces_large_ones():
+    df = pd.DataFrame({'x': np.arange(20_000), 'y': rng.normal(size=20_000)})
+    x, y = decimated_xy(df.iloc[:100], 'x', 'y', {'max_points': 100}, 'lttb')
+    assert len(x) == 100
+    x, y = decimated_xy(df, 'x', 'y', {'max_points': 1000}, 'lttb')
+    assert len(x) == len(y) == 1000
+    assert x.iloc[0] == 0 and x.iloc[-1] == 19_999
+    x, y = decimated_xy(df, 'x', 'y', {'max_points': 1000, 'decimation': 'none'}, 'lttb')
+    assert len(x) == 20_000
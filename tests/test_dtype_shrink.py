@@ -0,0 +1,48 @@
+import json
+import numpy as np
+import pandas as pd
+import plotly.utils
+from app import encode_trace, float32_as_decimal, shrink_dtypes
+
+
+def test_columns_get_the_smallest_type_that_keeps_their_values():
+    df = pd.DataFrame({
+        'small': [1, 2, 3, 4],
+        'unsigned': np.array([1, 2, 300, 4], dtype=np.uint64),
+        'price': [15.2, 0.1, 99.99, 1e6],
+        'ratio': [1 / 3, 2 / 3, 1.0, 0.5],
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-04'],
+        'clock': ['10:30', '11:00', '11:30', '12:00'],
+        'city': ['Oslo', 'Oslo', 'Rome', 'Oslo'],
+        'id': ['a', 'b', 'c', 'd'],
+    })
+    shrunk = shrink_dtypes(df)
+    assert shrunk['small'].dtype == np.int8 and shrunk['unsigned'].dtype == np.uint16
+    assert shrunk['price'].dtype == np.float32 and shrunk['ratio'].dtype == np.float64
+    assert pd.api.types.is_datetime64_any_dtype(shrunk['date']) and shrunk['date'].isna().sum() == 1
+    # Times of day alone would become today's date
+    assert shrunk['clock'].dtype == object
+    assert shrunk['city'].dtype == 'category' and shrunk['id'].dtype == object
+    assert shrunk['price'].astype(str).tolist() == ['15.2', '0.1', '99.99', '1000000.0']
+
+
+def test_float32_values_go_out_as_their_decimals():
+    values = np.array([15.2, 0.1, np.nan, -3.75], dtype=np.float32)
+    decimals = float32_as_decimal(values)
+    assert decimals.dtype == np.float64 and decimals[0] == 15.2 and np.isnan(decimals[2])
+    ints = np.arange(3)
+    assert float32_as_decimal(ints) is ints
+
+    trace = {'x': values[:2], 'y': np.array([0.3, 0.7], dtype=np.float32)}
+    encode_trace(trace, {})
+    assert json.dumps(trace, cls=plotly.utils.PlotlyJSONEncoder) == '{"x": [15.2, 0.1], "y": [0.3, 0.7]}'
+
+
+def test_loaded_numeric_columns_are_memory_mapped(flask_app, tmp_path):
+    pd.DataFrame({'x': np.arange(10_000), 'y': np.arange(10_000) / 4, 'label': ['a', 'b'] * 5000}).to_csv(
+        tmp_path / 'data.csv', index=False)
+    df = flask_app.load_dataset('data.csv')
+    footprint = flask_app.dataframe_footprint(df)
+    assert footprint['mapped_bytes'] >= df['x'].nbytes + df['y'].nbytes
+    assert not df['y'].to_numpy().flags.writeable
+    assert df['label'].dtype == 'category'
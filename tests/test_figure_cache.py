@@ -0,0 +1,72 @@
+import os
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def figures(flask_app, tmp_path, monkeypatch):
+    cache = flask_app.FigureCache(10 ** 8, 10 ** 8, str(tmp_path / '.figures'))
+    monkeypatch.setattr(flask_app, 'figure_cache', cache)
+    return cache
+
+
+def key(name, version, config='{}'):
+    return ((name, version, 1), 'scatter', config)
+
+
+def test_evicted_figures_spill_to_disk_and_come_back(flask_app, tmp_path):
+    cache = flask_app.FigureCache(25, 35, str(tmp_path / '.figures'))
+    assert not os.path.exists(cache.folder)
+    cache.put(key('a.csv', 1), b'a' * 10)
+    cache.put(key('b.csv', 1), b'b' * 10)
+    cache.put(key('c.csv', 1), b'c' * 10)
+    assert os.listdir(cache.folder) and cache.stats()['disk_entries'] == 1
+    assert cache.get(key('a.csv', 1)) == b'a' * 10
+    stats = cache.stats()
+    assert stats['disk_hits'] == 1 and stats['current_bytes'] <= 25
+    # Over the disk budget the oldest spilled figure is dropped
+    cache.put(key('d.csv', 1), b'd' * 10)
+    cache.put(key('e.csv', 1), b'e' * 10)
+    cache.put(key('f.csv', 1), b'f' * 10)
+    assert cache.stats()['disk_bytes'] <= 35
+    assert cache.get(key('b.csv', 1)) is None
+
+
+def test_a_new_version_drops_the_old_figures(flask_app, tmp_path):
+    cache = flask_app.FigureCache(15, 100, str(tmp_path / '.figures'))
+    cache.put(key('a.csv', 1, 'x'), b'1' * 10)
+    cache.put(key('a.csv', 1, 'y'), b'2' * 10)
+    cache.put(key('a.csv', 2, 'x'), b'3' * 10)
+    assert cache.get(key('a.csv', 1, 'x')) is None and cache.get(key('a.csv', 1, 'y')) is None
+    assert cache.stats()['disk_entries'] == 0 and os.listdir(cache.folder) == []
+
+
+def test_equivalent_configs_share_a_key(flask_app, tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('x,y\n1,2\n')
+    a = flask_app.figure_cache_key(str(path), 'scatter', {'x_column': 'x', 'y_columns': ['y'], 'color_column': '',
+                                                          'hover_columns': [], 'title': 'One'})
+    b = flask_app.figure_cache_key(str(path), 'scatter', {'title': 'Two', 'y_columns': ['y'], 'x_column': 'x'})
+    assert a == b
+    ping_a = flask_app.figure_cache_key(str(path), 'ping', {'title': 'One'})
+    assert ping_a != flask_app.figure_cache_key(str(path), 'ping', {'title': 'Two'})
+
+
+def test_cosmetic_changes_reuse_the_cached_traces(flask_app, figures, tmp_path, monkeypatch):
+    pd.DataFrame({'x': range(100), 'y': range(100)}).to_csv(tmp_path / 'data.csv', index=False)
+    loads = []
+    load = flask_app.load_dataset
+    monkeypatch.setattr(flask_app, 'load_dataset', lambda *args: loads.append(args) or load(*args))
+    progress = lambda phase, percent: None
+    config = {'x_column': 'x', 'y_columns': ['y'], 'title': 'First'}
+
+    first = flask_app.render_graph('data.csv', 'single_line', config, progress)
+    second = flask_app.render_graph('data.csv', 'single_line', dict(config, title='Second', light_mode=False),
+                                    progress)
+    assert len(loads) == 1 and figures.stats()['hits'] == 1
+    assert second['graph']['layout']['title']['text'] == 'Second'
+    assert second['graph']['layout']['template'] != first['graph']['layout']['template']
+    assert second['graph']['data'] == first['graph']['data']
+
+    flask_app.render_graph('data.csv', 'single_line', dict(config, max_points=10), progress)
+    assert len(loads) == 2
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from app import window_rows
+
+rng = np.random.default_rng(0)
+
+
+def inside(df, x_col, lo, hi):
+    return set(df.index[(df[x_col] >= lo) & (df[x_col] <= hi)])
+
+
+def test_sorted_x_keeps_the_range_and_one_row_each_side():
+    df = pd.DataFrame({'x': np.arange(100, dtype=np.float64), 'y': rng.normal(size=100)})
+    window = window_rows(('sorted.csv', 1, 1), df, 'x', [10.5, 20.5])
+    assert window['x'].tolist() == list(range(10, 22))
+
+
+def test_range_past_the_data_stops_at_the_ends():
+    df = pd.DataFrame({'x': np.arange(10, dtype=np.float64)})
+    assert window_rows(('ends.csv', 1, 1), df, 'x', [-5, 3])['x'].tolist() == [0, 1, 2, 3, 4]
+    assert window_rows(('ends.csv', 1, 1), df, 'x', [8, 50])['x'].tolist() == [7, 8, 9]
+    assert len(window_rows(('ends.csv', 1, 1), df, 'x', None)) == 10
+
+
+def test_unsorted_x_is_returned_in_x_order():
+    df = pd.DataFrame({'x': rng.permutation(1000).astype(np.float64)})
+    window = window_rows(('shuffled.csv', 1, 1), df, 'x', [300, 400])
+    assert window['x'].is_monotonic_increasing
+    assert inside(df, 'x', 300, 400) <= set(window.index)
+    assert window['x'].tolist() == list(range(299, 402))
+
+
+def test_missing_x_values_stay_out_of_the_window():
+    x = rng.permutation(1000).astype(np.float64)
+    x[::7] = np.nan
+    df = pd.DataFrame({'x': x})
+    window = window_rows(('gaps.csv', 1, 1), df, 'x', [200, 600])
+    assert window['x'].notna().all()
+    assert inside(df, 'x', 200, 600) <= set(window.index)
+    # Only the neighbour rows lie outside the range
+    assert ((window['x'] < 200) | (window['x'] > 600)).sum() <= 2
+
+
+def test_text_dates_are_windowed_as_dates():
+    dates = pd.date_range('2024-01-01', periods=48, freq='h')
+    df = pd.DataFrame({'Date': dates.strftime('%Y-%m-%d %H:%M:%S')})
+    window = window_rows(('dates.csv', 1, 1), df, 'Date', ['2024-01-01 10:00', '2024-01-01 12:00'])
+    assert window['Date'].tolist() == [f'2024-01-01 {hour:02d}:00:00' for hour in range(9, 14)]
+
+
+def test_graph_window_route_decimates_the_zoomed_range(client, tmp_path):
+    pd.DataFrame({'x': np.arange(100_000), 'y': rng.normal(size=100_000)}).to_csv(tmp_path / 'big.csv', index=False)
+    response = client.post('/graph_window', json={
+        'filename': 'big.csv', 'graph_type': 'single_line', 'x_range': [1000, 31000],
+        'config': {'x_column': 'x', 'y_columns': ['y'], 'max_points': 2000}})
+    assert response.status_code == 200
+    counts = response.get_json()['point_counts']
+    assert counts == {'original': 30_003, 'rendered': 2000, 'decimated': True}
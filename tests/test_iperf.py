@@ -0,0 +1,74 @@
+import io
+import json
+import pytest
+import app
+from app import iter_json_array, parse_iperf_json
+
+
+def tcp_run(intervals=6, streams=2):
+    """iperf3 --json output of a TCP run"""
+    def stream(socket, t):
+        return {'socket': socket, 'start': t, 'end': t + 1, 'seconds': 1, 'bytes': 1_000_000 * socket,
+                'bits_per_second': 8e6 * socket, 'retransmits': t % 2, 'snd_cwnd': 65536, 'rtt': 1500}
+    return {
+        'start': {'connected': [{'socket': 5}], 'test_start': {'protocol': 'TCP'}},
+        'intervals': [{'streams': [stream(s + 5, t) for s in range(streams)],
+                       'sum': {'start': t, 'end': t + 1, 'bytes': 11_000_000, 'bits_per_second': 8.8e7,
+                               'retransmits': 1}}
+                      for t in range(intervals)],
+        'end': {'sum_sent': {'bytes': 66_000_000}}
+    }
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 7, 64, 1 << 20])
+def test_items_split_across_reads(monkeypatch, read_size):
+    monkeypatch.setattr(app, 'IPERF_READ_SIZE', read_size)
+    document = {'title': 'a [tricky], "string"', 'intervals': [
+        {'streams': [{'socket': 5, 'text': ']}, {'}]}, 12345, -6.5e-3, 'x', [1, [2, 3]], None, True, {}]}
+    text = json.dumps(document, indent=2)
+    assert list(iter_json_array(io.StringIO(text), 'intervals')) == document['intervals']
+
+
+@pytest.mark.parametrize('text', ['{"intervals": []}', '{"intervals":[ ]}', '{"other": [1]}'])
+def test_empty_or_missing_arrays(text):
+    assert list(iter_json_array(io.StringIO(text), 'intervals')) == []
+
+
+@pytest.mark.parametrize('read_size', [5, 1 << 20])
+def test_truncated_array_yields_complete_items_then_fails(monkeypatch, read_size):
+    monkeypatch.setattr(app, 'IPERF_READ_SIZE', read_size)
+    text = '{"intervals": [{"a": 1}, {"a": 2}, {"a": 3'
+    items = []
+    with pytest.raises(ValueError):
+        for item in iter_json_array(io.StringIO(text), 'intervals'):
+            items.append(item)
+    assert items == [{'a': 1}, {'a': 2}]
+    with pytest.raises(ValueError, match='cut off'):
+        list(iter_json_array(io.StringIO('{"intervals": [1, 2, '), 'intervals'))
+
+
+def test_tcp_intervals_become_rows_per_stream(tmp_path):
+    path = tmp_path / 'tcp.json'
+    path.write_text(json.dumps(tcp_run()))
+    df = parse_iperf_json(str(path))
+    assert len(df) == 6 * 3
+    assert sorted(df['stream'].cat.categories) == ['5', '6', 'sum']
+    sums = df[df['stream'] == 'sum']
+    assert sums['throughput_mbps'].tolist() == [88.0] * 6
+    stream = df[df['stream'] == '6']
+    assert stream['end'].tolist() == [1, 2, 3, 4, 5, 6]
+    assert stream['snd_cwnd_kb'].tolist() == [64.0] * 6 and stream['rtt_ms'].tolist() == [1.5] * 6
+    assert df['jitter_ms'].isna().all()
+
+
+def test_truncated_file_keeps_the_intervals_before_the_cut(tmp_path):
+    text = json.dumps(tcp_run())
+    cut = text.index('"streams"', text.index('"streams"', text.index('"intervals"')) + 1) + 30
+    path = tmp_path / 'cut.json'
+    path.write_text(text[:cut])
+    df = parse_iperf_json(str(path))
+    assert df['end'].tolist() == [1, 1, 1]
+
+    path.write_text(text[:text.index('"intervals"') + 20])
+    with pytest.raises(ValueError):
+        parse_iperf_json(str(path))
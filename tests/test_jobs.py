@@ -0,0 +1,67 @@
+import threading
+import time
+import pandas as pd
+
+
+def wait_for_job(client, job_id):
+    for _ in range(200):
+        job = client.get(f'/jobs/{job_id}').get_json()
+        if job['status'] in ('done', 'error'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'job {job_id} never finished')
+
+
+def test_graph_render_runs_as_a_job(client, tmp_path):
+    pd.DataFrame({'x': range(100), 'y': range(100)}).to_csv(tmp_path / 'data.csv', index=False)
+    response = client.post('/generate_graph', json={
+        'filename': 'data.csv', 'graph_type': 'scatter', 'config': {'x_column': 'x', 'y_columns': ['y']}})
+    assert response.status_code == 202
+    job = wait_for_job(client, response.get_json()['job_id'])
+    assert job['status'] == 'done' and job['percent'] == 100
+    assert job['result']['success'] and len(job['result']['graph']['data']) == 1
+    assert job['result']['point_counts']['original'] == 100
+
+
+def test_failed_render_reports_its_error(client, tmp_path):
+    pd.DataFrame({'x': range(10)}).to_csv(tmp_path / 'data.csv', index=False)
+    response = client.post('/generate_graph', json={
+        'filename': 'data.csv', 'graph_type': 'single_line', 'config': {'x_column': 'x', 'y_columns': ['nope']}})
+    job = wait_for_job(client, response.get_json()['job_id'])
+    assert job['status'] == 'error' and 'nope' in job['error']
+
+
+def test_bad_requests_are_refused_before_queueing(client, tmp_path):
+    assert client.post('/generate_graph', json={'filename': 'data.csv', 'graph_type': 'pie'}).status_code == 400
+    assert client.post('/generate_graph', json={'filename': 'gone.csv', 'graph_type': 'scatter'}).status_code == 404
+    assert client.get('/jobs/' + '0' * 32).status_code == 404
+
+
+def test_progress_is_visible_while_the_job_runs(flask_app, client):
+    release = threading.Event()
+
+    def task(progress):
+        progress('parse', 30)
+        release.wait(5)
+        return {'answer': 42}
+
+    job_id = flask_app.submit_job(task)
+    for _ in range(100):
+        job = client.get(f'/jobs/{job_id}').get_json()
+        if job['phase'] == 'parse':
+            break
+        time.sleep(0.01)
+    assert job['status'] == 'running' and job['percent'] == 30 and 'result' not in job
+    release.set()
+    assert wait_for_job(client, job_id)['result'] == {'answer': 42}
+
+
+def test_finished_jobs_expire(flask_app, monkeypatch):
+    job_id = flask_app.submit_job(lambda progress: None)
+    for _ in range(100):
+        if flask_app.jobs[job_id]['status'] == 'done':
+            break
+        time.sleep(0.01)
+    monkeypatch.setattr(flask_app, 'JOB_RESULT_TTL_SECONDS', -1)
+    flask_app.submit_job(lambda progress: None)
+    assert job_id not in flask_app.jobs
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from grid_aggregation import grid_aggregates
+
+rng = np.random.default_rng(0)
+
+
+def gps_fixes(rows=5000):
+    return pd.DataFrame({
+        'lat': rng.uniform(59.8, 60.0, rows),
+        'lon': rng.uniform(10.6, 10.9, rows),
+        'rsrp': rng.normal(-90, 10, rows),
+        'band': rng.choice(['b3', 'b7', 'b20'], rows, p=[0.6, 0.3, 0.1]),
+    })
+
+
+def expected_cells(df, side):
+    lat_width = (df['lat'].max() - df['lat'].min()) / side
+    lon_width = (df['lon'].max() - df['lon'].min()) / side
+    row = np.minimum(((df['lat'] - df['lat'].min()) / lat_width).astype(int), side - 1)
+    col = np.minimum(((df['lon'] - df['lon'].min()) / lon_width).astype(int), side - 1)
+    return df.groupby(row * side + col)
+
+
+def chunked(df, rows):
+    return lambda columns: (df[columns].iloc[start:start + rows] for start in range(0, len(df), rows))
+
+
+def test_cells_hold_the_mean_of_their_points():
+    df = gps_fixes()
+    df.loc[::11, 'rsrp'] = np.nan
+    agg, rows = grid_aggregates(chunked(df, 777), 'lat', 'lon', ['rsrp'], 100)
+    cells = expected_cells(df, 10)
+    assert rows == len(df) and len(agg) == cells.ngroups
+    np.testing.assert_array_equal(agg['points'], cells.size())
+    np.testing.assert_allclose(agg['lat'], cells['lat'].mean())
+    np.testing.assert_allclose(agg['lon'], cells['lon'].mean())
+    np.testing.assert_allclose(agg['rsrp'], cells['rsrp'].mean())
+
+
+def test_text_columns_get_the_most_frequent_value():
+    df = gps_fixes()
+    agg, _ = grid_aggregates(chunked(df, 1000), 'lat', 'lon', ['band'], 16)
+    expected = expected_cells(df, 4)['band'].agg(lambda values: values.value_counts().idxmax())
+    assert agg['band'].tolist() == expected.tolist()
+
+
+def test_points_without_coordinates_are_skipped():
+    df = pd.DataFrame({'lat': [1.0, np.nan, 2.0, 'x'], 'lon': [1.0, 1.0, np.nan, 2.0], 'v': [1, 2, 3, 4]})
+    agg, rows = grid_aggregates(chunked(df, 2), 'lat', 'lon', ['v'], 4)
+    assert rows == 4 and agg['points'].tolist() == [1] and agg['v'].tolist() == [1.0]
+    with pytest.raises(ValueError):
+        grid_aggregates(chunked(df.iloc[[1]], 2), 'lat', 'lon', ['v'], 4)
+
+
+@pytest.fixture
+def no_show(monkeypatch):
+    def show(*args, **kwargs):
+        raise AssertionError('maps must not open a browser on the server')
+    monkeypatch.setattr(go.Figure, 'show', show)
+
+
+def test_large_maps_are_thinned_and_returned(flask_app, no_show):
+    df = gps_fixes()
+    config = {'latitude_column': 'lat', 'longitude_column': 'lon', 'color_column': 'band',
+              'hover_columns': ['rsrp'], 'max_points': 400}
+    fig = flask_app.scatter_on_map(df, config)
+    points = sum(len(trace.lat) for trace in fig.data)
+    assert 0 < points <= 400
+    # One trace per most frequent band, hovering shows the cell's point count
+    assert {trace.name for trace in fig.data} <= {'b3', 'b7', 'b20'}
+    assert 'points' in fig.data[0].hovertemplate
+
+    small = flask_app.scatter_on_map(df.iloc[:300], config)
+    assert sum(len(trace.lat) for trace in small.data) == 300
+
+
+def test_dash_maps_are_thinned(dash_app, monkeypatch, no_show):
+    monkeypatch.setattr(dash_app, 'MAP_MAX_POINTS', 400)
+    df = gps_fixes()[['lat', 'lon', 'rsrp']]
+    fig = dash_app.scatter_on_map(df, 'lat', ['rsrp'], 'Coverage')
+    assert 0 < len(fig.data[0].lat) <= 400
+    assert sum(fig.data[0].customdata) == len(df)
+    fig = dash_app.scatter_on_map(df.iloc[:300], 'lat', ['rsrp'], 'Coverage')
+    assert len(fig.data[0].lat) == 300 and fig.data[0].customdata is None
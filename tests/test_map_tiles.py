@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import (MERCATOR_MAX_LAT, MapIndex, compact_bits, lon_ranges, spread_bits, viewport_clusters,
+                 viewport_points)
+
+rng = np.random.default_rng(0)
+
+
+def test_compact_bits_undoes_spread_bits():
+    values = rng.integers(0, 2 ** 32, 10_000, dtype=np.uint64)
+    values[:2] = [0, 2 ** 32 - 1]
+    spread = spread_bits(values)
+    assert not (spread & np.uint64(0xAAAAAAAAAAAAAAAA)).any()
+    np.testing.assert_array_equal(compact_bits(spread), values)
+    # Odd bits (the other coordinate of a code) are ignored
+    np.testing.assert_array_equal(compact_bits(spread | (spread << np.uint64(1))), values)
+
+
+@pytest.mark.parametrize('west, east, expected', [
+    (10, 20, [(10, 20)]),
+    (170, 190, [(170, 180), (-180, -170)]),
+    (-190, -170, [(170, 180), (-180, -170)]),
+    (170, -170, [(170, 180), (-180, -170)]),
+    (-180, 180, [(-180, 180)]),
+    (-400, 400, [(-180, 180)]),
+    (540, 550, [(-180, -170)]),
+])
+def test_lon_ranges(west, east, expected):
+    assert lon_ranges(west, east) == pytest.approx(expected)
+
+
+@pytest.fixture(scope='module')
+def index():
+    n = 20_000
+    lat = np.concatenate([rng.uniform(-90, 90, n), [MERCATOR_MAX_LAT, -MERCATOR_MAX_LAT, 89.5, -89.5, 0, 0, np.nan]])
+    lon = np.concatenate([rng.uniform(-180, 180, n), [180, -180, 179.99, -179.99, 180, -180, 5]])
+    # Clusters of points around the antimeridian and a city
+    lat[:2000] = rng.normal(-17, 0.5, 2000)
+    lon[:2000] = (rng.normal(180, 0.5, 2000) + 180) % 360 - 180
+    lat[2000:4000] = rng.normal(59.9, 0.01, 2000)
+    lon[2000:4000] = rng.normal(10.75, 0.01, 2000)
+    return MapIndex(lat, lon, {'id': np.arange(len(lat), dtype=np.float64)})
+
+
+def inside(index, bounds):
+    """Ids of the points in bounds, the slow way"""
+    west, south, east, north = bounds
+    span = east - west if east >= west else east - west + 360
+    in_lon = (span >= 360) | ((index.lon - west) % 360 <= span)
+    return np.sort(index.values['id'][in_lon & (index.lat >= south) & (index.lat <= north)])
+
+
+def random_bounds(count):
+    for _ in range(count):
+        width = rng.choice([0.05, 1, 20, 200])
+        west = rng.uniform(-200, 180)
+        south = rng.uniform(-95, 85)
+        yield [west, south, west + width * rng.uniform(0.5, 1), south + width * rng.uniform(0.1, 0.5)]
+
+
+EDGE_BOUNDS = [
+    [-180, -90, 180, 90],
+    [170, -20, 190, -14],
+    [-190, -20, -170, -14],
+    [179, -20, -179, -14],
+    [179.9, MERCATOR_MAX_LAT - 1, 180, 90],
+    [-179.95, -90, -179.9, -MERCATOR_MAX_LAT + 1],
+    [10.7, 59.85, 10.8, 59.95],
+    [0, 0, 0, 0],
+]
+
+
+@pytest.mark.parametrize('bounds', EDGE_BOUNDS + list(random_bounds(60)))
+def test_viewport_points_are_exactly_those_in_bounds(index, bounds):
+    for zoom in (0, 3, 8, 14):
+        slices, used_zoom = index.viewport_slices(bounds, zoom)
+        assert used_zoom <= zoom and slices == sorted(slices)
+        lat, lon, counts, values = viewport_points(index, slices, bounds)
+        np.testing.assert_array_equal(np.sort(values['id']), inside(index, bounds))
+        assert counts.sum() == len(lat) == len(lon)
+
+
+def test_clusters_count_every_point_in_the_tiles(index):
+    for bounds in EDGE_BOUNDS[:4]:
+        slices, zoom = index.viewport_slices(bounds, 6)
+        lat, lon, counts, values = viewport_clusters(index, slices, zoom + 5)
+        assert counts.sum() == sum(hi - lo for lo, hi in slices)
+        assert counts.sum() >= len(inside(index, bounds)) and len(counts) < counts.sum()
+        # Every slice is a distinct part of the index
+        assert len(set(slices)) == len(slices)
+        assert np.all((lon >= -180) & (lon <= 180)) and not np.isnan(values['id']).any()
+    world, _ = index.viewport_slices([-180, -90, 180, 90], 0)
+    assert sum(hi - lo for lo, hi in world) == len(index.lat)
+
+
+def test_map_tiles_route(client, tmp_path):
+    df = pd.DataFrame({'lat': rng.normal(-17, 0.5, 5000), 'lon': (rng.normal(180, 0.5, 5000) + 180) % 360 - 180,
+                       'rsrp': rng.normal(-90, 10, 5000)})
+    df.to_csv(tmp_path / 'fixes.csv', index=False)
+    config = {'latitude_column': 'lat', 'longitude_column': 'lon', 'color_column': 'rsrp', 'max_points': 10_000}
+    body = {'filename': 'fixes.csv', 'config': config, 'bounds': [178, -18, 182, -16], 'zoom': 7}
+    result = client.post('/map_tiles', json=body).get_json()
+    expected = ((df['lat'] >= -18) & (df['lat'] <= -16) & ((df['lon'] >= 178) | (df['lon'] <= -178))).sum()
+    assert result['success'] and not result['clustered'] and result['points'] == expected
+    assert result['trace']['type'] == 'scattermapbox'
+
+    clustered = client.post('/map_tiles', json=dict(body, config=dict(config, max_points=100))).get_json()
+    assert clustered['clustered'] and clustered['points'] >= expected
+    density = client.post('/map_tiles', json=dict(body, config=dict(config, tile_mode='density'))).get_json()
+    assert density['trace']['type'] == 'densitymapbox'
+
+    assert client.post('/map_tiles', json=dict(body, bounds=[1, 2])).status_code == 400
+    assert client.post('/map_tiles', json=dict(body, filename='missing.csv')).status_code == 404
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+rng = np.random.default_rng(0)
+
+
+@pytest.fixture
+def big_csv(flask_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(flask_app, 'OUT_OF_CORE_CHUNK_ROWS', 997)
+    df = pd.DataFrame({'x': rng.permutation(10_000) / 10, 'y': rng.normal(size=10_000),
+                       'z': rng.integers(0, 50, 10_000)})
+    df.loc[::13, 'y'] = np.nan
+    df.to_csv(tmp_path / 'big.csv', index=False)
+    return df
+
+
+def test_bucket_aggregates_match_pandas(flask_app, big_csv, tmp_path):
+    agg, rows = flask_app.stream_bucket_aggregates(str(tmp_path / 'big.csv'), 'x', ['y', 'z'], 40)
+    assert rows == len(big_csv)
+    lo, hi = big_csv['x'].min(), big_csv['x'].max()
+    width = (hi - lo) / 40
+    bucket = np.minimum(((big_csv['x'] - lo) / width).astype(int), 39)
+    expected = big_csv.groupby(bucket)
+    np.testing.assert_allclose(agg['x'], lo + (expected.size().index + 0.5) * width)
+    np.testing.assert_allclose(agg['y'], expected['y'].mean())
+    np.testing.assert_allclose(agg['y_min'], expected['y'].min())
+    np.testing.assert_allclose(agg['z_max'], expected['z'].max())
+    np.testing.assert_array_equal(agg['y_count'], expected['y'].count())
+
+
+def test_large_files_render_aggregates(flask_app, big_csv, tmp_path, monkeypatch):
+    path = str(tmp_path / 'big.csv')
+    config = {'x_column': 'x', 'y_columns': ['y'], 'max_points': 100}
+    assert not flask_app.use_out_of_core(path, 'single_line', config)
+    assert flask_app.use_out_of_core(path, 'single_line', dict(config, aggregate='on'))
+    monkeypatch.setattr(flask_app, 'OUT_OF_CORE_FILE_MB', 0)
+    assert flask_app.use_out_of_core(path, 'single_line', config)
+    assert not flask_app.use_out_of_core(path, 'single_line', dict(config, aggregate='off'))
+    assert not flask_app.use_out_of_core(path, 'ping', config)
+
+    monkeypatch.setattr(flask_app, 'load_dataset', None)
+    result = flask_app.render_graph('big.csv', 'single_line', config, lambda phase, percent: None)
+    assert result['aggregated'] and result['point_counts']['original'] == len(big_csv)
+    names = [trace.get('name') for trace in result['graph']['data']]
+    assert names == ['y', None, 'y min/max']
+
+
+def test_index_shows_the_threshold(client, flask_app):
+    page = client.get('/').get_data(as_text=True)
+    assert f'aggregate files over {flask_app.OUT_OF_CORE_FILE_MB} MB' in page
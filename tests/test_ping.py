@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from app import parse_ping_log, ping_plotter
+
+LINUX = """PING example.com (93.184.216.34) 56(84) bytes of data.
+64 bytes from 93.184.216.34 (93.184.216.34): icmp_seq=1 ttl=56 time=11.2 ms
+64 bytes from 93.184.216.34 (93.184.216.34): icmp_seq=2 ttl=56 time=9.87 ms
+no answer yet for icmp_seq=3
+From 10.0.0.1 icmp_seq=4 Destination Host Unreachable
+64 bytes from 93.184.216.34 (93.184.216.34): icmp_seq=5 ttl=56 time=10 ms
+
+--- example.com ping statistics ---
+5 packets transmitted, 3 received, 40% packet loss, time 4005ms
+rtt min/avg/max/mdev = 9.870/10.356/11.200/0.601 ms
+"""
+
+LINUX_TIMESTAMPS = """PING 8.8.8.8 (8.8.8.8) 56(84) bytes of data.
+[1700000000.250000] 64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=14.2 ms
+[1700000001.250000] no answer yet for icmp_seq=2
+[1700000002.250000] 64 bytes from 8.8.8.8: icmp_seq=3 ttl=117 time=15.0 ms
+"""
+
+MACOS = """PING 8.8.8.8 (8.8.8.8): 56 data bytes
+64 bytes from 8.8.8.8: icmp_seq=0 ttl=117 time=14.123 ms
+Request timeout for icmp_seq 1
+64 bytes from 8.8.8.8: icmp_seq=2 ttl=117 time=13.456 ms
+
+--- 8.8.8.8 ping statistics ---
+3 packets transmitted, 2 packets received, 33.3% packet loss
+round-trip min/avg/max/stddev = 13.456/13.790/14.123/0.334 ms
+"""
+
+WINDOWS = """
+Pinging 8.8.8.8 with 32 bytes of data:
+Reply from 8.8.8.8: bytes=32 time=14ms TTL=117
+Request timed out.
+Reply from 8.8.8.8: bytes=32 time<1ms TTL=117
+
+Ping statistics for 8.8.8.8:
+    Packets: Sent = 3, Received = 2, Lost = 1 (33% loss),
+Approximate round trip times in milli-seconds:
+    Minimum = 0ms, Maximum = 14ms, Average = 7ms
+"""
+
+IPV6 = """PING 2001:4860:4860::8888(2001:4860:4860::8888) 56 data bytes
+64 bytes from 2001:4860:4860::8888: icmp_seq=1 ttl=117 time=15.1 ms
+16 bytes from 2001:4860:4860::8888, icmp_seq=2 hlim=117 time=14.5 ms
+64 bytes from dns.google (2001:4860:4860::8888): icmp_seq=3 ttl=117 time=16.0 ms
+Reply from 2001:4860:4860::8888: time=13ms
+"""
+
+
+def parse(tmp_path, text):
+    path = tmp_path / 'ping.log'
+    path.write_bytes(text.encode())
+    return parse_ping_log(str(path))
+
+
+def test_linux_replies_timeouts_and_unreachables(tmp_path):
+    samples = parse(tmp_path, LINUX)
+    assert samples['seq'].tolist() == [1, 2, 3, 4, 5]
+    assert samples['lost'].tolist() == [False, False, True, True, False]
+    np.testing.assert_array_equal(samples['rtt_ms'], [11.2, 9.87, np.nan, np.nan, 10])
+    np.testing.assert_array_equal(samples['ttl'], [56, 56, np.nan, np.nan, 56])
+    assert 'timestamp' not in samples
+
+
+def test_linux_timestamps(tmp_path):
+    samples = parse(tmp_path, LINUX_TIMESTAMPS)
+    assert samples['timestamp'].dt.strftime('%H:%M:%S.%f').tolist() == [
+        '22:13:20.250000', '22:13:21.250000', '22:13:22.250000']
+    assert samples['lost'].tolist() == [False, True, False]
+
+
+def test_macos(tmp_path):
+    samples = parse(tmp_path, MACOS)
+    assert samples['seq'].tolist() == [0, 1, 2]
+    assert samples['lost'].tolist() == [False, True, False]
+    np.testing.assert_array_equal(samples['rtt_ms'], [14.123, np.nan, 13.456])
+
+
+def test_windows(tmp_path):
+    samples = parse(tmp_path, WINDOWS)
+    assert samples['lost'].tolist() == [False, True, False]
+    np.testing.assert_array_equal(samples['rtt_ms'], [14, np.nan, 1])
+    np.testing.assert_array_equal(samples['ttl'], [117, np.nan, 117])
+    assert samples['seq'].isna().all()
+
+
+def test_ipv6(tmp_path):
+    samples = parse(tmp_path, IPV6)
+    assert samples['lost'].sum() == 0
+    np.testing.assert_array_equal(samples['rtt_ms'], [15.1, 14.5, 16.0, 13])
+    np.testing.assert_array_equal(samples['seq'], [1, 2, 3, np.nan])
+
+
+def test_logs_without_probes_are_errors(tmp_path):
+    with pytest.raises(ValueError, match='empty'):
+        parse(tmp_path, '')
+    with pytest.raises(ValueError, match='No ping replies'):
+        parse(tmp_path, 'ping: unknown host example.invalid\n')
+
+
+def test_plot_has_rtt_jitter_loss_and_timeouts(flask_app, tmp_path):
+    (tmp_path / 'ping.log').write_text(LINUX)
+    fig = ping_plotter(str(tmp_path / 'ping.log'), {'stats_window': 2})
+    names = [trace.name for trace in fig.data]
+    assert names[0] == 'RTT (ms)' and names[-1] == 'Timeouts (2)'
+    assert list(fig.data[-1].x) == [3, 4]
+    loss = fig.data[2]
+    np.testing.assert_array_equal(loss.y, [0, 0, 50, 100, 50])
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from render_mode import WEBGL_POINT_THRESHOLD, apply_render_mode
+
+
+def line_figure(points, traces=2):
+    fig = go.Figure()
+    for i in range(traces):
+        fig.add_trace(go.Scatter(x=np.arange(points), y=np.arange(points) * i, mode='lines+markers',
+                                 name=f'y{i}', yaxis='y2' if i else 'y', line=dict(width=3, color='red')))
+    fig.update_layout(title='Lines', yaxis2=dict(overlaying='y', side='right'))
+    return fig
+
+
+def test_small_figures_stay_svg():
+    fig = line_figure(100)
+    assert apply_render_mode(fig) is fig
+    assert apply_render_mode(fig, 'auto', 50) is not fig
+
+
+def test_large_figures_switch_to_webgl_keeping_styles():
+    fig = apply_render_mode(line_figure(WEBGL_POINT_THRESHOLD // 2))
+    assert [trace.type for trace in fig.data] == ['scattergl', 'scattergl']
+    assert [trace.yaxis for trace in fig.data] == ['y', 'y2']
+    assert fig.data[1].line.color == 'red' and fig.data[1].name == 'y1'
+    assert fig.layout.title.text == 'Lines' and fig.layout.yaxis2.overlaying == 'y'
+    assert len(fig.data[0].x) == WEBGL_POINT_THRESHOLD // 2
+
+
+@pytest.mark.parametrize('mode, expected', [('svg', 'scatter'), ('webgl', 'scattergl')])
+def test_forced_modes(mode, expected):
+    assert apply_render_mode(line_figure(10), mode).data[0].type == expected
+    assert apply_render_mode(line_figure(WEBGL_POINT_THRESHOLD), mode).data[0].type == expected
+
+
+def test_other_trace_types_are_left_alone():
+    fig = go.Figure([go.Bar(x=[1, 2], y=[3, 4]), go.Scatter(x=[1, 2], y=[3, 4])])
+    assert [trace.type for trace in apply_render_mode(fig, 'webgl').data] == ['bar', 'scattergl']
+
+
+def test_dual_line_gives_every_series_its_own_marker(flask_app):
+    df = pd.DataFrame({f's{i}': np.arange(10) * i for i in range(12)})
+    config = {'x_column': 's1', 'y1_columns': [f's{i}' for i in range(12)], 'y2_columns': ['s2'],
+              'render_mode': 'webgl'}
+    fig = flask_app.render_figure(flask_app.create_dual_line_chart(df, config), config)
+    symbols = [trace.marker.symbol for trace in fig.data[:11]]
+    assert len(set(symbols)) == 11
+    assert {trace.type for trace in fig.data} == {'scattergl'}
@@ -0,0 +1,74 @@
+import logging
+import types
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def frame(rows=1000):
+    return pd.DataFrame({'x': np.arange(rows), 'y': np.arange(rows) / 2})
+
+
+FRAME_BYTES = int(frame().memory_usage(index=True, deep=True).sum())
+
+
+@pytest.fixture
+def clock(dash_app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dash_app, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_sessions_over_the_budget_are_evicted_least_recently_used(dash_app, clock, caplog):
+    store = dash_app.SessionDatasets(2 * FRAME_BYTES, 3600)
+    a, b = frame(), frame()
+    store.put('a', a)
+    store.put('b', b)
+    clock[0] += 1
+    assert store.get('a') is a
+    with caplog.at_level(logging.INFO):
+        store.put('c', frame())
+    assert store.get('b') is None and store.get('a') is a
+    assert store.total_bytes == 2 * FRAME_BYTES
+    assert 'Evicting data of session b' in caplog.text
+
+
+def test_the_uploading_session_is_never_evicted(dash_app, clock):
+    store = dash_app.SessionDatasets(FRAME_BYTES // 2, 3600)
+    store.put('a', frame())
+    big = frame(5000)
+    store.put('b', big)
+    assert store.get('a') is None and store.get('b') is big
+    # Uploading again replaces the session's data instead of adding to it
+    store.put('b', frame())
+    assert store.total_bytes == FRAME_BYTES
+
+
+def test_idle_sessions_expire(dash_app, clock):
+    store = dash_app.SessionDatasets(10 * FRAME_BYTES, 60)
+    store.put('a', frame())
+    store.put('b', frame())
+    clock[0] += 45
+    assert store.get('a') is not None
+    clock[0] += 30
+    assert store.get('b') is None and store.get('a') is not None
+    assert list(store.entries) == ['a'] and store.total_bytes == FRAME_BYTES
+
+
+def test_sessions_see_only_their_own_data(dash_app, clock, monkeypatch):
+    monkeypatch.setattr(dash_app, 'session_datasets', dash_app.SessionDatasets(10 * FRAME_BYTES, 3600))
+    dash_app.session_datasets.put('a', frame(10))
+    dash_app.session_datasets.put('b', frame(20))
+    _, info_a, _ = dash_app.generate_graph(1, 'scatter', 'x', ['y'], 'A', 'auto', 'a')
+    _, info_b, _ = dash_app.generate_graph(1, 'scatter', 'x', ['y'], 'B', 'auto', 'b')
+    assert '10 data points' in info_a.children and '20 data points' in info_b.children
+    figure, _, alert = dash_app.generate_graph(1, 'scatter', 'x', ['y'], 'C', 'auto', 'c')
+    assert figure == {} and 'expired' in alert.children
+
+
+def test_cleaning_leaves_the_stored_data_alone(dash_app):
+    df = pd.DataFrame({'name': [' A', 'b ', ' A'], 'value': [1.0, None, 1.0]})
+    stored = df.copy()
+    cleaned = dash_app.clean_data(df, ['duplicates', 'empty', 'text'])
+    assert cleaned['name'].tolist() == ['a']
+    pd.testing.assert_frame_equal(df, stored)
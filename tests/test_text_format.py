@@ -0,0 +1,93 @@
+"""Delimiter, header and preamble detection of text_format.sniff_text_format"""
+import io
+import pandas as pd
+from text_format import sniff_text_format
+
+
+def write(tmp_path, text, name='data.txt'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def read_back(path, detected):
+    with open(path, 'rb') as f:
+        return pd.read_csv(io.BytesIO(f.read()), **detected['options'])
+
+
+def test_tab_separated_with_header(tmp_path):
+    path = write(tmp_path, 'time\tvalue\tname\n' + ''.join(f'{i}\t{i * 1.5}\tn{i}\n' for i in range(50)))
+    detected = sniff_text_format(path)
+    assert detected['tabular']
+    assert detected['options']['sep'] == '\t'
+    assert detected['options']['header'] == 0
+    assert detected['columns'] == ['time', 'value', 'name']
+    assert detected['numeric_columns'] == ['time', 'value']
+
+
+def test_semicolon_with_decimal_comma(tmp_path):
+    path = write(tmp_path, 'a;b;c\n' + ''.join(f'{i};{i},5;{i * 2},25\n' for i in range(50)))
+    detected = sniff_text_format(path)
+    assert detected['options']['sep'] == ';'
+    assert detected['options']['decimal'] == ','
+    df = read_back(path, detected)
+    assert df['b'].iloc[3] == 3.5
+
+
+def test_headerless_file_gets_generated_names(tmp_path):
+    path = write(tmp_path, ''.join(f'{i},{i * 2},{i * 3}\n' for i in range(50)))
+    detected = sniff_text_format(path)
+    assert detected['options']['header'] is None
+    assert detected['columns'] == ['column_1', 'column_2', 'column_3']
+    assert len(read_back(path, detected)) == 50
+
+
+def test_preamble_is_skipped(tmp_path):
+    preamble = 'Instrument: probe 7, serial 1234\nExported by: lab, station, west\n\n'
+    path = write(tmp_path, preamble + 'x,y,z\n' + ''.join(f'{i},{i + 1},{i + 2}\n' for i in range(50)))
+    detected = sniff_text_format(path)
+    assert detected['options']['skiprows'] == 3
+    assert detected['columns'] == ['x', 'y', 'z']
+    assert read_back(path, detected)['x'].tolist() == list(range(50))
+
+
+def test_comment_lines(tmp_path):
+    path = write(tmp_path, '# generated\nx,y\n' + ''.join(f'{i},{i}\n' for i in range(20)) + '# end\n')
+    detected = sniff_text_format(path)
+    assert detected['options']['comment'] == '#'
+    assert len(read_back(path, detected)) == 20
+
+
+def test_leading_comments_keep_hashes_in_values(tmp_path):
+    path = write(tmp_path, '# generated\n% by hand\nunit,load\n' + ''.join(f'Unit #{i},{i}\n' for i in range(20)))
+    detected = sniff_text_format(path)
+    assert 'comment' not in detected['options']
+    assert read_back(path, detected)['unit'].tolist() == [f'Unit #{i}' for i in range(20)]
+
+
+def test_whitespace_separated(tmp_path):
+    path = write(tmp_path, 'x   y   z\n' + ''.join(f'{i}  {i * 2}    {i * 3}\n' for i in range(50)), 'data.log')
+    detected = sniff_text_format(path)
+    assert detected['options']['sep'] == r'\s+'
+    assert detected['numeric_columns'] == ['x', 'y', 'z']
+
+
+def test_dates_and_times_of_day(tmp_path):
+    rows = ''.join(f'2024-05-{day:02d} 10:00:00,{10 + day % 12}:30,{day}\n' for day in range(1, 29))
+    path = write(tmp_path, 'timestamp,clock,value\n' + rows)
+    detected = sniff_text_format(path)
+    # "10:30" alone must not become today's date
+    assert detected['date_columns'] == ['timestamp']
+
+
+def test_ping_log_is_not_tabular(tmp_path):
+    lines = ['PING example.com (93.184.216.34) 56(84) bytes of data.']
+    lines += [f'64 bytes from 93.184.216.34: icmp_seq={i} ttl=56 time={10 + i % 7}.{i % 10} ms'
+              for i in range(1, 40)]
+    lines += ['Request timeout for icmp_seq 40', '',
+              '--- example.com ping statistics ---',
+              '40 packets transmitted, 39 received, 2.5% packet loss, time 39042ms',
+              'rtt min/avg/max/mdev = 10.0/13.1/16.9/2.0 ms']
+    detected = sniff_text_format(write(tmp_path, '\n'.join(lines) + '\n', 'ping.log'))
+    assert not detected['tabular']
+    assert detected['columns'] == []
@@ -0,0 +1,72 @@
+import base64
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from app import BINARY_MIN_LENGTH, encode_array, encode_figure, encode_trace
+
+N = BINARY_MIN_LENGTH
+
+
+def decode(encoded):
+    return np.frombuffer(base64.b64decode(encoded['bdata']), dtype='<' + encoded['dtype'])
+
+
+@pytest.mark.parametrize('values, dtype', [
+    (np.arange(N), 'i1'),
+    (np.arange(N) + 150, 'u1'),
+    (np.arange(N) * -300, 'i2'),
+    (np.arange(N) * 1000, 'u2'),
+    (np.arange(N) * -100_000, 'i4'),
+    (np.arange(N) + 3_000_000_000, 'u4'),
+    (np.arange(N) * 10 ** 10, 'f8'),
+])
+def test_integers_use_the_smallest_type(values, dtype):
+    encoded, is_date = encode_array(values)
+    assert encoded['dtype'] == dtype and not is_date
+    assert np.array_equal(decode(encoded), values)
+
+
+def test_floats_narrow_only_when_exact():
+    halves = np.arange(N) / 2
+    assert encode_array(halves)[0]['dtype'] == 'f4'
+    tenths = np.arange(N) / 10
+    encoded = encode_array(tenths)[0]
+    assert encoded['dtype'] == 'f8' and np.array_equal(decode(encoded), tenths)
+    with_nan = np.where(np.arange(N) % 5, halves, np.nan)
+    assert np.array_equal(decode(encode_array(with_nan)[0]), with_nan, equal_nan=True)
+    huge = np.full(N, 1e300)
+    assert decode(encode_array(huge)[0]).tolist() == huge.tolist()
+
+
+def test_datetimes_become_milliseconds():
+    dates = pd.date_range('2024-01-01', periods=N, freq='min').to_numpy().copy()
+    dates[3] = np.datetime64('NaT')
+    encoded, is_date = encode_array(dates)
+    assert is_date and encoded['dtype'] == 'f8'
+    ms = decode(encoded)
+    assert ms[0] == pd.Timestamp('2024-01-01').value / 1e6 and np.isnan(ms[3])
+
+
+def test_short_and_non_numeric_arrays_stay_json():
+    assert encode_array(np.arange(N - 1)) is None
+    assert encode_array(np.array(['a'] * N, dtype=object)) is None
+    assert encode_array(np.zeros((N, 2))) is None
+    assert decode(encode_array(np.arange(N) % 2 == 0)[0]).tolist() == [1, 0] * (N // 2)
+
+
+def test_date_traces_get_a_date_axis():
+    trace = {'x': pd.date_range('2024-01-01', periods=N).to_numpy(), 'y': np.arange(N), 'yaxis': 'y2',
+             'marker': {'size': np.arange(N), 'symbol': 'x'}}
+    layout = {}
+    encode_trace(trace, layout)
+    assert layout == {'xaxis': {'type': 'date'}}
+    assert trace['y']['dtype'] == 'i1' and trace['marker']['size']['dtype'] == 'i1'
+    assert trace['marker']['symbol'] == 'x'
+
+
+def test_figures_encode_every_trace():
+    fig = go.Figure([go.Scatter(x=np.arange(N), y=np.arange(N) / 2), go.Scatter(x=[1, 2], y=[3, 4])])
+    figure = encode_figure(fig)
+    assert figure['data'][0]['y']['dtype'] == 'f4'
+    assert list(figure['data'][1]['x']) == [1, 2]
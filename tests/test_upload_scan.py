@@ -0,0 +1,58 @@
+import io
+import os
+import time
+import pytest
+
+
+@pytest.fixture
+def uploads(flask_app, monkeypatch):
+    monkeypatch.setattr(flask_app, 'upload_info', {})
+    return flask_app
+
+
+def upload(client, name, text):
+    return client.post('/upload', data={'file': (io.BytesIO(text.encode()), name)},
+                       content_type='multipart/form-data')
+
+
+def wait_for_info(client, filename):
+    for _ in range(200):
+        info = client.get(f'/dataset_info/{filename}').get_json()
+        if info.get('status') != 'pending':
+            return info
+        time.sleep(0.05)
+    raise AssertionError(f'{filename} was never scanned')
+
+
+def test_upload_answers_from_a_sample_and_counts_rows_in_the_background(client, uploads, tmp_path):
+    rows = ''.join(f'{i},{i * 0.5},name{i}\n' for i in range(5000))
+    response = upload(client, 'data.csv', 'a,b,c\n' + rows)
+    body = response.get_json()
+    assert response.status_code == 200 and body['success']
+    assert body['columns'] == ['a', 'b', 'c'] and body['numeric_columns'] == ['a', 'b']
+    assert body['row_count'] is None and body['row_count_pending']
+    assert (tmp_path / 'data.csv').read_text().count('\n') == 5001
+
+    info = wait_for_info(client, 'data.csv')
+    assert info['status'] == 'ready' and info['row_count'] == 5000
+    assert info['columns'] == ['a', 'b', 'c'] and info['numeric_columns'] == ['a', 'b']
+    assert 'fingerprint' not in info
+
+
+def test_text_after_the_sample_makes_a_column_non_numeric(client, uploads, monkeypatch):
+    monkeypatch.setattr(uploads, 'SCHEMA_SAMPLE_BYTES', 64)
+    text = 'a,b\n' + ''.join(f'{i},{i}\n' for i in range(100)) + 'x,101\n'
+    assert upload(client, 'mixed.csv', text).get_json()['numeric_columns'] == ['a', 'b']
+    info = wait_for_info(client, 'mixed.csv')
+    assert info['row_count'] == 101 and info['numeric_columns'] == ['b']
+
+
+def test_info_of_a_replaced_or_deleted_upload_is_dropped(client, uploads, tmp_path):
+    upload(client, 'data.csv', 'a\n1\n2\n')
+    assert wait_for_info(client, 'data.csv')['row_count'] == 2
+    upload(client, 'data.csv', 'a\n1\n2\n3\n')
+    assert wait_for_info(client, 'data.csv')['row_count'] == 3
+
+    os.remove(tmp_path / 'data.csv')
+    assert client.get('/dataset_info/data.csv').status_code == 404
+    assert 'data.csv' not in uploads.upload_info
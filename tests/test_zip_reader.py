@@ -0,0 +1,41 @@
+import zipfile
+import pandas as pd
+import pytest
+from zip_reader import ZIP_SOURCE_COLUMN, read_zip_member, zip_csv_members
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / 'runs.zip'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('run1.csv', 'x,y\n1,10\n2,20\n')
+        zf.writestr('notes.txt', 'not a table')
+        zf.writestr('__MACOSX/._run1.csv', 'resource fork')
+        zf.writestr('sub/run2.CSV', 'x,y\n3,30\n')
+        zf.writestr('run3.csv', 'x,y\n4,40\n5,50\n6,60\n')
+    return path
+
+
+def test_members_skip_other_files_and_resource_forks(archive):
+    with zipfile.ZipFile(archive) as zf:
+        assert zip_csv_members(zf) == ['run1.csv', 'sub/run2.CSV', 'run3.csv']
+
+
+def test_member_rows_are_tagged_with_their_member(archive):
+    df = read_zip_member(str(archive), 'sub/run2.CSV')
+    assert df.to_dict('list') == {'x': [3], 'y': [30], ZIP_SOURCE_COLUMN: ['sub/run2.CSV']}
+
+
+def test_every_member_is_parsed_and_stacked_in_order(flask_app, archive):
+    df = flask_app.read_zip_archive(str(archive))
+    assert df['x'].tolist() == [1, 2, 3, 4, 5, 6]
+    assert df[ZIP_SOURCE_COLUMN].dtype == 'category'
+    assert df[ZIP_SOURCE_COLUMN].tolist() == ['run1.csv'] * 2 + ['sub/run2.CSV'] + ['run3.csv'] * 3
+
+
+def test_archive_without_csv_members_is_an_error(flask_app, tmp_path):
+    path = tmp_path / 'empty.zip'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('readme.txt', 'nothing here')
+    with pytest.raises(ValueError, match='No CSV'):
+        flask_app.read_zip_archive(str(path))
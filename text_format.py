@@ -0,0 +1,198 @@
+"""
+Delimiter and header sniffing for txt/log uploads.
+
+A sample of the file's first bytes is inspected once to decide how to parse
+it: delimiter, the line the table starts on, whether that line is a header,
+comment prefix, decimal separator and datetime columns. The result is a set
+of pandas.read_csv options for the C engine, so a file is never parsed more
+than once to find its format.
+"""
+import io
+import re
+import warnings
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# TEXT FORMAT SNIFFING CONFIGURATION
+# =============================================================================
+# SNIFF_SAMPLE_BYTES: bytes read from the start of the file
+# TEXT_DELIMITERS: candidates in order of preference when equally consistent
+# TABULAR_MIN_CONSISTENCY: share of lines after the table start that must
+#   have the usual field count for the file to count as a table; free-form
+#   logs (e.g. ping output) fall below it
+# DATE_MIN_SHARE: share of a text column's sample values that must parse as
+#   dates for it to be read as a datetime column
+# =============================================================================
+SNIFF_SAMPLE_BYTES = 256 * 1024
+TEXT_DELIMITERS = ['\t', ',', ';', '|', r'\s+']
+COMMENT_PREFIXES = ('#', '%')
+TABULAR_MIN_CONSISTENCY = 0.9
+DATE_MIN_SHARE = 0.9
+
+NUMBER_PATTERNS = {
+    '.': re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$'),
+    ',': re.compile(r'^[-+]?(\d+,?\d*|,\d+)([eE][-+]?\d+)?$')
+}
+# A full date (2024-05-01, 01/05/2024); times of day alone are not dates
+DATE_PART_PATTERN = r'\d{1,4}[-/]\d{1,2}[-/]\d{1,4}'
+DECIMAL_COMMA = re.compile(r'^[-+]?\d+,\d+$')
+DECIMAL_POINT = re.compile(r'^[-+]?\d+\.\d+$')
+
+
+def read_sample(filepath, limit=None):
+    """First SNIFF_SAMPLE_BYTES of a file (or of its first ``limit`` bytes), cut back
+    to the last complete line"""
+    size = SNIFF_SAMPLE_BYTES if limit is None else min(SNIFF_SAMPLE_BYTES, limit)
+    with open(filepath, 'rb') as f:
+        sample = f.read(size)
+        truncated = (limit is None or limit > size) and f.read(1) != b''
+    if truncated and b'\n' in sample:
+        sample = sample[:sample.rindex(b'\n') + 1]
+    return sample
+
+
+def split_fields(line, delimiter):
+    fields = line.split() if delimiter == r'\s+' else line.split(delimiter)
+    return [field.strip().strip('"\'') for field in fields]
+
+
+def table_start(matches, breaks):
+    """Index of the first line of the longest run of lines with the usual field count.
+
+    Runs are also broken by blank lines, so a preamble that happens to have
+    as many fields as the table is not taken for its header.
+    """
+    best_start, best_length, start = 0, 0, None
+    for i, (match, broken) in enumerate(zip(matches, breaks)):
+        if not match or broken:
+            start = i if match else None
+        elif start is None:
+            start = i
+        if start is not None and i - start + 1 > best_length:
+            best_start, best_length = start, i - start + 1
+    return best_start
+
+
+def pick_delimiter(lines, breaks):
+    """(consistency, delimiter, width, first line index) of the best delimiter, or None.
+
+    Equally consistent delimiters are told apart by how early their table
+    starts (decimal commas split the rows of a ';' file evenly, but not its
+    header), then by the number of fields they give. Whitespace only wins
+    when it is strictly more consistent.
+    """
+    best = None
+    for delimiter in TEXT_DELIMITERS:
+        counts = np.array([len(split_fields(line, delimiter)) for line in lines])
+        width = int(np.bincount(counts).argmax())
+        if width < 2:
+            continue
+        first = table_start(counts == width, breaks)
+        consistency = float(np.mean(counts[first:] == width))
+        if (best is None or consistency > best[0]
+                or (consistency == best[0] and delimiter != r'\s+'
+                    and (first, -width) < (best[3], -best[2]))):
+            best = (consistency, delimiter, width, first)
+    return best
+
+
+def is_header(first, rows, number):
+    """A header has more non-numeric fields than the rows below it"""
+    text_fields = lambda fields: sum(1 for field in fields if field and not number.match(field))
+    below = [text_fields(fields) for fields in rows]
+    if not below:
+        return True
+    return text_fields(first) > np.median(below) or min(below) == len(first)
+
+
+def date_columns(names, rows, number):
+    """Names of the columns whose sample values are mostly dates"""
+    found = []
+    for i, name in enumerate(names):
+        values = [fields[i] for fields in rows if i < len(fields) and fields[i]]
+        if not values or any(number.match(value) or not re.search(DATE_PART_PATTERN, value)
+                             for value in values):
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(pd.Series(values), errors='coerce', format='mixed')
+        if parsed.notna().mean() >= DATE_MIN_SHARE:
+            found.append(name)
+    return found
+
+
+def sniff_text_format(filepath):
+    """Parsing decision for a delimited text file.
+
+    Returns a dict with ``options`` (read_csv keyword arguments), ``columns``,
+    ``numeric_columns``, ``date_columns`` and ``tabular``; files that are not
+    tables get tabular=False and best-effort options.
+    """
+    sample = read_sample(filepath)
+    raw_lines = sample.decode('utf-8', errors='replace').splitlines()
+    comment = next((prefix for prefix in COMMENT_PREFIXES
+                    if any(line.startswith(prefix) for line in raw_lines)), None)
+    # Raw line numbers are kept so the table start can be given as skiprows
+    numbered = []
+    breaks = []
+    blank = False
+    for number, line in enumerate(raw_lines):
+        if not line.strip():
+            blank = True
+        elif not (comment and line.startswith(comment)):
+            numbered.append((number, line))
+            breaks.append(blank)
+            blank = False
+    not_tabular = {'options': {'sep': '\t', 'engine': 'c', 'on_bad_lines': 'skip'}, 'columns': [],
+                   'numeric_columns': [], 'date_columns': [], 'tabular': False}
+    if not numbered:
+        return not_tabular
+
+    best = pick_delimiter([line for _, line in numbered], breaks)
+    if best is None or best[0] < TABULAR_MIN_CONSISTENCY:
+        if best is not None:
+            not_tabular['options']['sep'] = best[1]
+        return not_tabular
+    _, delimiter, width, first = best
+
+    table = [split_fields(line, delimiter) for _, line in numbered[first:]]
+    rows = [fields for fields in table[1:] if len(fields) == width]
+    # A comma cannot be the decimal separator of comma separated values
+    decimal = '.'
+    if delimiter != ',':
+        values = [field for fields in rows for field in fields]
+        if sum(1 for v in values if DECIMAL_COMMA.match(v)) > sum(1 for v in values if DECIMAL_POINT.match(v)):
+            decimal = ','
+    number = NUMBER_PATTERNS[decimal]
+
+    options = {'sep': delimiter, 'engine': 'c', 'skiprows': numbered[first][0]}
+    if is_header(table[0], rows, number):
+        options['header'] = 0
+        names = table[0]
+    else:
+        names = [f'column_{i + 1}' for i in range(width)]
+        options.update(header=None, names=names)
+    # Comment lines before the table are covered by skiprows. pandas' comment
+    # option would also cut every value at a '#' (e.g. "Unit #4"), so it is
+    # only set for comment lines between the table's rows
+    if comment and any(line.startswith(comment) for line in raw_lines[numbered[first][0]:]):
+        options['comment'] = comment
+    if decimal != '.':
+        options['decimal'] = decimal
+    dates = date_columns(names, rows if options['header'] == 0 else table, number)
+    if dates:
+        options['parse_dates'] = dates
+
+    # Parse the sample with the decided options, it also yields the dtypes
+    try:
+        df = pd.read_csv(io.BytesIO(sample), **options)
+    except Exception:
+        return not_tabular
+    return {
+        'options': options,
+        'columns': [str(col) for col in df.columns],
+        'numeric_columns': [str(col) for col in df.select_dtypes(include=['number']).columns],
+        'date_columns': dates,
+        'tabular': True
+    }
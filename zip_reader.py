@@ -0,0 +1,29 @@
+"""
+Zip member parsing for the Flask app's process pool, also used by the Dash
+upload callback to stack every CSV of an archive.
+
+The pool uses the spawn start method, so every worker imports the module
+its task function lives in. Keeping read_zip_member here, free of Flask and
+of any import-time side effects, means workers only load pandas rather than
+the whole app (its upload folder setup, caches and job threads).
+"""
+import zipfile
+import pandas as pd
+
+# Column naming the member each row of a stacked archive came from
+ZIP_SOURCE_COLUMN = 'source_file'
+
+
+def zip_csv_members(zip_ref):
+    """CSV members of an archive, skipping macOS resource-fork entries"""
+    return [name for name in zip_ref.namelist()
+            if name.lower().endswith('.csv') and not name.startswith('__MACOSX/')]
+
+
+def read_zip_member(zip_path, member):
+    """Parse one CSV member without extracting it; runs in a worker process"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zip_ref.open(member) as csv_file:
+            df = pd.read_csv(csv_file)
+    df[ZIP_SOURCE_COLUMN] = member
+    return df